@@ -71,6 +71,7 @@ def create_app(config_name=None):
         app, 
         cors_allowed_origins="*", 
         async_mode='gevent',
+        message_queue=app.config.get('SOCKETIO_MESSAGE_QUEUE'),
         logger=True,
         engineio_logger=True
     )
@@ -78,6 +79,14 @@ def create_app(config_name=None):
     limiter.init_app(app)
     init_redis(app)
     
+    # 初始化共享LLM客户端生命周期
+    from app.services.llm_client_registry import init_llm_clients
+    init_llm_clients(app)
+    
+    # 问题/面试会话写入后使用户统计缓存失效
+    from app.services.user_stats_cache import init_stats_cache_invalidation
+    init_stats_cache_invalidation()
+    
     # 初始化Celery
     celery = make_celery(app)
     app.celery = celery
@@ -89,7 +98,7 @@ def create_app(config_name=None):
     register_error_handlers(app)
     
     # 注册WebSocket事件
-    register_socket_events()
+    register_socket_events(app)
     
     return app
 
@@ -119,7 +128,7 @@ def register_error_handlers(app):
     from app.utils.exceptions import handle_errors
     handle_errors(app)
 
-def register_socket_events():
+def register_socket_events(app):
     """注册WebSocket事件"""
     from app.websocket.handlers import register_socket_events
-    register_socket_events(socketio)
+    register_socket_events(socketio, app.config.get('VOICE_STT'))
@@ -6,16 +6,20 @@ Interview Analysis API Routes
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
-from app.models.question import InterviewSession, Answer, Question
-from app.services.interview_analyzer import InterviewAnalyzer
+from app.models.question import InterviewSession, Answer, Question, InterviewAnalysisResult
+from app.services.interview_analyzer import InterviewAnalyzer, ANALYZER_VERSION
 from app.utils.response import success_response, error_response
 from datetime import datetime, timedelta
+from sqlalchemy import and_, case, func
 import logging
 
 # 创建蓝图
 analysis = Blueprint('analysis', __name__)
 logger = logging.getLogger(__name__)
 
+# 统计接口纳入的会话状态
+STATISTICS_SESSION_STATUSES = ('completed', 'paused')
+
 @analysis.route('/test', methods=['GET'])
 def test_route():
     """测试路由"""
@@ -191,14 +195,10 @@ def get_user_statistics():
         days = request.args.get('days', 30, type=int)
         start_date = datetime.utcnow() - timedelta(days=days)
         
-        # 查询用户的面试会话
-        sessions = InterviewSession.query.filter(
-            InterviewSession.user_id == user_id,
-            InterviewSession.created_at >= start_date,
-            InterviewSession.status.in_(['completed', 'paused'])
-        ).all()
+        # 计算统计数据
+        stats = _calculate_user_statistics(user_id, start_date)
         
-        if not sessions:
+        if not stats['total_interviews']:
             return success_response({
                 'total_interviews': 0,
                 'average_score': 0,
@@ -207,9 +207,6 @@ def get_user_statistics():
                 'time_distribution': {}
             }, "暂无面试数据")
         
-        # 计算统计数据
-        stats = _calculate_user_statistics(sessions, user_id)
-        
         return success_response(stats, "统计数据获取成功")
         
     except Exception as e:
@@ -361,11 +358,10 @@ def _format_interview_report(analysis_result):
     return report
 
 
-def _calculate_user_statistics(sessions, user_id):
-    """计算用户统计数据"""
-    analyzer = InterviewAnalyzer()
+def _calculate_user_statistics(user_id, start_date):
+    """计算用户统计数据（基于已存储的会话分数摘要在SQL中聚合）"""
     stats = {
-        'total_interviews': len(sessions),
+        'total_interviews': 0,
         'average_score': 0,
         'improvement_trend': [],
         'performance_by_type': {},
@@ -378,63 +374,143 @@ def _calculate_user_statistics(sessions, user_id):
         }
     }
     
-    # 收集所有分析结果
-    analysis_results = []
-    for session in sessions:
-        try:
-            result = analyzer.analyze_interview_session(session.session_id, user_id)
-            if 'error' not in result:
-                analysis_results.append(result)
-        except Exception:
-            continue
+    window = (
+        InterviewSession.user_id == user_id,
+        InterviewSession.created_at >= start_date,
+        InterviewSession.status.in_(STATISTICS_SESSION_STATUSES)
+    )
+    summary_join = and_(
+        InterviewAnalysisResult.session_id == InterviewSession.id,
+        InterviewAnalysisResult.analyzer_version == ANALYZER_VERSION
+    )
+    score = InterviewAnalysisResult.overall_score
+    
+    # 还没有分数摘要的会话先分析（已完成的会被保存，之后不再重复分析）
+    extra_results = _analyze_unsummarized_sessions(user_id, window, summary_join)
+    
+    # 按面试类型和分数段一次聚合
+    bucket = case(
+        (score.is_(None), None),
+        (score >= 90, 'excellent'),
+        (score >= 75, 'good'),
+        (score >= 60, 'average'),
+        else_='below_average'
+    )
+    rows = db.session.query(
+        InterviewSession.interview_type,
+        bucket,
+        func.count(InterviewSession.id),
+        func.count(score),
+        func.sum(score),
+        func.max(score)
+    ).outerjoin(InterviewAnalysisResult, summary_join).filter(*window).group_by(
+        InterviewSession.interview_type, bucket
+    ).all()
     
-    if not analysis_results:
+    type_scores = {}
+    for interview_type, score_bucket, session_count, score_count, score_sum, score_max in rows:
+        stats['total_interviews'] += session_count
+        if not score_count:
+            continue
+        stats['score_distribution'][score_bucket] += score_count
+        entry = type_scores.setdefault(_enum_value(interview_type), {'count': 0, 'sum': 0.0, 'best': None})
+        entry['count'] += score_count
+        entry['sum'] += score_sum
+        entry['best'] = score_max if entry['best'] is None else max(entry['best'], score_max)
+    
+    for result in extra_results:
+        overall_score = result['overall_score']
+        stats['score_distribution'][_score_bucket(overall_score)] += 1
+        entry = type_scores.setdefault(result['session_info']['interview_type'], {'count': 0, 'sum': 0.0, 'best': None})
+        entry['count'] += 1
+        entry['sum'] += overall_score
+        entry['best'] = overall_score if entry['best'] is None else max(entry['best'], overall_score)
+    
+    if not type_scores:
         return stats
     
     # 计算平均分
-    scores = [result['overall_score'] for result in analysis_results]
-    stats['average_score'] = round(sum(scores) / len(scores), 1)
-    
-    # 改进趋势
-    sorted_results = sorted(analysis_results, 
-                          key=lambda x: x['session_info']['start_time'] or '')
-    stats['improvement_trend'] = [
-        {
-            'date': result['session_info']['start_time'][:10] if result['session_info']['start_time'] else '',
-            'score': round(result['overall_score'], 1)
-        }
-        for result in sorted_results[-10:]  # 最近10次
-    ]
+    total_count = sum(entry['count'] for entry in type_scores.values())
+    stats['average_score'] = round(sum(entry['sum'] for entry in type_scores.values()) / total_count, 1)
     
     # 按类型分析
-    type_scores = {}
-    for result in analysis_results:
-        interview_type = result['session_info']['interview_type']
-        if interview_type not in type_scores:
-            type_scores[interview_type] = []
-        type_scores[interview_type].append(result['overall_score'])
-    
-    for interview_type, type_score_list in type_scores.items():
+    for interview_type, entry in type_scores.items():
         stats['performance_by_type'][interview_type] = {
-            'average_score': round(sum(type_score_list) / len(type_score_list), 1),
-            'count': len(type_score_list),
-            'best_score': round(max(type_score_list), 1)
+            'average_score': round(entry['sum'] / entry['count'], 1),
+            'count': entry['count'],
+            'best_score': round(entry['best'], 1)
         }
     
-    # 分数分布
-    for score in scores:
-        if score >= 90:
-            stats['score_distribution']['excellent'] += 1
-        elif score >= 75:
-            stats['score_distribution']['good'] += 1
-        elif score >= 60:
-            stats['score_distribution']['average'] += 1
-        else:
-            stats['score_distribution']['below_average'] += 1
+    # 改进趋势（最近10次）
+    trend_rows = db.session.query(InterviewSession.started_at, score).join(
+        InterviewAnalysisResult, summary_join
+    ).filter(*window, score.isnot(None)).order_by(
+        InterviewSession.started_at.is_(None), InterviewSession.started_at.desc()
+    ).limit(10).all()
+    trend = [(started_at.isoformat() if started_at else None, overall_score)
+             for started_at, overall_score in trend_rows]
+    trend.extend((result['session_info']['start_time'], result['overall_score']) for result in extra_results)
+    trend.sort(key=lambda item: item[0] or '')
+    stats['improvement_trend'] = [
+        {
+            'date': start_time[:10] if start_time else '',
+            'score': round(overall_score, 1)
+        }
+        for start_time, overall_score in trend[-10:]
+    ]
     
     return stats
 
 
+def _analyze_unsummarized_sessions(user_id, window, summary_join):
+    """分析没有当前版本分数摘要的会话，返回未保存的（未完成会话的）分析结果"""
+    pending = db.session.query(
+        InterviewSession.id, InterviewSession.session_id, InterviewSession.status
+    ).outerjoin(InterviewAnalysisResult, summary_join).filter(
+        *window, InterviewAnalysisResult.overall_score.is_(None)
+    ).all()
+    if not pending:
+        return []
+    
+    analyzer = InterviewAnalyzer()
+    extra_results = []
+    for session_db_id, session_id, status in pending:
+        try:
+            result = analyzer.analyze_interview_session(session_id, user_id)
+        except Exception:
+            continue
+        if 'error' in result:
+            continue
+        if status != 'completed':
+            extra_results.append(result)
+            continue
+        # 已完成会话的结果已保存；摘要列为空的旧记录从结果中回填
+        try:
+            InterviewAnalysisResult.query.filter_by(
+                session_id=session_db_id, analyzer_version=ANALYZER_VERSION, overall_score=None
+            ).update({'overall_score': result['overall_score']}, synchronize_session=False)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"分数摘要回填失败 {session_id}: {e}")
+            extra_results.append(result)
+    return extra_results
+
+
+def _score_bucket(score):
+    if score >= 90:
+        return 'excellent'
+    if score >= 75:
+        return 'good'
+    if score >= 60:
+        return 'average'
+    return 'below_average'
+
+
+def _enum_value(enum_obj):
+    return enum_obj.value if hasattr(enum_obj, 'value') else enum_obj
+
+
 def _compare_interview_sessions(session_ids, user_id):
     """比较多个面试会话"""
     analyzer = InterviewAnalyzer()
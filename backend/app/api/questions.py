@@ -3,13 +3,16 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import Schema, fields, validate, ValidationError
 import uuid
 from datetime import datetime
+from sqlalchemy import func
 
 from app.extensions import db
-from app.models.question import Question, InterviewSession, QuestionType, QuestionDifficulty, InterviewType, Answer
+from app.models.question import Question, InterviewSession, QuestionType, QuestionDifficulty, InterviewType, Answer, InterviewAnalysisResult
 from app.models.resume import Resume
 from app.models.user import User
 from app.services.ai_question_generator import AIQuestionGenerator
 from app.services.cache_service import CacheService
+from app.services.question_sets import bulk_create_questions
+from app.services.user_stats_cache import get_user_stats
 from app.utils.response import success_response, error_response
 from app.utils.subscription_utils import subscription_required
 # from app.tasks.question_tasks import generate_questions_async, generate_ai_reference_async
@@ -155,6 +158,9 @@ def create_question():
         # 更新会话的问题数量
         session.total_questions += 1
         
+        # 会话内容变化，已存储的分析结果失效
+        InterviewAnalysisResult.invalidate(session.id)
+        
         db.session.commit()
         
         return success_response(
@@ -220,7 +226,7 @@ def generate_questions():
             return error_response("Interview session is not in valid state for question generation", 400)
         
         # 首先检查缓存
-        cached_questions = CacheService.get_cached_questions(user_id, resume.id)
+        cached_questions = CacheService.get_cached_questions(user_id, resume.id, resume=resume)
         if cached_questions and CacheService.is_resume_cache_valid(resume.id, resume.updated_at):
             current_app.logger.info(f"Using cached questions for user {user_id}, resume {resume.id}")
             
@@ -231,43 +237,11 @@ def generate_questions():
             ).count()
             
             if existing_questions == 0:
-                # 缓存命中但数据库中没有问题，需要保存到数据库
-                questions = []
-                for q_data in cached_questions:
-                    # 处理从缓存中恢复的枚举值 - 简化版本
-                    question_type_raw = q_data['question_type']
-                    difficulty_raw = q_data['difficulty']
-                    
-                    # 转换枚举字符串为简单值
-                    if isinstance(question_type_raw, str) and question_type_raw.startswith('QuestionType.'):
-                        question_type_value = question_type_raw.replace('QuestionType.', '').lower()
-                    else:
-                        question_type_value = question_type_raw
-                        
-                    if isinstance(difficulty_raw, str) and difficulty_raw.startswith('QuestionDifficulty.'):
-                        difficulty_value = difficulty_raw.replace('QuestionDifficulty.', '').lower()  
-                    else:
-                        difficulty_value = difficulty_raw
-                    
-                    # 转换为枚举对象
-                    question_type_enum = QuestionType(question_type_value)
-                    difficulty_enum = QuestionDifficulty(difficulty_value)
-                    
-                    question = Question(
-                        resume_id=resume.id,
-                        user_id=user_id,
-                        session_id=interview_session.id,
-                        question_text=q_data['question_text'],
-                        question_type=question_type_enum,
-                        difficulty=difficulty_enum,
-                        category=q_data.get('category', ''),
-                        tags=q_data.get('tags', []),
-                        expected_answer=q_data.get('expected_answer', ''),
-                        evaluation_criteria=q_data.get('evaluation_criteria', {}),
-                        ai_context=q_data.get('ai_context', {})
-                    )
-                    questions.append(question)
-                    db.session.add(question)
+                # 缓存命中但数据库中没有问题：缓存的是规范化问题记录，一条INSERT写入
+                questions = bulk_create_questions(
+                    cached_questions, user_id=user_id, resume_id=resume.id, session_id=interview_session.id
+                )
+                questions_payload = [q.to_dict() for q in questions]
                 
                 # 更新会话状态
                 interview_session.status = 'ready'
@@ -280,6 +254,7 @@ def generate_questions():
                     session_id=interview_session.id,
                     user_id=user_id
                 ).all()
+                questions_payload = [q.to_dict() for q in questions]
                 
                 # 确保会话状态为ready
                 if interview_session.status != 'ready':
@@ -288,7 +263,7 @@ def generate_questions():
             
             return success_response(
                 data={
-                    'questions': [q.to_dict() for q in questions],
+                    'questions': questions_payload,
                     'session': interview_session.to_dict(),
                     'from_cache': True
                 },
@@ -311,71 +286,23 @@ def generate_questions():
             type_distribution=interview_session.type_distribution
         )
         
-        # 保存生成的问题到数据库
-        questions = []
-        for q_data in questions_data:
-            # 确保枚举值正确转换 - 简化版本
-            question_type_raw = q_data['question_type']
-            if hasattr(question_type_raw, 'value'):
-                # 如果是枚举对象，取其值
-                question_type_final = question_type_raw.value
-            elif isinstance(question_type_raw, str) and '.' in question_type_raw:
-                # 如果是字符串形式的枚举（如'QuestionType.TECHNICAL'），提取值部分并转换为小写
-                enum_value = question_type_raw.split('.')[-1]
-                question_type_final = enum_value.lower()
-            else:
-                question_type_final = question_type_raw
-            
-            difficulty_raw = q_data['difficulty']
-            if hasattr(difficulty_raw, 'value'):
-                # 如果是枚举对象，取其值
-                difficulty_final = difficulty_raw.value
-            elif isinstance(difficulty_raw, str) and '.' in difficulty_raw:
-                # 如果是字符串形式的枚举（如'QuestionDifficulty.MEDIUM'），提取值部分并转换为小写
-                enum_value = difficulty_raw.split('.')[-1]
-                difficulty_final = enum_value.lower()
-            else:
-                difficulty_final = difficulty_raw
-                
-            question = Question(
-                resume_id=resume.id,
-                user_id=user_id,
-                session_id=interview_session.id,
-                question_text=q_data['question_text'],
-                question_type=QuestionType(question_type_final),  # 转换为枚举对象
-                difficulty=QuestionDifficulty(difficulty_final),  # 转换为枚举对象
-                category=q_data.get('category', ''),
-                tags=q_data.get('tags', []),
-                expected_answer=q_data.get('expected_answer', ''),
-                evaluation_criteria=q_data.get('evaluation_criteria', {}),
-                ai_context=q_data.get('ai_context', {})
-            )
-            questions.append(question)
-            db.session.add(question)
+        # 保存生成的问题到数据库（生成器返回规范化问题记录，一条INSERT写入）
+        questions = bulk_create_questions(
+            questions_data, user_id=user_id, resume_id=resume.id, session_id=interview_session.id
+        )
+        questions_payload = [q.to_dict() for q in questions]
         
         # 更新会话状态
         interview_session.status = 'ready'
         db.session.commit()
         
         # 保存到缓存
-        questions_data_for_cache = []
-        for question in questions:
-            questions_data_for_cache.append({
-                'question_text': question.question_text,
-                'question_type': question.question_type.value if hasattr(question.question_type, 'value') else question.question_type,
-                'difficulty': question.difficulty.value if hasattr(question.difficulty, 'value') else question.difficulty,
-                'category': question.category,
-                'tags': question.tags,
-                'expected_answer': question.expected_answer,
-                'evaluation_criteria': question.evaluation_criteria,
-                'ai_context': question.ai_context
-            })
-        
         CacheService.set_cached_questions(
             user_id=user_id,
             resume_id=resume.id,
-            questions=questions_data_for_cache,
-            resume_updated_at=resume.updated_at
+            questions=questions_data,
+            resume_updated_at=resume.updated_at,
+            resume=resume
         )
         
         current_app.logger.info(f"Generated {len(questions)} questions for user {user_id}, session {session_id}")
@@ -383,7 +310,7 @@ def generate_questions():
         return success_response(
             data={
                 'session': interview_session.to_dict(),
-                'questions': [q.to_dict() for q in questions],
+                'questions': questions_payload,
                 'from_cache': False,
                 'stats': {
                     'total_generated': len(questions),
@@ -453,6 +380,7 @@ def generate_questions_async_endpoint():
         # 直接调用同步问题生成函数
         from app.services.ai_question_generator import AIQuestionGenerator
         from app.services.question_cache_service import QuestionCacheService
+        from app.services.cache_keys import stable_digest
         
         try:
             # 创建问题生成器
@@ -460,7 +388,7 @@ def generate_questions_async_endpoint():
             cache_service = QuestionCacheService()
             
             # 检查缓存
-            cache_key = f"questions:{user_id}:{hash(resume.content)}"
+            cache_key = f"questions:{user_id}:{stable_digest(resume.content)}"
             cached_questions = cache_service.get_cached_questions(cache_key)
             
             if cached_questions:
@@ -658,17 +586,16 @@ def get_interview_sessions():
             page=page, per_page=per_page, error_out=False
         )
         
+        # 一次查询加载本页所有会话的简历信息
+        resumes = _load_resume_summaries({session.resume_id for session in sessions_paginated.items})
+        
         sessions = []
         for session in sessions_paginated.items:
             session_data = session.to_dict()
             # 添加简历信息
-            resume = Resume.query.get(session.resume_id)
+            resume = resumes.get(session.resume_id)
             if resume:
-                session_data['resume'] = {
-                    'id': resume.id,
-                    'filename': resume.original_filename,
-                    'name': resume.name
-                }
+                session_data['resume'] = resume
             sessions.append(session_data)
         
         return success_response(
@@ -707,23 +634,23 @@ def get_questions_with_answers():
             total = questions_query.count()
             questions = questions_query.offset((page - 1) * per_page).limit(per_page).all()
             
+            # 本页问题的最新答案和会话信息各用一次查询批量加载
+            session_question_ids = [q.id for q in questions if q.session_id]
+            latest_answers = _load_latest_answers(session_question_ids, user_id)
+            session_summaries = _load_session_summaries({q.session_id for q in questions if q.session_id})
+            
             result_questions = []
             for question in questions:
                 # 获取最新的答案（如果有的话）
                 latest_answer = None
-                if question.session_id:
-                    answer = Answer.query.filter_by(
-                        question_id=question.id,
-                        user_id=user_id
-                    ).order_by(Answer.answered_at.desc()).first()
-                    
-                    if answer:
-                        latest_answer = {
-                            'id': answer.id,
-                            'answer_text': answer.answer_text,
-                            'score': answer.score,
-                            'answered_at': answer.answered_at.isoformat()
-                        }
+                answer = latest_answers.get(question.id)
+                if answer:
+                    latest_answer = {
+                        'id': answer.id,
+                        'answer_text': answer.answer_text,
+                        'score': answer.score,
+                        'answered_at': answer.answered_at.isoformat()
+                    }
                 
                 question_data = {
                     'id': question.id,
@@ -738,11 +665,8 @@ def get_questions_with_answers():
                 }
                 
                 # 获取会话信息（面试类型）
-                if question.session_id:
-                    session = InterviewSession.query.get(question.session_id)
-                    if session:
-                        question_data['interview_type'] = session.interview_type.value
-                        question_data['session_title'] = session.title
+                if question.session_id in session_summaries:
+                    question_data.update(session_summaries[question.session_id])
                 
                 result_questions.append(question_data)
         else:
@@ -767,6 +691,9 @@ def get_questions_with_answers():
             # 分页
             total = query.count()
             questions_with_answers = query.offset((page - 1) * per_page).limit(per_page).all()
+            session_summaries = _load_session_summaries(
+                {question.session_id for question, _ in questions_with_answers if question.session_id}
+            )
             
             # 构建返回数据
             result_questions = []
@@ -789,11 +716,8 @@ def get_questions_with_answers():
                 }
                 
                 # 获取会话信息（面试类型）
-                if question.session_id:
-                    session = InterviewSession.query.get(question.session_id)
-                    if session:
-                        question_data['interview_type'] = session.interview_type.value
-                        question_data['session_title'] = session.title
+                if question.session_id in session_summaries:
+                    question_data.update(session_summaries[question.session_id])
                 
                 result_questions.append(question_data)
         
@@ -816,42 +740,91 @@ def get_questions_with_answers():
         current_app.logger.error(f"Error retrieving questions with answers: {e}")
         return error_response("Failed to retrieve questions with answers", 500)
 
+def _load_resume_summaries(resume_ids):
+    """批量加载简历摘要 {resume_id: {id, filename, name}}"""
+    if not resume_ids:
+        return {}
+    rows = db.session.query(Resume.id, Resume.original_filename, Resume.name).filter(
+        Resume.id.in_(list(resume_ids))
+    ).all()
+    return {row.id: {'id': row.id, 'filename': row.original_filename, 'name': row.name} for row in rows}
+
+def _load_latest_answers(question_ids, user_id):
+    """批量加载每个问题的最新答案 {question_id: Answer}"""
+    if not question_ids:
+        return {}
+    # 按问题分区排名，只回表加载每个问题排第一的答案
+    # （answered_at 为空的答案排在最后，同一时间取ID最大的一条）
+    ranked = db.session.query(
+        Answer.id.label('answer_id'),
+        func.row_number().over(
+            partition_by=Answer.question_id,
+            order_by=(Answer.answered_at.is_(None), Answer.answered_at.desc(), Answer.id.desc())
+        ).label('answer_rank')
+    ).filter(
+        Answer.question_id.in_(list(question_ids)),
+        Answer.user_id == user_id
+    ).subquery()
+    answers = Answer.query.join(ranked, Answer.id == ranked.c.answer_id).filter(ranked.c.answer_rank == 1).all()
+    return {answer.question_id: answer for answer in answers}
+
+def _load_session_summaries(session_ids):
+    """批量加载会话的面试类型和标题 {session_id: {interview_type, session_title}}"""
+    if not session_ids:
+        return {}
+    rows = db.session.query(InterviewSession.id, InterviewSession.interview_type, InterviewSession.title).filter(
+        InterviewSession.id.in_(list(session_ids))
+    ).all()
+    return {
+        row.id: {'interview_type': row.interview_type.value, 'session_title': row.title}
+        for row in rows
+    }
+
+def _compute_question_stats(user_id):
+    """按类型×难度分组一次聚合得到全部问题统计"""
+    type_stats = {q_type.value: 0 for q_type in QuestionType}
+    difficulty_stats = {difficulty.value: 0 for difficulty in QuestionDifficulty}
+    total_questions = 0
+    
+    rows = db.session.query(
+        Question.question_type, Question.difficulty, func.count(Question.id)
+    ).filter(Question.user_id == user_id).group_by(
+        Question.question_type, Question.difficulty
+    ).all()
+    for q_type, difficulty, count in rows:
+        total_questions += count
+        if q_type is not None:
+            type_stats[q_type.value] = type_stats.get(q_type.value, 0) + count
+        if difficulty is not None:
+            difficulty_stats[difficulty.value] = difficulty_stats.get(difficulty.value, 0) + count
+    
+    total_sessions = db.session.query(func.count(InterviewSession.id)).filter(
+        InterviewSession.user_id == user_id
+    ).scalar()
+    
+    # 最近活动
+    recent_sessions = InterviewSession.query.filter_by(user_id=user_id).order_by(
+        InterviewSession.created_at.desc()
+    ).limit(5).all()
+    
+    return {
+        'total_questions': total_questions,
+        'total_sessions': total_sessions or 0,
+        'type_distribution': type_stats,
+        'difficulty_distribution': difficulty_stats,
+        'recent_sessions': [session.to_dict() for session in recent_sessions]
+    }
+
 @questions_bp.route('/stats', methods=['GET'])
 @jwt_required()
 def get_question_stats():
     """获取问题生成统计信息"""
     try:
         user_id = int(get_jwt_identity())
-        
-        # 统计数据
-        total_questions = Question.query.filter_by(user_id=user_id).count()
-        total_sessions = InterviewSession.query.filter_by(user_id=user_id).count()
-        
-        # 按类型统计
-        type_stats = {}
-        for q_type in QuestionType:
-            count = Question.query.filter_by(user_id=user_id, question_type=q_type).count()
-            type_stats[q_type.value] = count
-        
-        # 按难度统计
-        difficulty_stats = {}
-        for difficulty in QuestionDifficulty:
-            count = Question.query.filter_by(user_id=user_id, difficulty=difficulty).count()
-            difficulty_stats[difficulty.value] = count
-        
-        # 最近活动
-        recent_sessions = InterviewSession.query.filter_by(user_id=user_id).order_by(
-            InterviewSession.created_at.desc()
-        ).limit(5).all()
+        stats = get_user_stats('questions', user_id, lambda: _compute_question_stats(user_id))
         
         return success_response(
-            data={
-                'total_questions': total_questions,
-                'total_sessions': total_sessions,
-                'type_distribution': type_stats,
-                'difficulty_distribution': difficulty_stats,
-                'recent_sessions': [session.to_dict() for session in recent_sessions]
-            },
+            data=stats,
             message="Question statistics retrieved successfully"
         )
         
@@ -1023,6 +996,17 @@ def generate_ai_reference_answer(question_id):
         current_app.logger.error(f"Traceback: {traceback.format_exc()}")
         return error_response(f"Failed to generate AI reference answer: {str(e)}", 500)
 
+def _parse_batch_timeout(value):
+    """客户端指定的整批截止时间，限制在 (0, AI_BATCH_TIMEOUT] 之内"""
+    max_timeout = float(current_app.config.get('AI_BATCH_TIMEOUT', 40))
+    try:
+        timeout = float(value) if value is not None else max_timeout
+    except (TypeError, ValueError):
+        return max_timeout
+    if not timeout > 0:
+        return max_timeout
+    return min(timeout, max_timeout)
+
 @questions_bp.route('/batch-generate-references', methods=['POST'])
 @jwt_required()
 def batch_generate_ai_references():
@@ -1050,46 +1034,59 @@ def batch_generate_ai_references():
         
         # 初始化AI生成器
         generator = AIQuestionGenerator()
-        
-        # 批量生成参考答案
+
+        # 并发生成参考答案，按完成顺序收集结果
         results = []
+        items = []
+        questions_by_id = {q.id: q for q in questions}
         for question in questions:
-            try:
-                resume = resumes.get(question.resume_id)
-                if resume:
-                    reference_answer = generator.generate_reference_answer(
-                        question=question,
-                        resume=resume,
-                        user_context=data.get('user_context', {})
-                    )
-                    
-                    results.append({
-                        'question_id': question.id,
-                        'question_text': question.question_text,
-                        'ai_reference_answer': reference_answer,
-                        'status': 'success'
-                    })
-                else:
-                    results.append({
-                        'question_id': question.id,
-                        'status': 'error',
-                        'error': 'Resume not found'
-                    })
-            except Exception as e:
+            resume = resumes.get(question.resume_id)
+            if resume:
+                items.append((question, resume))
+            else:
                 results.append({
                     'question_id': question.id,
                     'status': 'error',
-                    'error': str(e)
+                    'error': 'Resume not found'
                 })
-        
+
+        timeout = _parse_batch_timeout(data.get('timeout'))
+        for outcome in generator.generate_reference_answers_batch(
+            items,
+            user_context=data.get('user_context', {}),
+            timeout=timeout
+        ):
+            question = questions_by_id[outcome['key']]
+            if outcome['status'] == 'success':
+                results.append({
+                    'question_id': question.id,
+                    'question_text': question.question_text,
+                    'ai_reference_answer': outcome['result'],
+                    'status': 'success'
+                })
+            elif outcome['status'] == 'pending':
+                # 超过截止时间仍在生成，完成后写入缓存，客户端可稍后重试
+                results.append({
+                    'question_id': question.id,
+                    'question_text': question.question_text,
+                    'status': 'pending'
+                })
+            else:
+                results.append({
+                    'question_id': question.id,
+                    'status': 'error',
+                    'error': outcome.get('error')
+                })
+
         current_app.logger.info(f"Batch generated AI reference answers for {len(results)} questions")
-        
+
         return success_response(
             data={
                 'results': results,
                 'total_processed': len(results),
                 'successful': len([r for r in results if r.get('status') == 'success']),
                 'failed': len([r for r in results if r.get('status') == 'error']),
+                'pending': len([r for r in results if r.get('status') == 'pending']),
                 'generated_at': datetime.now().isoformat()
             },
             message=f"Processed {len(results)} questions for AI reference generation"
@@ -1163,18 +1160,30 @@ def get_reference_cache_stats():
         if not redis_client:
             return error_response("Redis not available", 503)
         
-        # 获取所有参考答案缓存键
-        cache_keys = redis_client.keys("ref_answer:*")
+        from app.services.cache_keys import REFERENCE_ANSWER_PREFIX
+        from app.services.cache_index import index_key, indexed_keys, count_indexed
+        
+        user_id = int(get_jwt_identity())
+        all_index = index_key(REFERENCE_ANSWER_PREFIX, 'all')
         
-        # 统计缓存信息
+        # 通过索引统计缓存信息，不扫描整个键空间
+        total_cached = count_indexed(redis_client, all_index)
         cache_stats = {
-            'total_cached_answers': len(cache_keys),
-            'cache_keys': cache_keys[:10],  # 只显示前10个键
-            'cache_size': len(cache_keys)
+            'total_cached_answers': total_cached,
+            'user_cached_answers': count_indexed(redis_client, index_key(REFERENCE_ANSWER_PREFIX, 'user', user_id)),
+            'cache_keys': indexed_keys(redis_client, all_index, limit=10),  # 只显示前10个键
+            'cache_size': total_cached
         }
         
-        # 计算缓存命中率（这里需要实际使用数据，暂时返回0）
-        cache_stats['estimated_hit_rate'] = 0.0
+        # 分层命中统计（本进程）
+        from app.services.two_tier_cache import get_two_tier_cache
+        tier_stats = get_two_tier_cache(REFERENCE_ANSWER_PREFIX).stats()
+        local_hits = tier_stats['local']['hits']
+        lookups = local_hits + tier_stats['local']['misses']
+        cache_stats['tiers'] = tier_stats
+        cache_stats['estimated_hit_rate'] = round(
+            (local_hits + tier_stats['redis']['hits']) / lookups, 4
+        ) if lookups else 0.0
         
         return success_response(
             data=cache_stats,
@@ -1194,13 +1203,13 @@ def clear_reference_cache():
         if not redis_client:
             return error_response("Redis not available", 503)
         
-        # 删除所有参考答案缓存
-        cache_keys = redis_client.keys("ref_answer:*")
-        if cache_keys:
-            redis_client.delete(*cache_keys)
-            cleared_count = len(cache_keys)
-        else:
-            cleared_count = 0
+        from app.services.cache_keys import REFERENCE_ANSWER_PREFIX
+        from app.services.cache_index import scan_delete
+        
+        # 删除所有参考答案缓存（维护操作，使用SCAN避免阻塞Redis；索引一并删除）
+        cleared_count = scan_delete(redis_client, f"{REFERENCE_ANSWER_PREFIX}:*")
+        from app.services.two_tier_cache import get_two_tier_cache
+        get_two_tier_cache(REFERENCE_ANSWER_PREFIX).invalidate_all(redis_client)
         
         current_app.logger.info(f"Cleared {cleared_count} reference answer cache entries")
         
@@ -1217,9 +1226,9 @@ def clear_reference_cache():
 import os
 import re
 import json
-import openai
 from werkzeug.utils import secure_filename
 from app.services.resume_parser import ResumeParser
+from app.services.llm_client_registry import get_llm_client
 
 # 简化问题生成API
 @questions_bp.route('/simple-generate', methods=['POST'])
@@ -1293,15 +1302,10 @@ def simple_generate_questions():
 def _generate_questions_with_deepseek(resume_text: str):
     """使用DeepSeek API生成面试问题"""
     try:
-        api_key = current_app.config.get('DEEPSEEK_API_KEY')
-        if not api_key:
+        client = get_llm_client('deepseek')
+        if not client:
             return _get_fallback_questions()
         
-        client = openai.OpenAI(
-            api_key=api_key,
-            base_url="https://api.deepseek.com"
-        )
-        
         prompt = f"""Help me generate 10 interview questions based on the content of my resume.
 
 Resume Content:
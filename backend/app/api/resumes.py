@@ -9,7 +9,6 @@ from werkzeug.exceptions import RequestEntityTooLarge
 from app.extensions import db
 from app.models.resume import Resume, ResumeStatus
 from app.services.resume_parser import ResumeParser
-from app.services.cache_service import CacheService
 from app.utils.response import success_response, error_response
 from app.utils.validation import validate_file
 from app.utils.subscription_utils import subscription_required
@@ -251,56 +250,34 @@ def upload_resume():
             file_path=file_path,
             file_size=file_size,
             file_type=file_extension,
-            status=ResumeStatus.UPLOADED
+            status=ResumeStatus.PROCESSING
         )
         
         db.session.add(resume)
         db.session.commit()
         
-        # 异步解析简历（这里先同步处理，后续可以改为异步任务）
-        try:
-            resume.status = ResumeStatus.PROCESSING
-            db.session.commit()
-            
-            parser = ResumeParser()
-            result = parser.parse_resume(file_path, file_extension)
-            
-            if result['success']:
-                # 更新简历信息
-                resume.status = ResumeStatus.PROCESSED
-                resume.raw_text = result['raw_text']
-                resume.parsed_content = result['parsed_data']
-                resume.processed_at = datetime.utcnow()
-                
-                # 提取的关键信息
-                parsed_data = result['parsed_data']
-                resume.name = parsed_data.get('name')
-                resume.email = parsed_data.get('email')
-                resume.phone = parsed_data.get('phone')
-                resume.skills = parsed_data.get('skills', [])
-                resume.experience = parsed_data.get('experience', [])
-                resume.education = parsed_data.get('education', [])
-                # 添加项目经验支持
-                resume.projects = parsed_data.get('projects', [])
-                
-                # 清除相关的问题缓存，因为简历内容已更新
-                CacheService.invalidate_resume_cache(resume.id)
-                current_app.logger.info(f"Invalidated cache for resume {resume.id} after processing")
-                
-            else:
-                resume.status = ResumeStatus.FAILED
-                resume.error_message = result['error']
-            
-            db.session.commit()
-            
-        except Exception as parse_error:
-            current_app.logger.error(f"Resume parsing failed: {str(parse_error)}")
-            resume.status = ResumeStatus.FAILED
-            resume.error_message = str(parse_error)
-            db.session.commit()
+        # 开启 RESUME_PARSE_ASYNC 时进入 resume_parsing 队列异步解析，进度通过Socket.IO推送
+        task_id = None
+        if current_app.config.get('RESUME_PARSE_ASYNC', False):
+            try:
+                task = current_app.celery.send_task(
+                    'app.tasks.resume_tasks.parse_resume_async',
+                    args=[resume.id],
+                    queue='resume_parsing'
+                )
+                task_id = task.id
+            except Exception as queue_error:
+                current_app.logger.warning(f"Failed to enqueue resume parsing, parsing inline: {queue_error}")
+        
+        if task_id is None:
+            # 队列不可用时同步解析
+            from app.tasks.resume_tasks import process_resume
+            process_resume(resume.id)
+            db.session.refresh(resume)
         
         return success_response({
             'resume': resume.to_dict(),
+            'task_id': task_id,
             'message': 'Resume uploaded successfully, parsing in progress...'
         }, 201)
         
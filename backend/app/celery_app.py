@@ -30,6 +30,7 @@ def make_celery(app):
         task_routes={
             'app.tasks.question_tasks.generate_questions_async': {'queue': 'question_generation'},
             'app.tasks.question_tasks.generate_ai_reference_async': {'queue': 'ai_reference'},
+            'app.tasks.resume_tasks.parse_resume_async': {'queue': 'resume_parsing'},
         },
         
         # 任务执行配置
@@ -54,6 +55,10 @@ def make_celery(app):
                 'soft_time_limit': 45, # 45秒软超时
                 'retry_backoff': True,
                 'max_retries': 2,
+            },
+            'app.tasks.resume_tasks.parse_resume_async': {
+                'time_limit': 120,     # 2分钟超时
+                'soft_time_limit': 90, # 90秒软超时
             }
         },
         
@@ -69,4 +74,10 @@ def make_celery(app):
                 return self.run(*args, **kwargs)
     
     celery.Task = ContextTask
+    
+    # 子进程启动时丢弃继承自父进程的LLM连接池
+    from celery.signals import worker_process_init
+    from app.services.llm_client_registry import reset_llm_clients
+    worker_process_init.connect(lambda **kwargs: reset_llm_clients(), weak=False)
+    
     return celery 
\ No newline at end of file
@@ -21,14 +21,66 @@ class Config:
     # Redis配置
     REDIS_URL = os.environ.get('REDIS_URL') or 'redis://localhost:6379/0'
     
+    # Socket.IO消息队列（设置后Celery worker可向客户端推送事件）
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+    
     # 文件上传配置
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or os.path.join(os.getcwd(), 'uploads')
     MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
+    # 简历解析走Celery队列（需有worker消费 resume_parsing 队列，见 start_celery_worker.py；
+    # 解析进度事件需要Web进程和worker共用 SOCKETIO_MESSAGE_QUEUE）。默认在请求内同步解析
+    RESUME_PARSE_ASYNC = os.environ.get('RESUME_PARSE_ASYNC', 'False').lower() == 'true'
     
     # AI模型配置
     DEEPSEEK_API_KEY = os.environ.get('DEEPSEEK_API_KEY') or 'sk-f33bab4e7cef421e8739c295670cb15c'
+
+    # AI提供商并发与限流配置（单进程）
+    AI_PROVIDER_LIMITS = {
+        'deepseek': {
+            'max_concurrency': int(os.environ.get('DEEPSEEK_MAX_CONCURRENCY', '4')),
+            'requests_per_minute': int(os.environ.get('DEEPSEEK_REQUESTS_PER_MINUTE', '60'))
+        }
+    }
+    AI_BATCH_TIMEOUT = float(os.environ.get('AI_BATCH_TIMEOUT', '40'))  # 批量生成整批截止时间（秒）
+    
+    # 进程内缓存层（位于Redis之前）
+    LOCAL_CACHE = {
+        'max_entries': int(os.environ.get('LOCAL_CACHE_MAX_ENTRIES', '512')),
+        'max_bytes': int(os.environ.get('LOCAL_CACHE_MAX_BYTES', str(32 * 1024 * 1024))),
+        'ttl': float(os.environ.get('LOCAL_CACHE_TTL', '60'))
+    }
+    REFERENCE_TEMPLATE_TTL = int(os.environ.get('REFERENCE_TEMPLATE_TTL', str(7 * 86400)))  # 通用问题共享参考答案模板有效期（秒）
+    USER_STATS_TTL = int(os.environ.get('USER_STATS_TTL', '600'))  # 用户问题/面试统计缓存有效期（秒），写入时主动失效
     
+    # LLM HTTP连接池配置（进程内所有AI服务共享）
+    LLM_HTTP_POOL = {
+        'max_connections': int(os.environ.get('LLM_MAX_CONNECTIONS', '20')),
+        'max_keepalive_connections': int(os.environ.get('LLM_MAX_KEEPALIVE', '10')),
+        'keepalive_expiry': float(os.environ.get('LLM_KEEPALIVE_EXPIRY', '60')),
+        'connect_timeout': 5.0,
+        'read_timeout': 60.0
+    }
+
+    # 语音转录（STT）工作池配置
+    VOICE_STT = {
+        'provider': os.environ.get('VOICE_STT_PROVIDER', 'google'),  # google / whisper / baidu / local_whisper
+        'local_model': os.environ.get('VOICE_LOCAL_WHISPER_MODEL', 'small'),  # 模型名或本地模型目录
+        'local_device': os.environ.get('VOICE_LOCAL_WHISPER_DEVICE', 'cpu'),
+        'local_compute_type': os.environ.get('VOICE_LOCAL_WHISPER_COMPUTE_TYPE', 'int8'),
+        'local_batch_size': int(os.environ.get('VOICE_LOCAL_WHISPER_BATCH_SIZE', '4')),
+        'local_batch_wait_ms': int(os.environ.get('VOICE_LOCAL_WHISPER_BATCH_WAIT_MS', '30')),
+        'num_workers': int(os.environ.get('VOICE_STT_WORKERS', '4')),  # 按会话分片的转录工作线程数
+        'max_pending_per_session': int(os.environ.get('VOICE_STT_MAX_PENDING', '3')),  # 单会话中间任务积压上限
+        'buffer_max_chunks': int(os.environ.get('VOICE_BUFFER_MAX_CHUNKS', '10')),  # 每个会话缓冲的音频块数
+        'session_ttl': float(os.environ.get('VOICE_SESSION_TTL', '300')),  # 空闲会话缓冲区回收时间（秒）
+        'transcription_mode': os.environ.get('VOICE_TRANSCRIPTION_MODE', 'incremental'),  # incremental（仅pcm16生效）/ full
+        'overlap_chunks': int(os.environ.get('VOICE_OVERLAP_CHUNKS', '1')),  # 增量窗口重叠的音频块数
+        'vad_enabled': os.environ.get('VOICE_VAD_ENABLED', 'True').lower() == 'true',  # 转录前丢弃静音
+        'vad_threshold_db': float(os.environ.get('VOICE_VAD_THRESHOLD_DB', '-45')),
+        'vad_end_silence_ms': int(os.environ.get('VOICE_VAD_END_SILENCE_MS', '800'))  # 静音多久算一句话结束
+    }
+
     # Creem.io 付费配置 - 正式环境
     CREEM_API_KEY = os.environ.get('CREEM_API_KEY') or 'creem_6AIW9sH8lsSGaAABHgfdJl'
     CREEM_TEST_MODE = os.environ.get('CREEM_TEST_MODE', 'False').lower() == 'true'  # 默认关闭测试模式
@@ -87,6 +139,7 @@ class ProductionConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'mysql+pymysql://root@localhost/interview_genius?charset=utf8mb4'
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or '/app/uploads'
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE') or Config.REDIS_URL
     
     # 生产环境国际化配置
     QUESTION_LANGUAGE = os.environ.get('QUESTION_LANGUAGE', 'english')
@@ -104,6 +157,7 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     UPLOAD_FOLDER = os.path.join(os.getcwd(), 'uploads', 'test')
+    RESUME_PARSE_ASYNC = False
     
     # 测试环境配置
     QUESTION_LANGUAGE = 'english'  # 测试环境使用英文
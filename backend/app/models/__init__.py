@@ -1,6 +1,6 @@
 from .user import User
 from .resume import Resume
-from .question import Question, InterviewSession, Answer, QuestionType, QuestionDifficulty, InterviewType
+from .question import Question, InterviewSession, Answer, InterviewAnalysisResult, QuestionType, QuestionDifficulty, InterviewType
 from .job import Job, JobType, JobStatus
 
 __all__ = [
@@ -9,6 +9,7 @@ __all__ = [
     'Question',
     'InterviewSession', 
     'Answer',
+    'InterviewAnalysisResult',
     'QuestionType',
     'QuestionDifficulty', 
     'InterviewType',
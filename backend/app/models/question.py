@@ -26,6 +26,13 @@ class InterviewType(enum.Enum):
 class Question(db.Model):
     """面试问题模型"""
     __tablename__ = 'questions'
+    __table_args__ = (
+        # 会话内问题按创建时间排序；用户问题列表/统计
+        db.Index('ix_questions_session_created', 'session_id', 'created_at'),
+        db.Index('ix_questions_user_created', 'user_id', 'created_at'),
+        db.Index('ix_questions_user_type', 'user_id', 'question_type'),
+        db.Index('ix_questions_user_difficulty', 'user_id', 'difficulty'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=False)
@@ -72,6 +79,11 @@ class Question(db.Model):
 class InterviewSession(db.Model):
     """面试会话模型"""
     __tablename__ = 'interview_sessions'
+    __table_args__ = (
+        # 用户会话列表按创建时间排序；按状态/类型统计和匹配已完成的正式面试
+        db.Index('ix_sessions_user_created', 'user_id', 'created_at'),
+        db.Index('ix_sessions_user_status_type', 'user_id', 'status', 'interview_type'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -80,6 +92,7 @@ class InterviewSession(db.Model):
     # 添加关系定义，支持级联删除
     questions = db.relationship('Question', backref='interview_session', cascade='all, delete-orphan', lazy='dynamic')
     answers = db.relationship('Answer', backref='interview_session', cascade='all, delete-orphan', lazy='dynamic')
+    analysis_results = db.relationship('InterviewAnalysisResult', backref='interview_session', cascade='all, delete-orphan', lazy='dynamic')
     
     # 会话信息
     session_id = db.Column(db.String(100), unique=True, nullable=False)  # UUID
@@ -132,6 +145,12 @@ class InterviewSession(db.Model):
 class Answer(db.Model):
     """用户答案模型"""
     __tablename__ = 'answers'
+    __table_args__ = (
+        # 问题的最新答案；会话内答案；用户答案按回答时间排序
+        db.Index('ix_answers_question_user_answered', 'question_id', 'user_id', 'answered_at'),
+        db.Index('ix_answers_session_user', 'session_id', 'user_id'),
+        db.Index('ix_answers_user_answered', 'user_id', 'answered_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(db.Integer, db.ForeignKey('interview_sessions.id'), nullable=False)
@@ -163,4 +182,32 @@ class Answer(db.Model):
             'ai_feedback': self.ai_feedback or {},
             'response_time': self.response_time,
             'answered_at': self.answered_at.isoformat()
-        } 
\ No newline at end of file
+        } 
+
+
+class InterviewAnalysisResult(db.Model):
+    """已完成面试会话的分析结果（按分析器版本存储）"""
+    __tablename__ = 'interview_analysis_results'
+    __table_args__ = (
+        db.UniqueConstraint('session_id', 'analyzer_version', name='uq_analysis_session_version'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('interview_sessions.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    
+    # 分析器版本变化（评分规则调整）后旧结果不再使用，会重新计算
+    analyzer_version = db.Column(db.String(20), nullable=False)
+    result = db.Column(db.JSON, nullable=False)
+    # 分数摘要：统计接口直接在SQL中聚合，不需要读取完整结果
+    overall_score = db.Column(db.Float)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<InterviewAnalysisResult session={self.session_id} v{self.analyzer_version}>'
+    
+    @classmethod
+    def invalidate(cls, session_db_id: int) -> int:
+        """删除会话的所有已存储分析结果（不提交事务）"""
+        return cls.query.filter_by(session_id=session_db_id).delete(synchronize_session=False)
@@ -0,0 +1,145 @@
+"""Bounded-concurrency execution engine for LLM calls"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROVIDER_LIMITS = {
+    'max_concurrency': 4,         # 单进程同时在途请求数
+    'requests_per_minute': 60,    # 单进程每分钟请求数
+}
+
+
+class ProviderRateLimiter:
+    """Token bucket rate limiter shared by all callers of one provider"""
+
+    def __init__(self, requests_per_minute: int):
+        self.capacity = max(1, int(requests_per_minute))
+        self.refill_rate = self.capacity / 60.0
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until a token is available, return False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.refill_rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+
+class AIBatchExecutor:
+    """Fan out LLM jobs over a per-provider thread pool
+
+    Each provider gets one process-wide pool sized by max_concurrency and one
+    token bucket sized by requests_per_minute, both read from the
+    AI_PROVIDER_LIMITS config. Jobs run inside the Flask app context of the
+    caller, and results are yielded in completion order.
+    """
+
+    _pools: Dict[str, ThreadPoolExecutor] = {}
+    _limiters: Dict[str, ProviderRateLimiter] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, provider: str = 'deepseek'):
+        self.provider = provider
+        limits = dict(DEFAULT_PROVIDER_LIMITS)
+        try:
+            limits.update(current_app.config.get('AI_PROVIDER_LIMITS', {}).get(provider, {}))
+        except RuntimeError:
+            # 无应用上下文时使用默认限制
+            pass
+        self.max_concurrency = max(1, int(limits['max_concurrency']))
+        self.requests_per_minute = max(1, int(limits['requests_per_minute']))
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with AIBatchExecutor._registry_lock:
+            pool = AIBatchExecutor._pools.get(self.provider)
+            if pool is None:
+                pool = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix=f"ai-{self.provider}"
+                )
+                AIBatchExecutor._pools[self.provider] = pool
+            return pool
+
+    def _get_limiter(self) -> ProviderRateLimiter:
+        with AIBatchExecutor._registry_lock:
+            limiter = AIBatchExecutor._limiters.get(self.provider)
+            if limiter is None:
+                limiter = ProviderRateLimiter(self.requests_per_minute)
+                AIBatchExecutor._limiters[self.provider] = limiter
+            return limiter
+
+    def map_as_completed(
+        self,
+        func: Callable[..., Any],
+        jobs: Iterable[Tuple[Any, tuple]],
+        timeout: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run func(*args) for every (key, args) job and yield results as they finish
+
+        Args:
+            func: Callable executed for each job
+            jobs: Iterable of (key, args) pairs, key identifies the job in results
+            timeout: Overall deadline in seconds; unfinished jobs are yielded
+                     with status 'pending' and keep running in the background
+
+        Yields:
+            {'key': key, 'status': 'success'|'error'|'pending', 'result'|'error': ...}
+        """
+        app = current_app._get_current_object()
+        limiter = self._get_limiter()
+        pool = self._get_pool()
+
+        def run(args):
+            with app.app_context():
+                limiter.acquire()
+                return func(*args)
+
+        futures = {pool.submit(run, args): key for key, args in jobs}
+        done = set()
+
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                done.add(future)
+                key = futures[future]
+                try:
+                    yield {'key': key, 'status': 'success', 'result': future.result()}
+                except Exception as e:
+                    logger.error(f"AI batch job {key} failed: {e}")
+                    yield {'key': key, 'status': 'error', 'error': str(e)}
+        except FuturesTimeoutError:
+            pending = [f for f in futures if f not in done]
+            logger.warning(f"AI batch deadline reached, {len(pending)} jobs still running for provider {self.provider}")
+            for future in pending:
+                yield {'key': futures[future], 'status': 'pending'}
+
+    @classmethod
+    def shutdown(cls, wait: bool = False):
+        """关闭所有提供商线程池"""
+        with cls._registry_lock:
+            for pool in cls._pools.values():
+                pool.shutdown(wait=wait)
+            cls._pools.clear()
+            cls._limiters.clear()
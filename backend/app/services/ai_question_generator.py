@@ -1,11 +1,17 @@
-import openai
 import json
 import logging
-from typing import List, Dict, Any, Optional
-from flask import current_app
-from app.models.question import QuestionType, QuestionDifficulty, InterviewType
+from typing import List, Dict, Any, Optional, Callable
+from app.extensions import db
+from app.models.question import Question, QuestionType, QuestionDifficulty, InterviewType
 from app.models.resume import Resume
 from app.services.question_cache_service import QuestionCacheService
+from app.services.question_sets import normalize_questions
+from app.services.reference_template_cache import ReferenceTemplateCache
+from app.services.cache_keys import reference_answer_key, REFERENCE_ANSWER_PREFIX
+from app.services.cache_index import index_key, add_to_indexes
+from app.services.two_tier_cache import get_two_tier_cache
+from app.services.single_flight import single_flight
+from app.services.llm_client_registry import get_llm_client
 import os
 import time
 import functools
@@ -40,21 +46,16 @@ class AIQuestionGenerator:
         self.client = None
         self.model = "deepseek-chat"  # DeepSeek-V3 model
         self.cache_service = QuestionCacheService()  # 初始化缓存服务
+        self.template_cache = ReferenceTemplateCache()  # 通用问题共享模板缓存
     
     def _get_client(self):
-        """Lazy initialization of OpenAI client"""
+        """Get the shared, pooled DeepSeek client"""
         if self.client is None:
             try:
-                api_key = current_app.config.get('DEEPSEEK_API_KEY')
-                if not api_key:
+                self.client = get_llm_client('deepseek')
+                if not self.client:
                     logger.warning("DEEPSEEK_API_KEY not configured, using fallback questions only")
                     return None
-                
-                self.client = openai.OpenAI(
-                    api_key=api_key,
-                    base_url="https://api.deepseek.com"
-                )
-                logger.info("DeepSeek OpenAI client initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize OpenAI client: {e}")
                 return None
@@ -108,48 +109,46 @@ class AIQuestionGenerator:
             # 缓存未命中，需要重新生成
             logger.info(f"🔄 用户{user_id}缓存未命中，开始生成新问题...")
             
-            # Prepare resume context
-            resume_context = self._prepare_resume_context(resume)
+            def generate() -> List[Dict[str, Any]]:
+                # Prepare resume context
+                resume_context = self._prepare_resume_context(resume)
             
-            # 🚀 性能优化：一次性生成所有问题，而不是多次调用AI API
-            questions = self._generate_all_questions_at_once(
-                resume_context=resume_context,
-                interview_type=interview_type,
-                total_questions=total_questions,
-                difficulty_distribution=difficulty_distribution,
-                type_distribution=type_distribution
-            )
+                # 🚀 性能优化：一次性生成所有问题，而不是多次调用AI API
+                questions = self._generate_all_questions_at_once(
+                    resume_context=resume_context,
+                    interview_type=interview_type,
+                    total_questions=total_questions,
+                    difficulty_distribution=difficulty_distribution,
+                    type_distribution=type_distribution
+                )
             
-            # 缓存生成的问题 - 确保问题数据可以JSON序列化
-            serializable_questions = []
-            for question in questions:
-                serializable_question = {
-                    'question': question.get('question_text', ''),  # 使用question_text字段
-                    'question_type': question.get('question_type', ''),
-                    'difficulty': question.get('difficulty', ''),
-                    'category': question.get('category', ''),
-                    'tags': question.get('tags', []),
-                    'expected_answer': question.get('expected_answer', ''),
-                    'evaluation_criteria': question.get('evaluation_criteria', {}),
-                    'ai_context': question.get('ai_context', {})
-                }
-                serializable_questions.append(serializable_question)
+                # 转换为规范化问题记录（可JSON序列化，缓存与入库共用）
+                questions = normalize_questions(questions)
             
-            self.cache_service.cache_questions(
-                user_id=user_id,
-                resume=resume,
-                interview_type=interview_type.value,
-                total_questions=total_questions,
-                difficulty_distribution=difficulty_distribution,
-                type_distribution=type_distribution,
-                questions=serializable_questions
+                self.cache_service.cache_questions(
+                    user_id=user_id,
+                    resume=resume,
+                    interview_type=interview_type.value,
+                    total_questions=total_questions,
+                    difficulty_distribution=difficulty_distribution,
+                    type_distribution=type_distribution,
+                    questions=questions
+                )
+            
+                return questions
+            
+            # 合并并发的相同生成请求（重复点击/前端重试/多个Celery worker）
+            flight_key = self.cache_service._generate_cache_key(
+                user_id, resume, interview_type.value, total_questions,
+                difficulty_distribution, type_distribution
             )
+            questions = single_flight.run(flight_key, generate, lock_ttl=180, wait_timeout=150)
             
             return questions[:total_questions]
             
         except Exception as e:
             logger.error(f"Failed to generate questions: {e}")
-            return self._get_fallback_questions(interview_type, total_questions)
+            return normalize_questions(self._get_fallback_questions(interview_type, total_questions))
     
     def _generate_all_questions_at_once(
         self,
@@ -790,13 +789,40 @@ Difficulty Explanations:
                 logger.info(f"Using cached reference answer for question {question.id}")
                 return cached_answer
             
+            # 合并对同一缓存键的并发生成（重复点击/前端重试）
+            return single_flight.run(
+                cache_key,
+                lambda: self._generate_reference_answer_uncached(question, resume, cache_key, user_context),
+                lock_ttl=60,
+                wait_timeout=45
+            )
+        except Exception as e:
+            logger.error(f"Failed to generate reference answer: {e}")
+            return self._get_fallback_reference_answer(question)
+    
+    def _generate_reference_answer_uncached(
+        self,
+        question: 'Question',
+        resume: 'Resume',
+        cache_key: str,
+        user_context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """缓存未命中时生成参考答案并写入缓存"""
+        try:
             # 2. 准备简历上下文（简化版本）
             resume_context = self._prepare_resume_context_optimized(resume)
             
-            # 3. 构建优化的参考答案生成提示
+            # 通用问题优先使用跨用户共享模板
+            is_generic = self.template_cache.is_generic(question)
+            if is_generic:
+                template_answer = self._get_template_reference_answer(question, resume_context, cache_key)
+                if template_answer:
+                    return template_answer
+            
+            # 3. 构建优化的参考答案生成提示（通用问题不带入简历信息，以便跨用户共享）
             prompt = self._build_reference_answer_prompt_optimized(
                 question=question,
-                resume_context=resume_context,
+                resume_context=ReferenceTemplateCache.neutral_resume_context() if is_generic else resume_context,
                 user_context=user_context or {}
             )
             
@@ -842,9 +868,11 @@ Difficulty Explanations:
                     
                     logger.info(f"AI generated content length: {len(content)} characters")
                     result = self._parse_reference_answer_response(content, question)
+                    if is_generic:
+                        result = self._store_template_reference_answer(question, result, resume_context)
                     
                     # 5. 缓存结果
-                    self._cache_reference_answer(cache_key, result)
+                    self._cache_reference_answer(cache_key, result, user_id=getattr(question, 'user_id', None))
                     
                     return result
                     
@@ -860,39 +888,222 @@ Difficulty Explanations:
         except Exception as e:
             logger.error(f"Failed to generate reference answer: {e}")
             return self._get_fallback_reference_answer(question)
-    
+
+    @performance_monitor("AI参考答案流式生成")
+    def generate_reference_answer_stream(
+        self,
+        question: 'Question',
+        resume: 'Resume',
+        on_delta: Callable[[str], None],
+        user_context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """流式生成AI参考答案
+
+        每收到一段token增量就调用 on_delta(delta)，流结束后解析完整内容、
+        写入 ref_answer:* 缓存并返回与 generate_reference_answer 相同结构的结果。
+        缓存命中、AI不可用或同一问题已在其他请求中生成时不会调用 on_delta，直接返回结果。
+        """
+        try:
+            cache_key = self._generate_reference_cache_key(question, resume)
+            cached_answer = self._get_cached_reference_answer(cache_key)
+            if cached_answer:
+                logger.info(f"Using cached reference answer for question {question.id} (stream)")
+                return cached_answer
+
+            return single_flight.run(
+                cache_key,
+                lambda: self._stream_reference_answer_uncached(question, resume, cache_key, on_delta, user_context),
+                lock_ttl=60,
+                wait_timeout=45
+            )
+        except Exception as e:
+            logger.error(f"Failed to stream reference answer: {e}")
+            return self._get_fallback_reference_answer(question)
+
+    def _stream_reference_answer_uncached(
+        self,
+        question: 'Question',
+        resume: 'Resume',
+        cache_key: str,
+        on_delta: Callable[[str], None],
+        user_context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """缓存未命中时流式生成参考答案并写入缓存"""
+        try:
+            resume_context = self._prepare_resume_context_optimized(resume)
+            is_generic = self.template_cache.is_generic(question)
+            if is_generic:
+                template_answer = self._get_template_reference_answer(question, resume_context, cache_key)
+                if template_answer:
+                    return template_answer
+
+            prompt = self._build_reference_answer_prompt_optimized(
+                question=question,
+                resume_context=ReferenceTemplateCache.neutral_resume_context() if is_generic else resume_context,
+                user_context=user_context or {}
+            )
+
+            client = self._get_client()
+            if not client:
+                logger.warning("AI client not available, using fallback reference answer")
+                return self._get_fallback_reference_answer(question)
+
+            start_time = time.time()
+            first_token_time = None
+            parts: List[str] = []
+
+            try:
+                logger.info(f"Streaming AI API for question {question.id} with model {self.model}")
+
+                stream = client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": self._get_reference_answer_system_prompt_optimized()},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=400,
+                    temperature=0.2,
+                    timeout=25,
+                    presence_penalty=0.0,
+                    frequency_penalty=0.0,
+                    top_p=0.9,
+                    stream=True
+                )
+
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content if chunk.choices[0].delta else None
+                    if not delta:
+                        continue
+                    if first_token_time is None:
+                        first_token_time = time.time() - start_time
+                        logger.info(f"AI reference answer first token after {first_token_time:.2f} seconds")
+                    parts.append(delta)
+                    on_delta(delta)
+
+            except Exception as ai_error:
+                generation_time = time.time() - start_time
+                logger.error(f"AI streaming call failed after {generation_time:.2f} seconds: {ai_error}")
+                return self._get_fallback_reference_answer(question)
+
+            content = ''.join(parts).strip()
+            logger.info(f"AI streamed content length: {len(content)} characters in {time.time() - start_time:.2f} seconds")
+            if not content:
+                logger.warning("AI streamed content is empty")
+                return self._get_fallback_reference_answer(question)
+
+            result = self._parse_reference_answer_response(content, question)
+            if is_generic:
+                result = self._store_template_reference_answer(question, result, resume_context)
+            self._cache_reference_answer(cache_key, result, user_id=getattr(question, 'user_id', None))
+            return result
+
+        except Exception as e:
+            logger.error(f"Failed to stream reference answer: {e}")
+            return self._get_fallback_reference_answer(question)
+
+    def generate_reference_answers_batch(
+        self,
+        items: List[tuple],
+        user_context: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ):
+        """
+        并发生成多个问题的参考答案，按完成顺序逐个产出结果
+
+        Args:
+            items: (question, resume) 元组列表（只使用其ID）
+            user_context: 用户上下文
+            timeout: 整批截止时间（秒），超时未完成的问题以 pending 状态返回，
+                     其生成在后台继续并写入缓存
+
+        Yields:
+            AIBatchExecutor.map_as_completed 的结果字典，key 为问题ID
+        """
+        from app.services.ai_batch_executor import AIBatchExecutor
+
+        # 在分发前初始化客户端，避免工作线程重复创建
+        self._get_client()
+
+        # 只向工作线程传递ID：请求的数据库会话不能跨线程使用，未完成的任务也会比请求存活更久
+        jobs = [
+            (question.id, (question.id, resume.id, user_context or {}))
+            for question, resume in items
+        ]
+        executor = AIBatchExecutor(provider='deepseek')
+        return executor.map_as_completed(self._generate_reference_answer_by_id, jobs, timeout=timeout)
+
+    def _generate_reference_answer_by_id(
+        self,
+        question_id: int,
+        resume_id: int,
+        user_context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """在工作线程的应用上下文中重新加载问题和简历后生成参考答案"""
+        question = db.session.get(Question, question_id)
+        resume = db.session.get(Resume, resume_id)
+        if question is None or resume is None:
+            raise ValueError(f"Question {question_id} or resume {resume_id} not found")
+        return self.generate_reference_answer(question=question, resume=resume, user_context=user_context)
+
+    def _get_template_reference_answer(
+        self,
+        question: 'Question',
+        resume_context: Dict[str, Any],
+        cache_key: str
+    ) -> Optional[Dict[str, Any]]:
+        """从共享模板获取通用问题的参考答案，并写入用户级缓存"""
+        template = self.template_cache.get(question)
+        if not template:
+            return None
+        logger.info(f"Using shared reference template for generic question {question.id}")
+        result = self.template_cache.personalize(template, question, resume_context)
+        self._cache_reference_answer(cache_key, result, user_id=getattr(question, 'user_id', None))
+        return result
+
+    def _store_template_reference_answer(
+        self,
+        question: 'Question',
+        result: Dict[str, Any],
+        resume_context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """保存通用问题的共享模板，返回个性化后的答案"""
+        if result.get('generated_by') != 'ai':
+            return result
+        self.template_cache.set(question, result)
+        return self.template_cache.personalize(result, question, resume_context)
+
     def _generate_reference_cache_key(self, question: 'Question', resume: 'Resume') -> str:
-        """生成参考答案缓存键"""
-        # 基于问题ID、问题类型、难度和简历内容哈希生成缓存键
-        resume_hash = hash(resume.raw_text[:1000])  # 只使用前1000字符
-        return f"ref_answer:{question.id}:{question.question_type.value}:{question.difficulty.value}:{resume_hash}"
+        """生成参考答案缓存键（基于问题和简历内容的稳定摘要）"""
+        return reference_answer_key(question, resume, model=self.model)
     
     def _get_cached_reference_answer(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """从缓存获取参考答案"""
         try:
             from app.extensions import redis_client
-            if redis_client:
-                cached_data = redis_client.get(cache_key)
-                if cached_data is not None:
-                    # 确保cached_data是字符串
-                    if isinstance(cached_data, bytes):
-                        cached_data = cached_data.decode('utf-8')
-                    elif not isinstance(cached_data, str):
-                        logger.warning(f"Cached data is not a string: {type(cached_data)}")
-                        return None
-                    
-                    return json.loads(cached_data)
+            # 先查进程内缓存，未命中再查Redis
+            return get_two_tier_cache(REFERENCE_ANSWER_PREFIX).get(cache_key, redis_client)
         except Exception as e:
             logger.warning(f"Failed to get cached reference answer: {e}")
         return None
     
-    def _cache_reference_answer(self, cache_key: str, answer_data: Dict[str, Any]) -> None:
-        """缓存参考答案"""
+    def _cache_reference_answer(
+        self,
+        cache_key: str,
+        answer_data: Dict[str, Any],
+        user_id: Optional[int] = None
+    ) -> None:
+        """缓存参考答案，并登记到用户索引和全局索引"""
         try:
             from app.extensions import redis_client
+            # 缓存24小时（同时写入进程内缓存）
+            get_two_tier_cache(REFERENCE_ANSWER_PREFIX).set(cache_key, answer_data, 86400, redis_client)
             if redis_client:
-                # 缓存24小时
-                redis_client.setex(cache_key, 86400, json.dumps(answer_data))
+                indexes = [index_key(REFERENCE_ANSWER_PREFIX, 'all')]
+                if user_id is not None:
+                    indexes.append(index_key(REFERENCE_ANSWER_PREFIX, 'user', user_id))
+                add_to_indexes(redis_client, cache_key, 86400, indexes)
                 logger.info(f"Cached reference answer for key: {cache_key}")
         except Exception as e:
             logger.warning(f"Failed to cache reference answer: {e}")
@@ -0,0 +1,245 @@
+"""Single-pass keyword scoring for interview answers
+
+Every keyword list the analyzer checks (technical vocabulary, structure and
+example markers, STAR / technical completeness indicators, conclusion,
+overclaiming and precision phrases) is compiled into one regex automaton.
+An answer is lowercased and scanned once; the resulting feature set feeds
+all of the rule-based scores. Matching keeps the original substring
+semantics, so the scores are identical to checking `keyword in text` for
+every keyword.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# 各评分规则使用的指示词（匹配小写文本的子串）
+INDICATOR_KEYWORDS = {
+    'structure': ['first', 'second', 'finally', '1.', '2.', '3.'],
+    'example': ['example', 'for instance', 'such as', '例如'],
+    'star': ['situation', 'task', 'action', 'result', 'challenge', 'outcome'],
+    'tech_completeness': ['algorithm', 'complexity', 'implementation', 'solution', 'approach'],
+    'conclusion': ['conclusion', 'summary', 'in summary', 'overall', 'finally'],
+    'common_error': ['definitely', 'always works', 'never fails', 'impossible'],
+    'accuracy': ['specifically', 'precisely', 'according to', 'research shows'],
+}
+
+TECHNICAL_GROUP_PREFIX = 'technical:'
+
+QUESTION_STOP_WORDS = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
+
+_WORD_RE = re.compile(r'\b\w+\b')
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    """把关键词前缀树转成正则（同一节点的分支首字符互不相同，可选后缀为贪婪匹配）"""
+    alternatives = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not alternatives:
+        return ''
+    body = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+    if '' in node:
+        body = '(?:' + body + ')?'
+    return body
+
+
+class KeywordAutomaton:
+    """Finds every keyword occurring in a text with one regex scan
+
+    Keywords are compiled into a prefix-trie regex wrapped in a lookahead,
+    so each text position is decided by its first character and reports the
+    longest keyword starting there. Shorter keywords contained in a reported
+    one are added from a precomputed table, which makes the result the exact
+    set of keywords that are substrings of the text (overlaps included).
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({k.lower() for k in keywords if k}, key=lambda k: (-len(k), k))
+        self._implied: Dict[str, Tuple[str, ...]] = {
+            keyword: tuple(other for other in self.keywords if other != keyword and other in keyword)
+            for keyword in self.keywords
+        }
+        trie: Dict[str, dict] = {}
+        for keyword in self.keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        pattern = _trie_pattern(trie)
+        self._regex = re.compile(f'(?=({pattern}))') if pattern else None
+
+    def find(self, lowered_text: str) -> Set[str]:
+        if not self._regex or not lowered_text:
+            return set()
+        found = set()
+        for match in self._regex.finditer(lowered_text):
+            keyword = match.group(1)
+            if keyword not in found:
+                found.add(keyword)
+                found.update(self._implied[keyword])
+        return found
+
+
+@dataclass
+class AnswerFeatures:
+    """一次扫描得到的答案特征"""
+    text: str
+    word_count: int
+    words: Set[str]
+    found: Set[str]
+    groups: Dict[str, List[str]] = field(default_factory=dict)
+
+    def count(self, group: str) -> int:
+        return len(self.groups.get(group, ()))
+
+    def has(self, group: str) -> bool:
+        return bool(self.groups.get(group))
+
+
+class AnswerScorer:
+    """Rule-based answer scores computed from precomputed features"""
+
+    def __init__(self, technical_keywords: Dict[str, List[str]]):
+        self.technical_keywords = technical_keywords
+        self._groups: Dict[str, List[str]] = {
+            TECHNICAL_GROUP_PREFIX + category: [k.lower() for k in keywords]
+            for category, keywords in technical_keywords.items()
+        }
+        self._groups.update(INDICATOR_KEYWORDS)
+        self.automaton = KeywordAutomaton(k for keywords in self._groups.values() for k in keywords)
+
+    def features(self, answer_text: Optional[str]) -> AnswerFeatures:
+        """小写化、分词、关键词扫描各只做一次"""
+        text = answer_text or ''
+        lowered = text.lower()
+        found = self.automaton.find(lowered)
+        groups = {
+            name: [k for k in keywords if k in found]
+            for name, keywords in self._groups.items()
+        }
+        return AnswerFeatures(
+            text=text,
+            word_count=len(text.split()),
+            words=set(_WORD_RE.findall(lowered)),
+            found=found,
+            groups=groups
+        )
+
+    @staticmethod
+    def question_keywords(question_text: str) -> List[str]:
+        """从问题中提取关键词（长度>3且非停用词）"""
+        words = _WORD_RE.findall((question_text or '').lower())
+        return [word for word in words if len(word) > 3 and word not in QUESTION_STOP_WORDS]
+
+    def technical_term_count(self, features: AnswerFeatures) -> int:
+        # 同一关键词出现在多个类别时按类别分别计数
+        return sum(features.count(TECHNICAL_GROUP_PREFIX + category) for category in self.technical_keywords)
+
+    @staticmethod
+    def relevance(features: AnswerFeatures, question_keywords: List[str]) -> float:
+        if not features.text or not question_keywords:
+            return 0.0
+        question_words = set(question_keywords)
+        union = features.words | question_words
+        return len(features.words & question_words) / len(union) if union else 0.0
+
+    def score_quality(self, features: AnswerFeatures, question_keywords: List[str]) -> float:
+        if not features.text:
+            return 0.0
+
+        score = 0.0
+        word_count = features.word_count
+        if word_count >= 50:
+            score += 30
+        elif word_count >= 20:
+            score += 20
+        elif word_count >= 10:
+            score += 10
+
+        if features.has('structure'):
+            score += 15
+
+        technical_words = self.technical_term_count(features)
+        if technical_words >= 5:
+            score += 25
+        elif technical_words >= 3:
+            score += 15
+        elif technical_words >= 1:
+            score += 10
+
+        if features.has('example'):
+            score += 15
+
+        score += self.relevance(features, question_keywords) * 15
+        return min(score, 100.0)
+
+    def score_completeness(self, features: AnswerFeatures, question_type: Optional[str]) -> float:
+        if not features.text:
+            return 0.0
+
+        score = 0.0
+        word_count = features.word_count
+        if word_count >= 100:
+            score += 40
+        elif word_count >= 50:
+            score += 30
+        elif word_count >= 20:
+            score += 20
+        elif word_count >= 10:
+            score += 10
+
+        if question_type == 'behavioral':
+            # STAR方法检查 (Situation, Task, Action, Result)
+            score += min(features.count('star') * 10, 30)
+        elif question_type == 'technical':
+            score += min(features.count('tech_completeness') * 8, 30)
+
+        if features.has('conclusion'):
+            score += 15
+
+        return min(score, 100.0)
+
+    def score_technical(self, features: AnswerFeatures) -> float:
+        if not features.text:
+            return 0.0
+
+        score = 50.0
+        technical_terms = self.technical_term_count(features)
+        if technical_terms >= 8:
+            score += 30
+        elif technical_terms >= 5:
+            score += 20
+        elif technical_terms >= 3:
+            score += 15
+        elif technical_terms >= 1:
+            score += 10
+
+        score -= features.count('common_error') * 5
+        score += features.count('accuracy') * 5
+        return max(min(score, 100.0), 0.0)
+
+    def keywords_found(self, features: AnswerFeatures) -> Dict[str, List[str]]:
+        """按类别返回命中的技术关键词（保持原始大小写和顺序）"""
+        if not features.text:
+            return {}
+        return {
+            category: [k for k in keywords if k.lower() in features.found]
+            for category, keywords in self.technical_keywords.items()
+        }
+
+
+_scorers: Dict[Tuple, AnswerScorer] = {}
+_scorers_lock = threading.Lock()
+
+
+def get_answer_scorer(technical_keywords: Dict[str, List[str]]) -> AnswerScorer:
+    """按关键词表缓存编译好的评分器（进程内只编译一次）"""
+    key = tuple((category, tuple(keywords)) for category, keywords in technical_keywords.items())
+    scorer = _scorers.get(key)
+    if scorer is None:
+        with _scorers_lock:
+            scorer = _scorers.get(key)
+            if scorer is None:
+                scorer = AnswerScorer(technical_keywords)
+                _scorers[key] = scorer
+    return scorer
@@ -0,0 +1,97 @@
+"""Owner-indexed cache invalidation
+
+Every cache entry is registered in one or more sorted-set indexes (per user,
+per resume, global) with its expiry timestamp as the score. Invalidation and
+statistics then touch only the entries of that owner instead of running KEYS
+over the whole keyspace. Expired members are pruned lazily on read.
+SCAN-based helpers are kept for maintenance of entries that predate the
+indexes.
+"""
+
+import logging
+import time
+from typing import Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DELETE_BATCH_SIZE = 500
+
+
+def index_key(prefix: str, owner: str, owner_id=None) -> str:
+    """例如 interview_questions:index:user:42 / ref_answer:index:all"""
+    if owner_id is None:
+        return f"{prefix}:index:{owner}"
+    return f"{prefix}:index:{owner}:{owner_id}"
+
+
+def add_to_indexes(redis_client, cache_key: str, ttl: int, index_keys: Iterable[str]) -> None:
+    """登记缓存键到索引（与缓存条目同样的过期时间）"""
+    expire_at = time.time() + ttl
+    pipe = redis_client.pipeline(transaction=False)
+    for idx in index_keys:
+        pipe.zadd(idx, {cache_key: expire_at})
+        pipe.expire(idx, ttl)
+    pipe.execute()
+
+
+def indexed_keys(redis_client, idx: str, limit: int = -1) -> List[str]:
+    """返回索引中未过期的缓存键"""
+    redis_client.zremrangebyscore(idx, '-inf', time.time())
+    end = -1 if limit is None or limit < 0 else limit - 1
+    return list(redis_client.zrange(idx, 0, end))
+
+
+def count_indexed(redis_client, idx: str) -> int:
+    """统计索引中未过期的缓存键数量"""
+    redis_client.zremrangebyscore(idx, '-inf', time.time())
+    return redis_client.zcard(idx)
+
+
+def _delete_in_batches(redis_client, keys: List[str]) -> int:
+    deleted = 0
+    for i in range(0, len(keys), DELETE_BATCH_SIZE):
+        deleted += redis_client.delete(*keys[i:i + DELETE_BATCH_SIZE])
+    return deleted
+
+
+def delete_indexed(
+    redis_client,
+    idx: str,
+    unindex_from: Iterable[str] = (),
+    on_delete: Optional[Callable[[List[str]], None]] = None
+) -> int:
+    """删除索引中的所有缓存键及索引本身，并从其他索引中移除这些键
+
+    on_delete 会收到被删除的键列表（用于使进程内缓存副本失效）。
+    """
+    keys = list(redis_client.zrange(idx, 0, -1))
+    deleted = _delete_in_batches(redis_client, keys) if keys else 0
+    if keys and on_delete:
+        on_delete(keys)
+    pipe = redis_client.pipeline(transaction=False)
+    for other in unindex_from:
+        for i in range(0, len(keys), DELETE_BATCH_SIZE):
+            pipe.zrem(other, *keys[i:i + DELETE_BATCH_SIZE])
+    pipe.delete(idx)
+    pipe.execute()
+    return deleted
+
+
+def scan_keys(redis_client, pattern: str, count: int = 1000) -> List[str]:
+    """SCAN方式查找键（维护用，不阻塞Redis）"""
+    return list(redis_client.scan_iter(match=pattern, count=count))
+
+
+def scan_delete(redis_client, pattern: str, count: int = 1000) -> int:
+    """SCAN方式批量删除匹配的键（维护用）"""
+    deleted = 0
+    batch = []
+    for key in redis_client.scan_iter(match=pattern, count=count):
+        batch.append(key)
+        if len(batch) >= DELETE_BATCH_SIZE:
+            deleted += redis_client.delete(*batch)
+            batch = []
+    if batch:
+        deleted += redis_client.delete(*batch)
+    logger.info(f"SCAN deleted {deleted} keys matching {pattern}")
+    return deleted
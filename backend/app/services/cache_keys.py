@@ -0,0 +1,101 @@
+"""Stable, content-addressed cache keys for AI caches
+
+Keys are derived from a SHA-256 digest of the normalized inputs, so the same
+resume and generation parameters map to the same key in every process and
+across restarts. Bump CACHE_KEY_VERSION when prompts or payload formats
+change in a way that makes old entries unusable.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, Optional
+
+CACHE_KEY_VERSION = 'v1'
+
+# 缓存的问题记录格式（question_sets.normalize_question），格式变化时旧问题缓存不再读取
+QUESTION_SCHEMA_VERSION = 'q2'
+
+QUESTION_SET_PREFIX = 'interview_questions'
+QUESTION_LIST_PREFIX = 'questions_cache'
+REFERENCE_ANSWER_PREFIX = 'ref_answer'
+
+# 参与简历指纹计算的字段
+RESUME_FINGERPRINT_FIELDS = ('raw_text', 'skills', 'experience', 'education', 'projects')
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """压缩空白并去除首尾空格"""
+    if not text:
+        return ''
+    return re.sub(r'\s+', ' ', str(text)).strip()
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return normalize_text(value)
+    if isinstance(value, dict):
+        return {str(k): _normalize_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(v) for v in value]
+    if hasattr(value, 'value'):  # Enum
+        return value.value
+    return value
+
+
+def stable_digest(payload: Any, length: int = 32) -> str:
+    """对任意JSON可序列化数据生成跨进程稳定的摘要"""
+    data = json.dumps(
+        {'v': CACHE_KEY_VERSION, 'payload': _normalize_value(payload)},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(',', ':'),
+        default=str
+    )
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:length]
+
+
+def resume_fingerprint(resume) -> str:
+    """简历内容指纹（只依赖内容，与ID和更新时间无关）"""
+    return stable_digest({
+        field: getattr(resume, field, None) for field in RESUME_FINGERPRINT_FIELDS
+    })
+
+
+def question_set_key(
+    user_id: int,
+    resume,
+    interview_type: str,
+    total_questions: int,
+    difficulty_distribution: Optional[Dict] = None,
+    type_distribution: Optional[Dict] = None
+) -> str:
+    """QuestionCacheService 的问题集缓存键"""
+    digest = stable_digest({
+        'resume': resume_fingerprint(resume),
+        'interview_type': interview_type,
+        'total_questions': total_questions,
+        'difficulty': difficulty_distribution or {},
+        'type_dist': type_distribution or {},
+        'schema': QUESTION_SCHEMA_VERSION
+    })
+    return f"{QUESTION_SET_PREFIX}:user_{user_id}:hash_{digest}"
+
+
+def question_list_key(user_id: int, resume_id: int, resume=None) -> str:
+    """CacheService 的问题列表缓存键，传入简历时附加内容指纹"""
+    if resume is None:
+        return f"{QUESTION_LIST_PREFIX}:{QUESTION_SCHEMA_VERSION}:{user_id}:{resume_id}"
+    return f"{QUESTION_LIST_PREFIX}:{QUESTION_SCHEMA_VERSION}:{user_id}:{resume_id}:{resume_fingerprint(resume)}"
+
+
+def reference_answer_key(question, resume, model: str = '') -> str:
+    """参考答案缓存键：问题内容 + 类型 + 难度 + 简历指纹 + 模型"""
+    question_type = _normalize_value(question.question_type)
+    difficulty = _normalize_value(question.difficulty)
+    digest = stable_digest({
+        'question': normalize_text(question.question_text).lower(),
+        'resume': resume_fingerprint(resume),
+        'model': model
+    })
+    return f"{REFERENCE_ANSWER_PREFIX}:{question_type}:{difficulty}:{digest}"
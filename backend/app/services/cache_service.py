@@ -1,20 +1,21 @@
 import json
-import hashlib
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from flask import current_app
 from app.extensions import get_redis_client
+from app.services.cache_keys import question_list_key, QUESTION_LIST_PREFIX
+from app.services.cache_index import index_key, add_to_indexes, count_indexed, delete_indexed
 
 class CacheService:
     """缓存服务类"""
     
-    QUESTION_CACHE_PREFIX = "questions_cache"
+    QUESTION_CACHE_PREFIX = QUESTION_LIST_PREFIX
     CACHE_EXPIRY_DAYS = 7
     
     @staticmethod
-    def _get_cache_key(user_id: int, resume_id: int) -> str:
-        """生成缓存键"""
-        return f"{CacheService.QUESTION_CACHE_PREFIX}:{user_id}:{resume_id}"
+    def _get_cache_key(user_id: int, resume_id: int, resume=None) -> str:
+        """生成缓存键（传入简历时按内容寻址）"""
+        return question_list_key(user_id, resume_id, resume)
     
     @staticmethod
     def _get_resume_version_key(resume_id: int) -> str:
@@ -22,7 +23,12 @@ class CacheService:
         return f"resume_version:{resume_id}"
     
     @staticmethod
-    def get_cached_questions(user_id: int, resume_id: int) -> Optional[List[Dict[Any, Any]]]:
+    def _get_index_key(owner: str, owner_id: int = None) -> str:
+        """生成缓存索引键"""
+        return index_key(CacheService.QUESTION_CACHE_PREFIX, owner, owner_id)
+    
+    @staticmethod
+    def get_cached_questions(user_id: int, resume_id: int, resume=None) -> Optional[List[Dict[Any, Any]]]:
         """获取缓存的问题"""
         redis_client = get_redis_client()
         if not redis_client:
@@ -30,7 +36,7 @@ class CacheService:
             return None
         
         try:
-            cache_key = CacheService._get_cache_key(user_id, resume_id)
+            cache_key = CacheService._get_cache_key(user_id, resume_id, resume)
             cached_data = redis_client.get(cache_key)
             
             if cached_data:
@@ -46,7 +52,7 @@ class CacheService:
             return None
     
     @staticmethod
-    def set_cached_questions(user_id: int, resume_id: int, questions: List[Dict[Any, Any]], resume_updated_at: datetime = None):
+    def set_cached_questions(user_id: int, resume_id: int, questions: List[Dict[Any, Any]], resume_updated_at: datetime = None, resume=None):
         """设置缓存的问题"""
         redis_client = get_redis_client()
         if not redis_client:
@@ -54,7 +60,7 @@ class CacheService:
             return
         
         try:
-            cache_key = CacheService._get_cache_key(user_id, resume_id)
+            cache_key = CacheService._get_cache_key(user_id, resume_id, resume)
             version_key = CacheService._get_resume_version_key(resume_id)
             
             # 准备缓存数据
@@ -67,6 +73,11 @@ class CacheService:
             # 设置缓存，过期时间为7天
             expiry_seconds = CacheService.CACHE_EXPIRY_DAYS * 24 * 60 * 60
             redis_client.setex(cache_key, expiry_seconds, json.dumps(cache_data, default=str))
+            add_to_indexes(redis_client, cache_key, expiry_seconds, [
+                CacheService._get_index_key('resume', resume_id),
+                CacheService._get_index_key('user', user_id),
+                CacheService._get_index_key('all')
+            ])
             
             # 记录简历版本，用于后续缓存失效
             if resume_updated_at:
@@ -86,13 +97,14 @@ class CacheService:
             return
         
         try:
-            # 查找所有相关的缓存键
-            pattern = f"{CacheService.QUESTION_CACHE_PREFIX}:*:{resume_id}"
-            keys = redis_client.keys(pattern)
-            
-            if keys:
-                redis_client.delete(*keys)
-                current_app.logger.info(f"Invalidated {len(keys)} cache entries for resume {resume_id}")
+            # 通过简历索引删除相关缓存，不扫描整个键空间
+            deleted = delete_indexed(
+                redis_client,
+                CacheService._get_index_key('resume', resume_id),
+                unindex_from=[CacheService._get_index_key('all')]
+            )
+            if deleted:
+                current_app.logger.info(f"Invalidated {deleted} cache entries for resume {resume_id}")
             
             # 删除简历版本键
             version_key = CacheService._get_resume_version_key(resume_id)
@@ -130,11 +142,10 @@ class CacheService:
             return {"error": "Redis client not available"}
         
         try:
-            pattern = f"{CacheService.QUESTION_CACHE_PREFIX}:*"
-            keys = redis_client.keys(pattern)
+            total = count_indexed(redis_client, CacheService._get_index_key('all'))
             
             return {
-                "total_cached_entries": len(keys),
+                "total_cached_entries": total,
                 "cache_prefix": CacheService.QUESTION_CACHE_PREFIX,
                 "expiry_days": CacheService.CACHE_EXPIRY_DAYS
             }
@@ -3,7 +3,7 @@ Interview Analyzer Service
 面试结果分析服务，提供答案质量评估、表现分析、智能评分等功能
 """
 
-import re
+import copy
 import json
 import statistics
 from typing import Dict, List, Optional, Tuple
@@ -11,11 +11,16 @@ from datetime import datetime, timedelta
 from collections import Counter
 import openai
 from app.extensions import db
-from app.models.question import Question, Answer, InterviewSession
+from app.models.question import Question, Answer, InterviewSession, InterviewAnalysisResult
+from app.services.answer_scoring import get_answer_scorer
+from sqlalchemy.exc import IntegrityError
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 分析器版本：评分规则或结果结构变化时递增，已存储的旧版本结果会被忽略并重新计算
+ANALYZER_VERSION = '1'
+
 class InterviewAnalyzer:
     """面试结果分析器"""
     
@@ -45,6 +50,9 @@ class InterviewAnalyzer:
             ]
         }
         
+        # 所有关键词编译为一个自动机（进程内缓存）
+        self.scorer = get_answer_scorer(self.technical_keywords)
+        
         # 评分标准
         self.scoring_criteria = {
             'excellent': {'min': 90, 'description': '优秀'},
@@ -58,6 +66,9 @@ class InterviewAnalyzer:
         """
         分析整个面试会话
         
+        已完成会话的分析结果不会再变化，按（会话, 分析器版本）存储，
+        之后的请求直接读取；进行中的会话每次重新计算。
+        
         Args:
             session_id: 面试会话ID
             user_id: 用户ID
@@ -75,61 +86,19 @@ class InterviewAnalyzer:
             if not session:
                 raise ValueError(f"面试会话不存在: {session_id}")
             
-            answers = Answer.query.filter_by(session_id=session.id).all()
-            questions = Question.query.filter_by(session_id=session.id).all()
-            
-            # 执行各项分析
-            analysis_result = {
-                'session_info': self._get_session_info(session),
-                'overall_score': 0,
-                'section_scores': {},
-                'answer_analysis': [],
-                'performance_metrics': {},
-                'strengths': [],
-                'weaknesses': [],
-                'recommendations': [],
-                'detailed_feedback': {},
-                'visualization_data': {},
-                'analysis_date': datetime.utcnow().isoformat()
-            }
-            
-            # 答案质量分析
-            analysis_result['answer_analysis'] = self._analyze_answers(answers, questions)
-            
-            # 计算各项得分
-            analysis_result['section_scores'] = self._calculate_section_scores(
-                answers, questions, analysis_result['answer_analysis']
-            )
-            
-            # 计算总分
-            analysis_result['overall_score'] = self._calculate_overall_score(
-                analysis_result['section_scores']
-            )
-            
-            # 性能指标分析
-            analysis_result['performance_metrics'] = self._analyze_performance_metrics(
-                answers, questions, session
-            )
-            
-            # 优势和劣势分析
-            analysis_result['strengths'], analysis_result['weaknesses'] = \
-                self._identify_strengths_and_weaknesses(analysis_result)
-            
-            # 生成改进建议
-            analysis_result['recommendations'] = self._generate_recommendations(
-                analysis_result
-            )
-            
-            # 详细反馈
-            analysis_result['detailed_feedback'] = self._generate_detailed_feedback(
-                analysis_result
-            )
+            if session.status != 'completed':
+                return self._compute_session_analysis(session)
             
-            # 可视化数据
-            analysis_result['visualization_data'] = self._prepare_visualization_data(
-                analysis_result
-            )
+            stored = InterviewAnalysisResult.query.filter_by(
+                session_id=session.id,
+                analyzer_version=ANALYZER_VERSION
+            ).first()
+            if stored:
+                # 结果可能被调用方修改，返回副本
+                return copy.deepcopy(stored.result)
             
+            analysis_result = self._compute_session_analysis(session)
+            self._store_analysis(session, analysis_result)
             return analysis_result
             
         except Exception as e:
@@ -140,6 +109,85 @@ class InterviewAnalyzer:
                 'analysis_date': datetime.utcnow().isoformat()
             }
     
+    def _store_analysis(self, session: InterviewSession, analysis_result: Dict) -> None:
+        """保存已完成会话的分析结果，失败不影响本次返回"""
+        try:
+            db.session.add(InterviewAnalysisResult(
+                session_id=session.id,
+                user_id=session.user_id,
+                analyzer_version=ANALYZER_VERSION,
+                result=analysis_result,
+                overall_score=analysis_result['overall_score']
+            ))
+            db.session.commit()
+            logger.info(f"Stored analysis for session {session.session_id} (v{ANALYZER_VERSION})")
+        except IntegrityError:
+            # 并发请求已经保存了同一版本的结果
+            db.session.rollback()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Failed to store analysis for session {session.session_id}: {e}")
+    
+    def _compute_session_analysis(self, session: InterviewSession) -> Dict:
+        """计算会话的完整分析结果"""
+        answers = Answer.query.filter_by(session_id=session.id).all()
+        questions = Question.query.filter_by(session_id=session.id).all()
+        
+        # 执行各项分析
+        analysis_result = {
+            'session_info': self._get_session_info(session),
+            'overall_score': 0,
+            'section_scores': {},
+            'answer_analysis': [],
+            'performance_metrics': {},
+            'strengths': [],
+            'weaknesses': [],
+            'recommendations': [],
+            'detailed_feedback': {},
+            'visualization_data': {},
+            'analysis_date': datetime.utcnow().isoformat(),
+            'analyzer_version': ANALYZER_VERSION
+        }
+        
+        # 答案质量分析
+        analysis_result['answer_analysis'] = self._analyze_answers(answers, questions)
+        
+        # 计算各项得分
+        analysis_result['section_scores'] = self._calculate_section_scores(
+            answers, questions, analysis_result['answer_analysis']
+        )
+        
+        # 计算总分
+        analysis_result['overall_score'] = self._calculate_overall_score(
+            analysis_result['section_scores']
+        )
+        
+        # 性能指标分析
+        analysis_result['performance_metrics'] = self._analyze_performance_metrics(
+            answers, questions, session
+        )
+        
+        # 优势和劣势分析
+        analysis_result['strengths'], analysis_result['weaknesses'] = \
+            self._identify_strengths_and_weaknesses(analysis_result)
+        
+        # 生成改进建议
+        analysis_result['recommendations'] = self._generate_recommendations(
+            analysis_result
+        )
+        
+        # 详细反馈
+        analysis_result['detailed_feedback'] = self._generate_detailed_feedback(
+            analysis_result
+        )
+        
+        # 可视化数据
+        analysis_result['visualization_data'] = self._prepare_visualization_data(
+            analysis_result
+        )
+        
+        return analysis_result
+    
     def _get_session_info(self, session: InterviewSession) -> Dict:
         """获取会话基本信息"""
         return {
@@ -163,19 +211,26 @@ class InterviewAnalyzer:
         return str(enum_obj)
     
     def _analyze_answers(self, answers: List[Answer], questions: List[Question]) -> List[Dict]:
-        """分析所有答案"""
+        """分析所有答案（问题按ID索引，每个问题的关键词只提取一次）"""
+        questions_by_id = {q.id: q for q in questions}
+        question_keywords = {}
         analysis_results = []
         
         for answer in answers:
-            question = next((q for q in questions if q.id == answer.question_id), None)
+            question = questions_by_id.get(answer.question_id)
             if question:
-                answer_analysis = self._analyze_single_answer(answer, question)
+                if question.id not in question_keywords:
+                    question_keywords[question.id] = self.scorer.question_keywords(question.question_text)
+                answer_analysis = self._analyze_single_answer(
+                    answer, question, question_keywords[question.id]
+                )
                 analysis_results.append(answer_analysis)
         
         return analysis_results
     
-    def _analyze_single_answer(self, answer: Answer, question: Question) -> Dict:
-        """分析单个答案"""
+    def _analyze_single_answer(self, answer: Answer, question: Question,
+                               question_keywords: Optional[List[str]] = None) -> Dict:
+        """分析单个答案（答案只扫描一次，各项评分共用特征）"""
         analysis = {
             'question_id': question.id,
             'question_type': self._get_enum_value(question.question_type),
@@ -186,10 +241,12 @@ class InterviewAnalyzer:
             'answered_at': answer.answered_at.isoformat() if answer.answered_at else None
         }
         
+        features = self.scorer.features(answer.answer_text)
+        if question_keywords is None:
+            question_keywords = self.scorer.question_keywords(question.question_text)
+        
         # 答案质量评分
-        analysis['quality_score'] = self._score_answer_quality(
-            answer.answer_text, question
-        )
+        analysis['quality_score'] = self.scorer.score_quality(features, question_keywords)
         
         # 响应时间评分
         difficulty_value = self._get_enum_value(question.difficulty)
@@ -198,71 +255,31 @@ class InterviewAnalyzer:
         )
         
         # 完整性评分
-        analysis['completeness_score'] = self._score_completeness(
-            answer.answer_text, question
+        analysis['completeness_score'] = self.scorer.score_completeness(
+            features, analysis['question_type']
         )
         
         # 技术准确性评分
-        analysis['technical_score'] = self._score_technical_accuracy(
-            answer.answer_text, question
-        )
+        analysis['technical_score'] = self.scorer.score_technical(features)
         
         # 综合得分
         analysis['total_score'] = self._calculate_answer_total_score(analysis)
         
         # 关键词分析
-        analysis['keywords_found'] = self._extract_keywords(answer.answer_text)
+        analysis['keywords_found'] = self.scorer.keywords_found(features)
         
         # 答案长度分析
-        analysis['answer_length'] = len(answer.answer_text or "")
-        analysis['word_count'] = len((answer.answer_text or "").split())
+        analysis['answer_length'] = len(features.text)
+        analysis['word_count'] = features.word_count
         
         return analysis
     
     def _score_answer_quality(self, answer_text: str, question: Question) -> float:
         """评分答案质量"""
-        if not answer_text:
-            return 0.0
-        
-        score = 0.0
-        
-        # 基础长度检查
-        word_count = len(answer_text.split())
-        if word_count >= 50:
-            score += 30
-        elif word_count >= 20:
-            score += 20
-        elif word_count >= 10:
-            score += 10
-        
-        # 结构化检查
-        if any(marker in answer_text.lower() for marker in ['first', 'second', 'finally', '1.', '2.', '3.']):
-            score += 15
-        
-        # 技术词汇检查
-        technical_words = 0
-        for category, keywords in self.technical_keywords.items():
-            for keyword in keywords:
-                if keyword.lower() in answer_text.lower():
-                    technical_words += 1
-        
-        if technical_words >= 5:
-            score += 25
-        elif technical_words >= 3:
-            score += 15
-        elif technical_words >= 1:
-            score += 10
-        
-        # 实例和具体化检查
-        if any(indicator in answer_text.lower() for indicator in ['example', 'for instance', 'such as', '例如']):
-            score += 15
-        
-        # 问题相关性检查
-        question_keywords = self._extract_question_keywords(question.question_text)
-        relevance_score = self._calculate_relevance(answer_text, question_keywords)
-        score += relevance_score * 15
-        
-        return min(score, 100.0)
+        return self.scorer.score_quality(
+            self.scorer.features(answer_text),
+            self.scorer.question_keywords(question.question_text)
+        )
     
     def _score_response_time(self, response_time: Optional[int], difficulty: str) -> float:
         """评分响应时间"""
@@ -292,82 +309,14 @@ class InterviewAnalyzer:
     
     def _score_completeness(self, answer_text: str, question: Question) -> float:
         """评分答案完整性"""
-        if not answer_text:
-            return 0.0
-        
-        score = 0.0
-        
-        # 基础完整性
-        word_count = len(answer_text.split())
-        if word_count >= 100:
-            score += 40
-        elif word_count >= 50:
-            score += 30
-        elif word_count >= 20:
-            score += 20
-        elif word_count >= 10:
-            score += 10
-        
-        # 问题类型特定的完整性检查
-        question_type = self._get_enum_value(question.question_type)
-        
-        if question_type == 'behavioral':
-            # STAR方法检查 (Situation, Task, Action, Result)
-            star_indicators = ['situation', 'task', 'action', 'result', 'challenge', 'outcome']
-            found_indicators = sum(1 for indicator in star_indicators 
-                                 if indicator in answer_text.lower())
-            score += min(found_indicators * 10, 30)
-        
-        elif question_type == 'technical':
-            # 技术问题完整性检查
-            tech_indicators = ['algorithm', 'complexity', 'implementation', 'solution', 'approach']
-            found_indicators = sum(1 for indicator in tech_indicators 
-                                 if indicator in answer_text.lower())
-            score += min(found_indicators * 8, 30)
-        
-        # 结论和总结检查
-        conclusion_indicators = ['conclusion', 'summary', 'in summary', 'overall', 'finally']
-        if any(indicator in answer_text.lower() for indicator in conclusion_indicators):
-            score += 15
-        
-        return min(score, 100.0)
+        return self.scorer.score_completeness(
+            self.scorer.features(answer_text),
+            self._get_enum_value(question.question_type)
+        )
     
     def _score_technical_accuracy(self, answer_text: str, question: Question) -> float:
         """评分技术准确性"""
-        if not answer_text:
-            return 0.0
-        
-        score = 50.0  # 基础分
-        
-        # 技术词汇准确性
-        technical_terms = 0
-        for category, keywords in self.technical_keywords.items():
-            for keyword in keywords:
-                if keyword.lower() in answer_text.lower():
-                    technical_terms += 1
-        
-        # 技术术语使用得分
-        if technical_terms >= 8:
-            score += 30
-        elif technical_terms >= 5:
-            score += 20
-        elif technical_terms >= 3:
-            score += 15
-        elif technical_terms >= 1:
-            score += 10
-        
-        # 避免常见错误
-        common_errors = ['definitely', 'always works', 'never fails', 'impossible']
-        error_count = sum(1 for error in common_errors if error in answer_text.lower())
-        score -= error_count * 5
-        
-        # 准确性指标
-        accuracy_indicators = ['specifically', 'precisely', 'according to', 'research shows']
-        accuracy_count = sum(1 for indicator in accuracy_indicators 
-                           if indicator in answer_text.lower())
-        score += accuracy_count * 5
-        
-        return max(min(score, 100.0), 0.0)
+        return self.scorer.score_technical(self.scorer.features(answer_text))
     
     def _calculate_answer_total_score(self, analysis: Dict) -> float:
         """计算单个答案的总分"""
@@ -630,38 +579,15 @@ class InterviewAnalyzer:
     
     def _extract_keywords(self, text: str) -> Dict:
         """提取关键词"""
-        if not text:
-            return {}
-        
-        found_keywords = {}
-        for category, keywords in self.technical_keywords.items():
-            found_keywords[category] = []
-            for keyword in keywords:
-                if keyword.lower() in text.lower():
-                    found_keywords[category].append(keyword)
-        
-        return found_keywords
+        return self.scorer.keywords_found(self.scorer.features(text))
     
     def _extract_question_keywords(self, question_text: str) -> List[str]:
         """从问题中提取关键词"""
-        # 简单的关键词提取
-        words = re.findall(r'\b\w+\b', question_text.lower())
-        # 过滤停用词
-        stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-        return [word for word in words if len(word) > 3 and word not in stop_words]
+        return self.scorer.question_keywords(question_text)
     
     def _calculate_relevance(self, answer_text: str, question_keywords: List[str]) -> float:
         """计算答案与问题的相关性"""
-        if not answer_text or not question_keywords:
-            return 0.0
-        
-        answer_words = set(re.findall(r'\b\w+\b', answer_text.lower()))
-        question_words = set(question_keywords)
-        
-        intersection = answer_words.intersection(question_words)
-        union = answer_words.union(question_words)
-        
-        return len(intersection) / len(union) if union else 0.0
+        return self.scorer.relevance(self.scorer.features(answer_text), question_keywords)
     
     def _get_overall_assessment(self, score: float) -> str:
         """获取总体评价"""
@@ -2,12 +2,17 @@ import uuid
 import logging
 from datetime import datetime
 from typing import List, Dict, Any, Optional
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.extensions import db
 from app.models.resume import Resume
-from app.models.question import Question, InterviewSession, QuestionType, QuestionDifficulty, InterviewType
+from app.models.question import Question, InterviewSession, InterviewType
 from app.services.ai_question_generator import AIQuestionGenerator
+from app.services.interview_analyzer import InterviewAnalyzer
+from app.services.question_matcher import QuestionMatcher
+from app.services.question_sets import bulk_create_questions
+from app.services.user_stats_cache import get_user_stats, mark_user_stats_dirty
 from app.utils.exceptions import ValidationError, NotFoundError
 
 logger = logging.getLogger(__name__)
@@ -356,6 +361,16 @@ class InterviewService:
         session.completed_at = datetime.utcnow()
         db.session.commit()
         
+        # 正式面试完成后，该用户的问题匹配语料需要重新物化
+        if session.interview_type == InterviewType.TECHNICAL:
+            QuestionMatcher.invalidate_user_corpus(user_id)
+        
+        # 会话完成后结果不再变化，提前计算并保存分析结果，报告页直接读取
+        try:
+            InterviewAnalyzer().analyze_interview_session(session_id, int(user_id))
+        except Exception as e:
+            logger.warning(f"Failed to precompute analysis for session {session_id}: {e}")
+        
         logger.info(f"User {user_id} ended interview session {session_id}")
         return session
     
@@ -426,12 +441,20 @@ class InterviewService:
                 {'session_id': session.id, 'user_id': user_id}
             )
             
-            # 3. 删除面试会话
+            # 3. 删除已存储的分析结果（会话完成时生成，外键引用会话）
+            db.session.execute(
+                text("DELETE FROM interview_analysis_results WHERE session_id = :session_id"),
+                {'session_id': session.id}
+            )
+            
+            # 4. 删除面试会话
             db.session.execute(
                 text("DELETE FROM interview_sessions WHERE id = :session_id AND user_id = :user_id"),
                 {'session_id': session.id, 'user_id': user_id}
             )
             
+            # 原生SQL不经过flush，需要显式标记统计缓存失效
+            mark_user_stats_dirty(db.session, user_id)
             db.session.commit()
             
             logger.info(f"User {user_id} deleted interview session {session_id}")
@@ -444,16 +467,19 @@ class InterviewService:
     
     def get_interview_statistics(self, user_id: int) -> Dict[str, Any]:
         """获取用户面试统计信息"""
-        total_sessions = InterviewSession.query.filter_by(user_id=user_id).count()
-        completed_sessions = InterviewSession.query.filter_by(
-            user_id=user_id, 
-            status='completed'
-        ).count()
-        
-        in_progress_sessions = InterviewSession.query.filter_by(
-            user_id=user_id, 
-            status='in_progress'
-        ).count()
+        return get_user_stats('interviews', user_id, lambda: self._compute_interview_statistics(user_id))
+    
+    def _compute_interview_statistics(self, user_id: int) -> Dict[str, Any]:
+        """按状态分组一次聚合得到会话计数"""
+        status_counts = dict(
+            db.session.query(InterviewSession.status, func.count(InterviewSession.id))
+            .filter(InterviewSession.user_id == user_id)
+            .group_by(InterviewSession.status)
+            .all()
+        )
+        total_sessions = sum(status_counts.values())
+        completed_sessions = status_counts.get('completed', 0)
+        in_progress_sessions = status_counts.get('in_progress', 0)
         
         # 最近的面试会话
         recent_sessions = InterviewSession.query.filter_by(user_id=user_id)\
@@ -483,6 +509,7 @@ class InterviewService:
         
         # 删除现有问题
         Question.query.filter_by(resume_id=session.resume_id, user_id=user_id).delete()
+        mark_user_stats_dirty(db.session, user_id)
         
         # 获取简历
         resume = Resume.query.get(session.resume_id)
@@ -497,45 +524,8 @@ class InterviewService:
             type_distribution=session.type_distribution
         )
         
-        # 保存新问题
-        for q_data in questions_data:
-            # 确保枚举值正确转换
-            question_type_raw = q_data['question_type']
-            if hasattr(question_type_raw, 'value'):
-                # 如果是枚举对象，取其值
-                question_type_final = question_type_raw.value
-            elif isinstance(question_type_raw, str) and '.' in question_type_raw:
-                # 如果是字符串形式的枚举（如'QuestionType.TECHNICAL'），提取值部分并转换为小写
-                enum_value = question_type_raw.split('.')[-1]
-                question_type_final = enum_value.lower()
-            else:
-                question_type_final = question_type_raw
-            
-            difficulty_raw = q_data['difficulty']
-            if hasattr(difficulty_raw, 'value'):
-                # 如果是枚举对象，取其值
-                difficulty_final = difficulty_raw.value
-            elif isinstance(difficulty_raw, str) and '.' in difficulty_raw:
-                # 如果是字符串形式的枚举（如'QuestionDifficulty.MEDIUM'），提取值部分并转换为小写
-                enum_value = difficulty_raw.split('.')[-1]
-                difficulty_final = enum_value.lower()
-            else:
-                difficulty_final = difficulty_raw
-                
-            question = Question(
-                resume_id=session.resume_id,
-                user_id=user_id,
-                session_id=session.id,
-                question_text=q_data['question_text'],
-                question_type=QuestionType(question_type_final),  # 转换为枚举对象
-                difficulty=QuestionDifficulty(difficulty_final),  # 转换为枚举对象
-                category=q_data.get('category', ''),
-                tags=q_data.get('tags', []),
-                ai_context=q_data.get('ai_context', {}),
-                expected_answer=q_data.get('expected_answer', ''),
-                evaluation_criteria=q_data.get('evaluation_criteria', {})
-            )
-            db.session.add(question)
+        # 保存新问题（规范化问题记录，一条INSERT写入）
+        bulk_create_questions(questions_data, user_id=user_id, resume_id=session.resume_id, session_id=session.id)
         
         db.session.commit()
         
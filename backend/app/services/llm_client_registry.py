@@ -0,0 +1,137 @@
+"""Process-wide pooled LLM client registry"""
+
+import atexit
+import importlib.util
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+import openai
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+# 提供商连接信息
+LLM_PROVIDERS = {
+    'deepseek': {
+        'base_url': 'https://api.deepseek.com',
+        'api_key_config': 'DEEPSEEK_API_KEY',
+    },
+}
+
+DEFAULT_HTTP_POOL = {
+    'max_connections': 20,
+    'max_keepalive_connections': 10,
+    'keepalive_expiry': 60.0,
+    'connect_timeout': 5.0,
+    'read_timeout': 60.0,
+}
+
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+# provider -> (pid, api_key, client)
+_clients: Dict[str, Tuple[int, str, openai.OpenAI]] = {}
+_lock = threading.Lock()
+_hooks_registered = False
+
+
+def _pool_settings() -> Dict[str, float]:
+    settings = dict(DEFAULT_HTTP_POOL)
+    try:
+        settings.update(current_app.config.get('LLM_HTTP_POOL', {}))
+    except RuntimeError:
+        pass
+    return settings
+
+
+def _build_client(provider: str, api_key: str) -> openai.OpenAI:
+    settings = _pool_settings()
+    http_client = httpx.Client(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=int(settings['max_connections']),
+            max_keepalive_connections=int(settings['max_keepalive_connections']),
+            keepalive_expiry=float(settings['keepalive_expiry'])
+        ),
+        timeout=httpx.Timeout(float(settings['read_timeout']), connect=float(settings['connect_timeout']))
+    )
+    client = openai.OpenAI(
+        api_key=api_key,
+        base_url=LLM_PROVIDERS[provider]['base_url'],
+        http_client=http_client
+    )
+    logger.info(f"LLM client for {provider} created in pid {os.getpid()} (http2={HTTP2_AVAILABLE})")
+    return client
+
+
+def get_llm_client(provider: str = 'deepseek') -> Optional[openai.OpenAI]:
+    """
+    获取进程内共享的LLM客户端
+
+    同一进程内所有服务复用一个带连接池的客户端；fork后的子进程（gunicorn/celery
+    worker）首次调用时会重建客户端，不会继承父进程的连接。
+    API Key未配置时返回None。
+    """
+    if provider not in LLM_PROVIDERS:
+        raise ValueError(f"Unknown LLM provider: {provider}")
+
+    api_key = current_app.config.get(LLM_PROVIDERS[provider]['api_key_config'])
+    if not api_key:
+        logger.warning(f"{LLM_PROVIDERS[provider]['api_key_config']} not configured")
+        return None
+
+    pid = os.getpid()
+    entry = _clients.get(provider)
+    if entry and entry[0] == pid and entry[1] == api_key:
+        return entry[2]
+
+    with _lock:
+        entry = _clients.get(provider)
+        if entry and entry[0] == pid and entry[1] == api_key:
+            return entry[2]
+        if entry and entry[0] == pid:
+            # API Key变更，关闭旧连接池
+            _close_client(entry[2])
+        client = _build_client(provider, api_key)
+        _clients[provider] = (pid, api_key, client)
+        return client
+
+
+def _close_client(client: openai.OpenAI):
+    try:
+        client.close()
+    except Exception as e:
+        logger.warning(f"Failed to close LLM client: {e}")
+
+
+def close_llm_clients():
+    """关闭当前进程创建的所有LLM客户端"""
+    pid = os.getpid()
+    with _lock:
+        for provider, (owner_pid, _, client) in list(_clients.items()):
+            if owner_pid == pid:
+                _close_client(client)
+        _clients.clear()
+
+
+def reset_llm_clients():
+    """fork后调用：丢弃从父进程继承的客户端（不关闭共享socket）"""
+    global _lock
+    _lock = threading.Lock()
+    _clients.clear()
+
+
+def init_llm_clients(app):
+    """注册LLM客户端生命周期钩子"""
+    global _hooks_registered
+    if not _hooks_registered:
+        atexit.register(close_llm_clients)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=reset_llm_clients)
+        _hooks_registered = True
+    app.extensions['llm_clients'] = {
+        'providers': list(LLM_PROVIDERS.keys()),
+        'http2': HTTP2_AVAILABLE,
+    }
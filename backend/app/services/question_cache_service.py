@@ -1,11 +1,15 @@
 import json
-import hashlib
 import logging
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from flask import current_app
 from app.extensions import get_redis_client
 from app.models.resume import Resume
+from app.services.cache_keys import question_set_key, resume_fingerprint, QUESTION_SET_PREFIX
+from app.services.cache_index import (
+    index_key, add_to_indexes, indexed_keys, count_indexed, delete_indexed, scan_delete
+)
+from app.services.two_tier_cache import get_two_tier_cache
 
 logger = logging.getLogger(__name__)
 
@@ -15,23 +19,20 @@ class QuestionCacheService:
     def __init__(self, redis_client=None):
         self.redis_client = redis_client
         self.cache_ttl = 3600  # 1 hour cache expiration time
+        self.tiered_cache = get_two_tier_cache('interview_questions')  # In-process tier in front of Redis
         
+    def _index_key(self, owner: str, owner_id: int = None) -> str:
+        """Cache index key for an owner (user / resume / all)"""
+        return index_key(QUESTION_SET_PREFIX, owner, owner_id)
+    
+    def _invalidate_local(self, keys: List[str]) -> None:
+        """Drop in-process copies of deleted keys in every worker"""
+        self.tiered_cache.invalidate(keys, self.redis_client)
+    
     def _generate_resume_hash(self, resume: Resume) -> str:
-        """Generate resume content hash"""
+        """Generate resume content hash (stable across processes)"""
         try:
-            # Generate hash based on key information of resume
-            content_parts = [
-                str(resume.id),
-                resume.name or '',
-                resume.email or '',
-                str(len(resume.skills or [])),
-                str(len(resume.experience or [])),
-                str(len(resume.education or [])),
-                str(len(resume.projects or [])),
-                resume.updated_at.isoformat() if resume.updated_at else ''
-            ]
-            content_string = '|'.join(content_parts)
-            return hashlib.md5(content_string.encode()).hexdigest()
+            return resume_fingerprint(resume)
         except Exception as e:
             logger.error(f"Failed to generate resume hash: {e}")
             # If hash generation fails, use resume ID as fallback
@@ -40,25 +41,11 @@ class QuestionCacheService:
     def _generate_cache_key(self, user_id: int, resume: Resume, interview_type: str, 
                            total_questions: int, difficulty_distribution: dict = None, 
                            type_distribution: dict = None) -> str:
-        """Generate improved cache key"""
-        # Generate resume content hash
-        resume_hash = self._generate_resume_hash(resume)
-        
-        cache_data = {
-            'user_id': user_id,                    # ✅ User ID
-            'resume_hash': resume_hash,            # ✅ Resume content hash
-            'interview_type': interview_type,      # ✅ Interview type
-            'total_questions': total_questions,    # ✅ Number of questions
-            'difficulty': difficulty_distribution or {},
-            'type_dist': type_distribution or {}
-        }
-        
-        # Use hash of JSON string as cache key
-        cache_string = json.dumps(cache_data, sort_keys=True)
-        cache_hash = hashlib.md5(cache_string.encode()).hexdigest()
-        
-        # Use structured cache key format
-        return f"interview_questions:user_{user_id}:hash_{cache_hash}"
+        """Generate content-addressed cache key"""
+        return question_set_key(
+            user_id, resume, interview_type, total_questions,
+            difficulty_distribution, type_distribution
+        )
     
     def get_cached_questions(self, user_id: int, resume: Resume, interview_type: str, 
                            total_questions: int, difficulty_distribution: dict = None, 
@@ -73,9 +60,8 @@ class QuestionCacheService:
                 difficulty_distribution, type_distribution
             )
             
-            cached_data = self.redis_client.get(cache_key)
-            if cached_data:
-                questions = json.loads(cached_data)
+            questions = self.tiered_cache.get(cache_key, self.redis_client)
+            if questions:
                 logger.info(f"✅ User {user_id} retrieved {len(questions)} questions from cache")
                 return questions
             else:
@@ -104,11 +90,18 @@ class QuestionCacheService:
             cached_data = json.dumps(questions, ensure_ascii=False)
             
             # Set cache with expiration time
-            result = self.redis_client.setex(
+            result = self.tiered_cache.set(
                 cache_key, 
+                questions, 
                 self.cache_ttl, 
-                cached_data
+                self.redis_client, 
+                serialized=cached_data
             )
+            add_to_indexes(self.redis_client, cache_key, self.cache_ttl, [
+                self._index_key('user', user_id),
+                self._index_key('resume', resume.id),
+                self._index_key('all')
+            ])
             
             logger.info(f"✅ User {user_id} successfully cached {len(questions)} questions")
             return result
@@ -123,15 +116,12 @@ class QuestionCacheService:
             return 0
             
         try:
-            # Find all cache keys for this user
-            pattern = f"interview_questions:user_{user_id}:*"
-            keys = self.redis_client.keys(pattern)
-            
-            if keys:
-                cleared_count = self.redis_client.delete(*keys)
-            else:
-                cleared_count = 0
-                
+            cleared_count = delete_indexed(
+                self.redis_client,
+                self._index_key('user', user_id),
+                unindex_from=[self._index_key('all')],
+                on_delete=self._invalidate_local
+            )
             logger.info(f"✅ Cleared {cleared_count} cache items for user {user_id}")
             return cleared_count
             
@@ -146,34 +136,20 @@ class QuestionCacheService:
             
         try:
             if resume_id:
-                # Clear cache for specific resume
-                pattern = "interview_questions:*"
-                keys = self.redis_client.keys(pattern)
-                
-                cleared_count = 0
-                for key in keys:
-                    # Check if key contains specified resume_id
-                    try:
-                        cached_data = self.redis_client.get(key)
-                        if cached_data:
-                            data = json.loads(cached_data)
-                            # Since we use resume hash, we need to check differently
-                            # Here we clear all cache for simplicity
-                            pass
-                    except:
-                        pass
-                        
-                logger.info(f"✅ Cleared {cleared_count} cache items")
-                return cleared_count
+                # Clear cache for specific resume via its index
+                cleared_count = delete_indexed(
+                    self.redis_client,
+                    self._index_key('resume', resume_id),
+                    unindex_from=[self._index_key('all')],
+                    on_delete=self._invalidate_local
+                )
             else:
-                # Clear all question cache
-                pattern = "interview_questions:*"
-                keys = self.redis_client.keys(pattern)
-                if keys:
-                    cleared_count = self.redis_client.delete(*keys)
-                    logger.info(f"✅ Cleared {len(keys)} cache items")
-                    return cleared_count
-                return 0
+                # Maintenance: clear all question cache (including unindexed legacy keys) with SCAN
+                cleared_count = scan_delete(self.redis_client, f"{QUESTION_SET_PREFIX}:*")
+                self.tiered_cache.invalidate_all(self.redis_client)
+                
+            logger.info(f"✅ Cleared {cleared_count} cache items")
+            return cleared_count
                 
         except Exception as e:
             logger.error(f"Failed to clear cache: {e}")
@@ -189,19 +165,18 @@ class QuestionCacheService:
             }
             
         try:
-            pattern = "interview_questions:*"
-            keys = self.redis_client.keys(pattern)
+            all_index = self._index_key('all')
             
             stats = {
-                'total_keys': len(keys),
+                'total_keys': count_indexed(self.redis_client, all_index),
                 'cache_enabled': True,
                 'cache_ttl': self.cache_ttl,
-                'pattern': pattern
+                'pattern': f"{QUESTION_SET_PREFIX}:*"
             }
             
-            # Count by user (optional, may be slow for large datasets)
+            # Count by user (sampled from the global index)
             user_counts = {}
-            for key in keys[:100]:  # Limit to first 100 to avoid performance issues
+            for key in indexed_keys(self.redis_client, all_index, limit=100):
                 try:
                     parts = key.split(':')
                     if len(parts) >= 2:
@@ -213,6 +188,7 @@ class QuestionCacheService:
                     continue
                     
             stats['user_distribution'] = user_counts
+            stats['tiers'] = self.tiered_cache.stats()
             return stats
             
         except Exception as e:
@@ -0,0 +1,129 @@
+"""Inverted TF-IDF index over a user's historical interview questions
+
+Questions are tokenized once when they are added (words for Latin text,
+character bigrams for CJK runs). A lookup only walks the postings of the
+query's terms, so its cost depends on how many questions share a term with
+the query rather than on the size of the history. Documents can be added
+incrementally; vector norms are recomputed lazily when the corpus grows.
+"""
+
+import heapq
+import math
+import re
+from typing import Any, Dict, List, Tuple
+
+_CJK_RUN_RE = re.compile(r'[㐀-鿿豈-﫿]+')
+
+# 语料足够大时，出现在超过该比例问题中的词视为高频词，优先只遍历低频词的倒排表
+MAX_DF_RATIO = 0.5
+MIN_DOCS_FOR_DF_PRUNING = 20
+
+
+def index_terms(processed_text: str) -> List[str]:
+    """把预处理后的文本切分为索引词"""
+    terms = []
+    for token in processed_text.split():
+        if not _CJK_RUN_RE.search(token):
+            terms.append(token)
+            continue
+        # 中英混排：非中文部分按词，中文部分按双字
+        for part in _CJK_RUN_RE.split(token):
+            if part:
+                terms.append(part)
+        for run in _CJK_RUN_RE.findall(token):
+            if len(run) == 1:
+                terms.append(run)
+            else:
+                terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+def _term_counts(terms: List[str]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for term in terms:
+        counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+class QuestionIndex:
+    """Per-user inverted index of question texts"""
+
+    def __init__(self):
+        self.docs: List[Dict[str, Any]] = []
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self._doc_terms: List[Dict[str, int]] = []
+        self._norms: List[float] = []
+        self._norms_doc_count = -1
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add(self, item: Dict[str, Any], processed_text: str) -> int:
+        """添加一个问题，item 原样保存在 docs 中，返回文档编号"""
+        doc_id = len(self.docs)
+        counts = _term_counts(index_terms(processed_text))
+        self.docs.append(item)
+        self._doc_terms.append(counts)
+        for term, count in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+        # 文档数变化后idf改变，范数在下次查询时重算
+        self._norms_doc_count = -1
+        return doc_id
+
+    def _idf(self, term: str) -> float:
+        df = len(self.postings.get(term, ()))
+        return math.log((len(self.docs) + 1) / (df + 1)) + 1.0
+
+    def _ensure_norms(self) -> None:
+        if self._norms_doc_count == len(self.docs):
+            return
+        idf = {term: self._idf(term) for term in self.postings}
+        self._norms = [
+            math.sqrt(sum((count * idf[term]) ** 2 for term, count in counts.items())) or 1.0
+            for counts in self._doc_terms
+        ]
+        self._norms_doc_count = len(self.docs)
+
+    def _accumulate(self, scores: Dict[int, float], terms: List[str], query_counts: Dict[str, int]) -> None:
+        for term in terms:
+            idf = self._idf(term)
+            weight = query_counts[term] * idf * idf
+            for doc_id, count in self.postings[term].items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * count
+
+    def search(self, processed_query: str, top_k: int = 20) -> List[Tuple[int, float]]:
+        """返回 (doc_id, 余弦相似度) 的前 top_k 个候选"""
+        if not self.docs:
+            return []
+        self._ensure_norms()
+
+        query_counts = _term_counts(index_terms(processed_query))
+        doc_count = len(self.docs)
+        max_df = doc_count * MAX_DF_RATIO if doc_count >= MIN_DOCS_FOR_DF_PRUNING else doc_count
+        terms = [term for term in query_counts if term in self.postings]
+        informative = [term for term in terms if len(self.postings[term]) <= max_df]
+        common = [term for term in terms if len(self.postings[term]) > max_df]
+
+        query_norm = math.sqrt(sum((count * self._idf(term)) ** 2 for term, count in query_counts.items())) or 1.0
+        scores: Dict[int, float] = {}
+        self._accumulate(scores, informative, query_counts)
+        if len(scores) < top_k:
+            # 低频词召回不足时才遍历高频词的倒排表
+            self._accumulate(scores, common, query_counts)
+        else:
+            # 高频词只给已召回的候选加分
+            for term in common:
+                idf = self._idf(term)
+                weight = query_counts[term] * idf * idf
+                postings = self.postings[term]
+                for doc_id in scores:
+                    if doc_id in postings:
+                        scores[doc_id] += weight * postings[doc_id]
+
+        if not scores:
+            return []
+        return heapq.nlargest(
+            top_k,
+            ((doc_id, score / (query_norm * self._norms[doc_id])) for doc_id, score in scores.items()),
+            key=lambda pair: pair[1]
+        )
@@ -1,17 +1,37 @@
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import uuid
+from typing import List, Dict, Any, Optional, Tuple
 from difflib import SequenceMatcher
 import re
 from sqlalchemy import and_
 
-from app.extensions import db
+from app.extensions import db, get_redis_client
 from app.models.question import Question, Answer, InterviewSession, InterviewType
+from app.services.question_index import QuestionIndex
+from app.services.two_tier_cache import get_two_tier_cache
 from app.utils.exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
 
 """Question matching service"""
 
+# 每个用户的正式面试语料（已预处理），物化在两级缓存中，面试完成时失效
+CORPUS_CACHE_NAMESPACE = 'formal_corpus'
+CORPUS_CACHE_TTL = 7 * 86400  # 依赖显式失效，TTL只用于回收不活跃用户
+
+# 由语料构建的倒排索引（进程内），语料版本变化时重建
+INDEX_CACHE_MAX_USERS = 1000
+RERANK_CANDIDATES = 50  # 倒排索引召回后用原相似度公式精排的候选数
+
+_index_cache: Dict[int, Tuple[str, QuestionIndex]] = {}
+_index_cache_lock = threading.Lock()
+
+
+def formal_corpus_key(user_id: int) -> str:
+    return f"{CORPUS_CACHE_NAMESPACE}:user_{int(user_id)}"
+
+
 class QuestionMatcher:
     def __init__(self):
         self.similarity_threshold = 0.6  # Similarity threshold
@@ -37,23 +57,26 @@ class QuestionMatcher:
                 logger.info(f"Query text too short, skip matching: {processed_query}")
                 return []
             
-            # Get all Formal Interview questions and answers for user
-            qa_data = self._get_user_formal_interview_data(user_id)
+            # Get the user's Formal Interview question index
+            index = self._get_user_index(user_id)
             
-            if not qa_data:
+            if not len(index):
                 logger.info(f"User {user_id} has no Formal Interview history data")
                 return []
             
-            # Calculate similarity and sort
+            # Recall candidates sharing terms with the query, then rerank them
+            query_words = set(processed_query.split())
             matches = []
-            for item in qa_data:
-                question_text = item['question_text']
-                similarity = self._calculate_similarity(processed_query, question_text)
+            for doc_id, _ in index.search(processed_query, max(RERANK_CANDIDATES, limit * 4)):
+                item = index.docs[doc_id]
+                similarity = self._similarity_processed(
+                    processed_query, item['processed_text'], query_words, item['words']
+                )
                 
                 if similarity >= self.similarity_threshold:
                     matches.append({
                         'question_id': item['question_id'],
-                        'question_text': question_text,
+                        'question_text': item['question_text'],
                         'answer_text': item['answer_text'],
                         'similarity': similarity,
                         'session_id': item['session_id'],
@@ -62,8 +85,8 @@ class QuestionMatcher:
                         'ai_feedback': item.get('ai_feedback')
                     })
             
-            # Sort by similarity in descending order
-            matches.sort(key=lambda x: x['similarity'], reverse=True)
+            # Sort by similarity in descending order (most recent first on ties)
+            matches.sort(key=lambda x: (x['similarity'], x['answered_at'] or ''), reverse=True)
             
             logger.info(f"Found {len(matches)} matching questions for user {user_id}")
             return matches[:limit]
@@ -72,12 +95,74 @@ class QuestionMatcher:
             logger.error(f"Question matching failed: {e}")
             return []
     
-    def _get_user_formal_interview_data(self, user_id: int) -> List[Dict[str, Any]]:
-        """Get all Formal Interview question and answer data for user"""
+    def _get_user_index(self, user_id: int) -> QuestionIndex:
+        """Return the question index for user's current corpus version"""
+        user_id = int(user_id)
+        corpus = self._get_user_corpus(user_id)
+        
+        with _index_cache_lock:
+            cached = _index_cache.get(user_id)
+            if cached and cached[0] == corpus['version']:
+                return cached[1]
+        
+        index = QuestionIndex()
+        for item in corpus['items']:
+            # 缓存中的语料是共享只读对象，索引保存自己的副本
+            index.add({**item, 'words': set(item['words'])}, item['processed_text'])
+        
+        with _index_cache_lock:
+            if len(_index_cache) >= INDEX_CACHE_MAX_USERS and user_id not in _index_cache:
+                _index_cache.pop(next(iter(_index_cache)), None)
+            _index_cache[user_id] = (corpus['version'], index)
+        logger.info(f"Built question index for user {user_id}: {len(index)} questions")
+        return index
+    
+    def _get_user_corpus(self, user_id: int) -> Dict[str, Any]:
+        """Get user's preprocessed Formal Interview corpus, materializing it on a miss"""
+        redis_client = get_redis_client()
+        cache = get_two_tier_cache(CORPUS_CACHE_NAMESPACE)
+        key = formal_corpus_key(user_id)
+        try:
+            corpus = cache.get(key, redis_client)
+            if corpus is not None:
+                return corpus
+        except Exception as e:
+            logger.warning(f"Failed to read formal corpus cache for user {user_id}: {e}")
+        
+        items = []
+        rows = self._get_user_formal_interview_data(user_id)
+        for row in rows or []:
+            processed = self._preprocess_text(row['question_text'])
+            items.append({**row, 'processed_text': processed, 'words': sorted(set(processed.split()))})
+        corpus = {'version': uuid.uuid4().hex, 'items': items}
+        
+        # 查询失败时不缓存空语料
+        if rows is not None:
+            try:
+                cache.set(key, corpus, CORPUS_CACHE_TTL, redis_client)
+            except Exception as e:
+                logger.warning(f"Failed to cache formal corpus for user {user_id}: {e}")
+        return corpus
+    
+    @staticmethod
+    def invalidate_user_corpus(user_id: int) -> None:
+        """Drop user's cached corpus in Redis and in every process's local tier"""
+        user_id = int(user_id)
+        key = formal_corpus_key(user_id)
+        redis_client = get_redis_client()
+        try:
+            if redis_client:
+                redis_client.delete(key)
+            get_two_tier_cache(CORPUS_CACHE_NAMESPACE).invalidate([key], redis_client)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate formal corpus for user {user_id}: {e}")
+        with _index_cache_lock:
+            _index_cache.pop(user_id, None)
+        logger.info(f"Formal corpus cache invalidated for user {user_id}")
+    
+    def _get_user_formal_interview_data(self, user_id: int) -> Optional[List[Dict[str, Any]]]:
+        """Get all Formal Interview question and answer data for user (None if the query failed)"""
         try:
-            from app.models.question import Question, Answer, InterviewSession
-            from app.models.question import InterviewType
-            
             # Query all completed formal interview sessions and their questions/answers
             query = db.session.query(
                 Question.id.label('question_id'),
@@ -113,7 +198,7 @@ class QuestionMatcher:
             
         except Exception as e:
             logger.error(f"Failed to get user formal interview data: {e}")
-            return []
+            return None
     
     def _preprocess_text(self, text: str) -> str:
         """Preprocess text"""
@@ -141,14 +226,17 @@ class QuestionMatcher:
         processed_text1 = self._preprocess_text(text1)
         processed_text2 = self._preprocess_text(text2)
         
+        return self._similarity_processed(
+            processed_text1, processed_text2, set(processed_text1.split()), set(processed_text2.split())
+        )
+    
+    def _similarity_processed(self, processed_text1: str, processed_text2: str, words1: set, words2: set) -> float:
+        """Similarity of two already-preprocessed texts"""
         # Use SequenceMatcher to calculate similarity
         matcher = SequenceMatcher(None, processed_text1, processed_text2)
         sequence_similarity = matcher.ratio()
         
         # Additional keyword matching bonus
-        words1 = set(processed_text1.split())
-        words2 = set(processed_text2.split())
-        
         if words1 and words2:
             keyword_overlap = len(words1.intersection(words2)) / len(words1.union(words2))
         else:
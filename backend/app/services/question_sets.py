@@ -0,0 +1,121 @@
+"""Normalized question records and bulk persistence for question sets
+
+Generated questions are passed around and cached as plain records with a
+fixed field set, where question_type / difficulty hold the enum *values*.
+Raw generator or legacy payloads are normalized once at the boundary
+(`normalize_questions`); cached records can be written to the database as
+they are. A question set is persisted with one multi-row INSERT.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models.question import Question, QuestionType, QuestionDifficulty
+from app.services.user_stats_cache import mark_user_stats_dirty
+
+logger = logging.getLogger(__name__)
+
+# 兼容旧格式：枚举对象、枚举值、枚举名、str(枚举)（如 'QuestionType.TECHNICAL'）
+_TYPE_LOOKUP = {}
+for _member in QuestionType:
+    _TYPE_LOOKUP.update({_member: _member, _member.value: _member, _member.name: _member, str(_member): _member})
+_DIFFICULTY_LOOKUP = {}
+for _member in QuestionDifficulty:
+    _DIFFICULTY_LOOKUP.update({_member: _member, _member.value: _member, _member.name: _member, str(_member): _member})
+
+
+def _lookup(table: Dict[Any, Any], raw: Any, default):
+    try:
+        return table.get(raw) or table.get(str(raw).strip().lower()) or default
+    except TypeError:
+        return default
+
+
+def normalize_question(data: Dict[str, Any]) -> Dict[str, Any]:
+    """把生成器/旧缓存的问题数据转换为规范化问题记录（可直接JSON序列化）"""
+    return {
+        # 旧缓存使用 'question' 字段保存问题文本
+        'question_text': data.get('question_text') or data.get('question') or data.get('content') or '',
+        'question_type': _lookup(_TYPE_LOOKUP, data.get('question_type'), QuestionType.GENERAL).value,
+        'difficulty': _lookup(_DIFFICULTY_LOOKUP, data.get('difficulty'), QuestionDifficulty.MEDIUM).value,
+        'category': data.get('category') or '',
+        'tags': data.get('tags') or [],
+        'expected_answer': data.get('expected_answer') or '',
+        'evaluation_criteria': data.get('evaluation_criteria') or {},
+        'ai_context': data.get('ai_context') or {}
+    }
+
+
+def normalize_questions(questions: Optional[Iterable[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    return [normalize_question(question) for question in questions or []]
+
+
+def bulk_create_questions(
+    records: List[Dict[str, Any]],
+    user_id: int,
+    resume_id: int,
+    session_id: Optional[int] = None
+) -> List[Question]:
+    """
+    用一条INSERT写入一组规范化问题记录（不提交事务）
+
+    支持 INSERT ... RETURNING 的数据库直接返回新对象。MySQL 一条多行
+    INSERT ... VALUES 分配的自增ID是连续的，按 LAST_INSERT_ID() 起的ID区间
+    回查本批次（不按时间等条件回查，否则会混入同一时刻并发写入的其他批次）。
+    其他不支持 RETURNING 的数据库通过ORM add_all + flush 逐行写入。
+
+    Returns:
+        按记录顺序排列的 Question 对象
+    """
+    if not records:
+        return []
+
+    created_at = datetime.utcnow()
+    rows = [
+        {
+            'resume_id': resume_id,
+            'user_id': user_id,
+            'session_id': session_id,
+            'question_text': record['question_text'],
+            'question_type': QuestionType(record['question_type']),
+            'difficulty': QuestionDifficulty(record['difficulty']),
+            'category': record.get('category', ''),
+            'tags': record.get('tags', []),
+            'expected_answer': record.get('expected_answer', ''),
+            'evaluation_criteria': record.get('evaluation_criteria', {}),
+            'ai_context': record.get('ai_context', {}),
+            'created_at': created_at,
+            'updated_at': created_at
+        }
+        for record in records
+    ]
+
+    dialect = db.session.get_bind().dialect
+    if dialect.insert_executemany_returning:
+        # 不要求按参数顺序返回（否则部分数据库会退化为逐行INSERT），自增ID即插入顺序
+        questions = sorted(db.session.scalars(insert(Question).returning(Question), rows), key=lambda q: q.id)
+    elif dialect.name in ('mysql', 'mariadb'):
+        result = db.session.execute(insert(Question.__table__).values(rows))
+        # 多行INSERT时 lastrowid 为 LAST_INSERT_ID()，即本语句第一行的ID
+        first_id = result.lastrowid
+        questions = Question.query.filter(
+            Question.id.between(first_id, first_id + len(rows) - 1),
+            Question.user_id == user_id
+        ).order_by(Question.id).all()
+        if len(questions) != len(rows):
+            raise RuntimeError(
+                f"Bulk insert of {len(rows)} questions returned {len(questions)} rows from id {first_id}"
+            )
+    else:
+        questions = [Question(**row) for row in rows]
+        db.session.add_all(questions)
+        db.session.flush()
+
+    # 批量INSERT不经过flush，需要显式标记统计缓存失效
+    mark_user_stats_dirty(db.session, user_id)
+    logger.info(f"Bulk inserted {len(rows)} questions for user {user_id}, session {session_id}")
+    return questions
@@ -0,0 +1,143 @@
+"""Shared reference answer templates for generic interview questions"""
+
+import copy
+import hashlib
+import logging
+import re
+from typing import Any, Dict, Optional
+
+from flask import current_app
+
+from app.models.question import QuestionType
+from app.services.question_matcher import QuestionMatcher
+from app.services.two_tier_cache import get_two_tier_cache
+
+logger = logging.getLogger(__name__)
+
+# 与简历内容无关的通用问题：整句匹配预处理后的问题文本，
+# 含有项目、公司等额外内容的问题与简历相关，不使用共享模板
+GENERIC_QUESTION_PATTERNS = [
+    r'(can you |could you |would you )?tell (me|us) (a little |a bit |more )?about yourself',
+    r'(can you |could you |would you )?introduce yourself',
+    r'walk (me|us) through your (background|resume|cv)',
+    r'what (are|is) your (greatest |biggest )?(strengths?|weakness(es)?)( and (strengths?|weakness(es)?))?',
+    r'why do you want to (work (here|for (us|our company|this company))|join (us|our (company|team)))',
+    r'why are you (interested in|applying for) this (role|position|job)',
+    r'why should we hire you',
+    r'where do you see yourself in (five|5|ten|10|three|3) years( time)?',
+    r'what motivates you',
+    r'how do you (handle|deal with|manage) (stress|pressure|tight deadlines|conflict)( and (stress|pressure|tight deadlines|conflict))?',
+    r'what are your (salary|career) (expectations|goals)',
+    r'do you have any questions for (me|us)',
+    r'what (do you know|have you learned) about (our|this) company',
+    r'what is your (ideal|preferred) (work|working) (environment|style)',
+    r'how would your (colleagues|coworkers|manager|friends) describe you',
+    r'describe your (work|working|communication|leadership) style',
+    r'请?(先|简单)?(做个|做一个|做一下)?(自我介绍|介绍一下你自己)(一下)?',
+    r'(请?说说|请?谈谈)?你的(优点|缺点|优势|劣势)(和(优点|缺点|优势|劣势))?(是什么|有哪些)?',
+    r'你?为什么(选择|想加入)我们(公司)?',
+    r'(你|谈谈你)?(未来)?(五|5|三|3)年(内|后)?的?(职业)?规划(是什么)?',
+    r'你有什么问题要问(我|我们)?吗?',
+]
+
+# 允许出现在通用问题前后的引导/礼貌用语（预处理后 "let's" 变为 "let s"）
+GENERIC_LEAD_IN = r'((so|ok|okay|well|now|first|firstly|please|briefly|quickly|to start|to begin|let s start|start by|begin by) )*'
+GENERIC_TRAIL = r'( (please|briefly|first|now))*'
+
+# 技术问题总是与候选人的技能栈相关，不进入共享模板
+NON_GENERIC_TYPES = {QuestionType.TECHNICAL}
+
+DEFAULT_TEMPLATE_TTL = 7 * 86400  # 7天
+
+
+class ReferenceTemplateCache:
+    """Cross-user cache of reference answers for generic questions
+
+    Generic questions ("Tell me about yourself", "Why should we hire you")
+    are keyed on their normalized text and question type only, so every user
+    and every worker shares one template. Templates are generated without any
+    resume data and are personalised locally before being returned.
+    """
+
+    KEY_PREFIX = 'ref_template'
+
+    def __init__(self):
+        self.matcher = QuestionMatcher()
+        self._patterns = [
+            re.compile(f"{GENERIC_LEAD_IN}(?:{p}){GENERIC_TRAIL}") for p in GENERIC_QUESTION_PATTERNS
+        ]
+
+    def normalize(self, question_text: str) -> str:
+        """复用QuestionMatcher的文本预处理"""
+        return self.matcher._preprocess_text(question_text)
+
+    def is_generic(self, question) -> bool:
+        """判断问题是否为与简历无关的通用问题"""
+        if question.question_type in NON_GENERIC_TYPES:
+            return False
+        normalized = self.normalize(question.question_text)
+        if not normalized:
+            return False
+        return any(p.fullmatch(normalized) for p in self._patterns)
+
+    def make_key(self, question) -> str:
+        normalized = self.normalize(question.question_text)
+        digest = hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+        return f"{self.KEY_PREFIX}:{question.question_type.value}:{digest}"
+
+    def get(self, question) -> Optional[Dict[str, Any]]:
+        """获取通用问题的共享模板答案"""
+        try:
+            from app.extensions import redis_client
+            return get_two_tier_cache(self.KEY_PREFIX).get(self.make_key(question), redis_client)
+        except Exception as e:
+            logger.warning(f"Failed to get reference template: {e}")
+        return None
+
+    def set(self, question, answer_data: Dict[str, Any]) -> None:
+        """保存共享模板答案（仅保存AI成功解析的结果）"""
+        if answer_data.get('generated_by') != 'ai':
+            return
+        try:
+            from app.extensions import redis_client
+            if redis_client:
+                ttl = DEFAULT_TEMPLATE_TTL
+                try:
+                    ttl = int(current_app.config.get('REFERENCE_TEMPLATE_TTL', DEFAULT_TEMPLATE_TTL))
+                except RuntimeError:
+                    pass
+                get_two_tier_cache(self.KEY_PREFIX).set(self.make_key(question), answer_data, ttl, redis_client)
+                logger.info(f"Cached shared reference template for question {question.id}")
+        except Exception as e:
+            logger.warning(f"Failed to cache reference template: {e}")
+
+    def personalize(
+        self,
+        template: Dict[str, Any],
+        question,
+        resume_context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """基于简历上下文对模板做本地个性化（不调用AI）"""
+        result = copy.deepcopy(template)
+        result['question_type'] = question.question_type.value
+        result['difficulty'] = question.difficulty.value
+        result['generated_by'] = 'ai_template'
+        result['template_shared'] = True
+
+        skills = [str(s) for s in (resume_context.get('skills') or [])[:3] if s]
+        if skills:
+            key_points = list(result.get('key_points') or [])
+            key_points.append(f"Tie your answer to your own background in {', '.join(skills)}")
+            result['key_points'] = key_points
+        return result
+
+    @staticmethod
+    def neutral_resume_context() -> Dict[str, Any]:
+        """生成模板时使用的无个人信息上下文"""
+        return {
+            'name': 'Candidate',
+            'skills': [],
+            'education': [],
+            'experience': [],
+            'summary': ''
+        }
@@ -1,7 +1,7 @@
 import os
 import re
 import json
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 import logging
 
@@ -20,6 +20,203 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# ---------------------------------------------------------------------------
+# 预编译的分段与提取正则（模块级，只编译一次）
+# ---------------------------------------------------------------------------
+
+# 章节标题 -> 章节类型
+SECTION_HEADINGS = {
+    'experience': [
+        r'work\s*experience', r'professional\s*experience', r'employment\s*history',
+        r'career\s*history', r'internship\s*experience', r'internships?', r'experience',
+        r'employment', r'工作经历', r'工作经验', r'职业经历', r'实习经历', r'实习经验',
+    ],
+    'education': [
+        r'education(?:al)?\s*background', r'education', r'academic\s*background',
+        r'教育背景', r'教育经历', r'学历',
+    ],
+    'skills': [
+        r'technical\s*skills', r'core\s*skills', r'key\s*skills', r'skills?(?:\s*&\s*\w+)?',
+        r'专业技能', r'技术技能', r'核心技能', r'主要技能', r'技能',
+    ],
+    'projects': [
+        r'personal\s*projects?', r'academic\s*projects?', r'capstone\s*projects?',
+        r'project\s*experience', r'projects?', r'portfolio',
+        r'个人项目', r'学术项目', r'毕业项目', r'项目经验', r'项目经历', r'项目', r'作品',
+    ],
+    'research': [r'research\s*experience', r'科研经历', r'研究经历'],
+    'other': [
+        r'summary', r'profile', r'objective', r'certifications?', r'certificates?', r'awards?',
+        r'honors?', r'languages?', r'interests?', r'hobbies', r'references?', r'publications?',
+        r'证书', r'语言', r'兴趣', r'爱好', r'获奖', r'荣誉', r'自我评价', r'个人简介',
+    ],
+}
+
+SECTION_HEADING_RE = re.compile(
+    r'^[\s#•·\-\*\u200B-\u200D\u2060\uFEFF]*(?:'
+    + '|'.join(
+        f"(?P<{kind}>{'|'.join(patterns)})" for kind, patterns in SECTION_HEADINGS.items()
+    )
+    + r')[\s\u200B-\u200D\u2060\uFEFF]*(?:[:：]\s*(?P<inline>.*))?$',
+    re.IGNORECASE
+)
+MAX_HEADING_LENGTH = 40
+# 在技能章节内带内容出现时视为技能分类而不是新章节的标题类型
+SKILL_CATEGORY_KINDS = ('skills', 'other')
+
+ZERO_WIDTH_RE = re.compile(r'[\u200B-\u200D\u2060\uFEFF]')
+BULLET_PREFIX_RE = re.compile(r'^[•·\-\*\s]+')
+YEAR_RE = re.compile(r'\d{4}')
+
+# 技能
+TECH_KEYWORDS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Go', 'Rust',
+    'React', 'Vue', 'Angular', 'Node.js', 'Express', 'Django', 'Flask',
+    'Spring', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Docker', 'Kubernetes',
+    'AWS', 'Azure', 'GCP', 'Git', 'Linux', 'Machine Learning', 'Deep Learning',
+    'TensorFlow', 'PyTorch', 'Pandas', 'NumPy', 'HTML', 'CSS', 'SQL'
+]
+TECH_KEYWORDS_LOWER = [(keyword, keyword.lower()) for keyword in TECH_KEYWORDS]
+SKILL_LINE_RES = [
+    re.compile(r'(?:技能|skills?)[:\s]*([^\n]+)', re.IGNORECASE),
+    re.compile(r'(?:专业技能|技术技能)[:\s]*([^\n]+)', re.IGNORECASE),
+    re.compile(r'(?:核心技能|主要技能)[:\s]*([^\n]+)', re.IGNORECASE),
+]
+SKILL_SPLIT_RE = re.compile(r'[,，；;、\|]')
+SKILL_LABEL_RE = re.compile(r'^[^:：,，]{1,30}[:：]\s*')
+
+# 工作经历
+MARKED_COMPANY_RE = re.compile(r'​​([^​]+?)​​\s*\|\s*([^|]+?)\s*\|\s*(\w+\s+\d{4}\s*[-–]\s*\w+\s+\d{4})')
+EXPERIENCE_HEADING_RES = [
+    re.compile(p, re.IGNORECASE) for p in [
+        r'work\s*experience[:\s]*',
+        r'professional\s*experience[:\s]*',
+        r'employment\s*history[:\s]*',
+        r'career\s*history[:\s]*',
+        r'experience[:\s]*',
+        r'employment[:\s]*',
+        r'工作经历[:\s]*',
+        r'工作经验[:\s]*',
+        r'职业经历[:\s]*'
+    ]
+]
+NEXT_SECTION_RE = re.compile(
+    r'\n\s*(?:education|academic|学历|教育|skills|技能|专业技能|projects|项目|certifications?|证书|'
+    r'references?|推荐|联系人|languages?|语言|interests?|兴趣|hobbies|爱好)',
+    re.IGNORECASE
+)
+EXPERIENCE_SPLIT_RES = [
+    re.compile(r'\n(?=\d{4})'),
+    re.compile(r'\n(?=\w+\s+\d{4})'),
+    re.compile(r'\n\s*\n'),
+    re.compile(r'\n(?=[A-Z][a-z]+(?: [A-Z][a-z]+)*(?:\s+[-–—]\s*|\s+at\s+|\s+@\s+))'),
+]
+JOB_AT_COMPANY_RE = re.compile(r'(?:at\s+|@\s+)[A-Z]')
+
+# 教育背景
+MARKED_UNIVERSITY_RE = re.compile(r'​​([^​]+?(?:University|College|Institute|School)[^​]*)​​')
+DEGREE_RES = [
+    re.compile(p) for p in [
+        r'(MS in [^|]+)',
+        r'(BSc in [^|]+)',
+        r'(MA in [^|]+)',
+        r'(BA in [^|]+)',
+        r'(PhD in [^|]+)',
+        r'(Bachelor[^|]+)',
+        r'(Master[^|]+)'
+    ]
+]
+DATE_RANGE_RE = re.compile(r'(\w+\s+\d{4}\s*[-–]\s*\w+\s+\d{4})')
+GPA_RE = re.compile(r'GPA:\s*([\d.]+)')
+EDUCATION_SECTION_RE = re.compile(
+    r'(?:教育背景|教育经历|education|academic)[:\s]*\n?(.*?)(?:\n\n|\n(?=[A-Z])|工作|experience|技能|skills|$)',
+    re.IGNORECASE | re.DOTALL
+)
+EDUCATION_LINE_SPLIT_RE = re.compile(r'\n(?=\d{4}|\w+\s+\d{4})')
+EDUCATION_INLINE_RE = re.compile(r'(\d{4}[\.\-/]\d{1,2}\s+\d{4}[\.\-/]\d{1,2}\s+[^0-9]+?)(?=\d{4}[\.\-/]\d{1,2}|$)')
+
+# 项目经验
+PROJECT_SECTION_RES = [
+    re.compile(p, re.IGNORECASE | re.DOTALL) for p in [
+        r'(?:projects?|项目|项目经验|作品|portfolio)[:\s]*\n?(.*?)(?:\n\n|\n(?=[A-Z])|experience|education|skills|技能|工作|教育|$)',
+        r'(?:personal\s*projects?|个人项目)[:\s]*\n?(.*?)(?:\n\n|\n(?=[A-Z])|experience|education|skills|技能|工作|教育|$)',
+        r'(?:academic\s*projects?|学术项目)[:\s]*\n?(.*?)(?:\n\n|\n(?=[A-Z])|experience|education|skills|技能|工作|教育|$)',
+        r'(?:capstone\s*projects?|毕业项目)[:\s]*\n?(.*?)(?:\n\n|\n(?=[A-Z])|experience|education|skills|技能|工作|教育|$)'
+    ]
+]
+PROJECT_SPLIT_RES = [
+    re.compile(r'\n[•·\-\*]\s*'),
+    re.compile(r'\n\d+[\.\)]\s*'),
+    re.compile(r'\n\s*\n'),
+    re.compile(r'\n(?=[A-Z][A-Za-z\s]{10,})'),
+]
+PROJECT_KEYWORDS = ['project', 'capstone', 'design project', '项目', '毕业设计', '课程设计']
+
+
+class ResumeSections:
+    """单次扫描得到的简历分段结果"""
+
+    def __init__(self):
+        self.header = ''
+        self.sections: Dict[str, List[str]] = {}
+
+    def get(self, kind: str) -> Optional[str]:
+        """返回某类章节的正文（同类多个章节按出现顺序拼接），不存在时返回None"""
+        blocks = self.sections.get(kind)
+        if not blocks:
+            return None
+        return '\n\n'.join(blocks)
+
+    def __bool__(self):
+        return bool(self.sections)
+
+
+def segment_resume(text: str) -> ResumeSections:
+    """
+    将简历文本一次性切分为带类型的章节
+
+    逐行扫描，只用一个预编译的标题正则识别章节标题；标题之前的内容作为header。
+    没有换行的文本（如部分.doc提取结果）不会识别出任何章节。
+    """
+    result = ResumeSections()
+    current_kind = None
+    current_lines: List[str] = []
+    header_lines: List[str] = []
+
+    def flush():
+        if current_kind is not None:
+            body = '\n'.join(current_lines).strip()
+            if body:
+                result.sections.setdefault(current_kind, []).append(body)
+
+    for line in text.split('\n'):
+        stripped = line.strip()
+        match = None
+        if stripped and (len(stripped) <= MAX_HEADING_LENGTH or ':' in stripped or '：' in stripped):
+            match = SECTION_HEADING_RE.match(stripped)
+            if match and not match.group('inline') and len(stripped) > MAX_HEADING_LENGTH:
+                match = None
+        kind = next(k for k in SECTION_HEADINGS if match.group(k)) if match else None
+        # 技能章节里的 "Languages: ..." / "Tools: ..." 是分类标签，不是新章节
+        if kind in SKILL_CATEGORY_KINDS and current_kind == 'skills' and match.group('inline'):
+            match = None
+        if match:
+            flush()
+            current_kind = kind
+            current_lines = []
+            inline = match.group('inline')
+            if inline and inline.strip():
+                current_lines.append(inline.strip())
+        elif current_kind is None:
+            header_lines.append(line)
+        else:
+            current_lines.append(line)
+
+    flush()
+    result.header = '\n'.join(header_lines).strip()
+    return result
+
+
 class ResumeParser:
     """简历解析器"""
     
@@ -32,13 +229,19 @@ class ResumeParser:
             'phone': 17    # 20 - 3
         }
         
-    def parse_resume(self, file_path: str, file_type: str) -> Dict:
+    def parse_resume(
+        self,
+        file_path: str,
+        file_type: str,
+        progress: Optional[Callable[[str], None]] = None
+    ) -> Dict:
         """
         解析简历文件
         
         Args:
             file_path: 文件路径
             file_type: 文件类型 (pdf, docx, doc)
+            progress: 阶段完成回调，依次收到 'extract'、'sections'、'skills'
             
         Returns:
             解析结果字典
@@ -60,9 +263,10 @@ class ResumeParser:
             
             if not raw_text or len(raw_text.strip()) < 10:
                 raise ValueError("Unable to extract valid text content from file")
+            self._report_progress(progress, 'extract')
             
             # 解析结构化信息
-            parsed_data = self._parse_content_safe(raw_text)
+            parsed_data = self._parse_content_safe(raw_text, progress)
             
             # 验证和清理数据
             validated_data = self._validate_and_clean_data(parsed_data)
@@ -370,19 +574,40 @@ class ResumeParser:
     def _parse_content(self, text: str) -> Dict:
         """解析文本内容，提取结构化信息"""
         
+        sections = self._segment_safe(text)
+        
         result = {
             'name': self._extract_name(text),
             'email': self._extract_email(text),
             'phone': self._extract_phone(text),
-            'skills': self._extract_skills(text),
-            'experience': self._extract_experience(text),
-            'education': self._extract_education(text),
-            'projects': self._extract_projects(text)
+            'skills': self._extract_skills(text, sections.get('skills')),
+            'experience': self._extract_experience(text, sections.get('experience')),
+            'education': self._extract_education(text, sections.get('education')),
+            'projects': self._extract_projects(text, sections.get('projects'), sections.get('experience'))
         }
         
         return result
     
-    def _parse_content_safe(self, text: str) -> Dict:
+    def _segment_safe(self, text: str) -> ResumeSections:
+        """分段失败时返回空结果，各字段回退到全文提取"""
+        try:
+            sections = segment_resume(text)
+            logger.info(f"Resume segmented into sections: {list(sections.sections.keys())}")
+            return sections
+        except Exception as e:
+            logger.warning(f"简历分段失败，回退到全文提取: {e}")
+            return ResumeSections()
+    
+    def _report_progress(self, progress: Optional[Callable[[str], None]], stage: str):
+        """通知解析阶段完成，回调异常不影响解析"""
+        if not progress:
+            return
+        try:
+            progress(stage)
+        except Exception as e:
+            logger.warning(f"Resume parse progress callback failed at {stage}: {e}")
+    
+    def _parse_content_safe(self, text: str, progress: Optional[Callable[[str], None]] = None) -> Dict:
         """安全地解析文本内容，提取结构化信息"""
         result = {
             'name': None,
@@ -394,6 +619,9 @@ class ResumeParser:
             'projects': []
         }
         
+        # 单次扫描切分章节，各字段只处理自己的章节
+        sections = self._segment_safe(text)
+        
         # 安全地提取每个字段，单个失败不影响其他字段
         try:
             result['name'] = self._extract_name(text)
@@ -411,28 +639,30 @@ class ResumeParser:
             logger.warning(f"电话提取失败: {e}")
         
         try:
-            result['skills'] = self._extract_skills(text)
-        except Exception as e:
-            logger.warning(f"技能提取失败: {e}")
-            result['skills'] = []
-        
-        try:
-            result['experience'] = self._extract_experience(text)
+            result['experience'] = self._extract_experience(text, sections.get('experience'))
         except Exception as e:
             logger.warning(f"工作经历提取失败: {e}")
             result['experience'] = []
         
         try:
-            result['education'] = self._extract_education(text)
+            result['education'] = self._extract_education(text, sections.get('education'))
         except Exception as e:
             logger.warning(f"教育背景提取失败: {e}")
             result['education'] = []
         
         try:
-            result['projects'] = self._extract_projects(text)
+            result['projects'] = self._extract_projects(text, sections.get('projects'), sections.get('experience'))
         except Exception as e:
             logger.warning(f"项目经验提取失败: {e}")
             result['projects'] = []
+        self._report_progress(progress, 'sections')
+        
+        try:
+            result['skills'] = self._extract_skills(text, sections.get('skills'))
+        except Exception as e:
+            logger.warning(f"技能提取失败: {e}")
+            result['skills'] = []
+        self._report_progress(progress, 'skills')
         
         return result
     
@@ -581,224 +811,187 @@ class ResumeParser:
         
         return None
     
-    def _extract_skills(self, text: str) -> List[str]:
-        """提取技能 - 安全版本"""
+    def _extract_skills(self, text: str, section: Optional[str] = None) -> List[str]:
+        """提取技能 - 安全版本
+
+        关键词匹配覆盖全文；有技能章节时只从该章节拆分技能项，否则回退到全文的"技能:"行匹配。
+        """
         skills = []
         
-        # 技术技能关键词
-        tech_keywords = [
-            'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'Go', 'Rust',
-            'React', 'Vue', 'Angular', 'Node.js', 'Express', 'Django', 'Flask',
-            'Spring', 'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Docker', 'Kubernetes',
-            'AWS', 'Azure', 'GCP', 'Git', 'Linux', 'Machine Learning', 'Deep Learning',
-            'TensorFlow', 'PyTorch', 'Pandas', 'NumPy', 'HTML', 'CSS', 'SQL'
-        ]
-        
         # 安全地进行关键词匹配
         try:
             text_lower = text.lower()
-            for keyword in tech_keywords:
-                if keyword.lower() in text_lower:
+            for keyword, keyword_lower in TECH_KEYWORDS_LOWER:
+                if keyword_lower in text_lower:
                     skills.append(keyword)
         except Exception as e:
             logger.warning(f"关键词匹配失败: {e}")
         
         # 安全地寻找技能部分
         try:
-            # 使用更简单和安全的正则表达式
-            patterns = [
-                r'(?:技能|skills?)[:\s]*([^\n]+)',
-                r'(?:专业技能|技术技能)[:\s]*([^\n]+)',
-                r'(?:核心技能|主要技能)[:\s]*([^\n]+)'
-            ]
+            if section is not None:
+                skill_lines = [SKILL_LABEL_RE.sub('', BULLET_PREFIX_RE.sub('', line.strip()))
+                               for line in section.split('\n')]
+            else:
+                skill_lines = [match for pattern in SKILL_LINE_RES for match in pattern.findall(text)]
             
-            for pattern in patterns:
-                try:
-                    matches = re.findall(pattern, text, re.IGNORECASE)
-                    for match in matches:
-                        # 分割技能项
-                        skill_items = re.split(r'[,，；;、\|]', match)
-                        for item in skill_items:
-                            item = item.strip()
-                            if item and 2 <= len(item) <= 30:  # 合理的技能长度
-                                # 移除常见的项目符号
-                                item = re.sub(r'^[•·\-\*\s]+', '', item)
-                                if item:
-                                    skills.append(item)
-                except re.error as e:
-                    logger.warning(f"技能正则表达式 {pattern} 失败: {e}")
-                    continue
+            for line in skill_lines:
+                # 分割技能项
+                for item in SKILL_SPLIT_RE.split(line):
+                    item = item.strip()
+                    if item and 2 <= len(item) <= 30:  # 合理的技能长度
+                        # 移除常见的项目符号
+                        item = BULLET_PREFIX_RE.sub('', item)
+                        if item:
+                            skills.append(item)
                     
         except Exception as e:
             logger.warning(f"技能部分解析失败: {e}")
         
-        # 去重并限制数量
-        unique_skills = list(set(skills))
+        # 去重（保持出现顺序）并限制数量
+        unique_skills = list(dict.fromkeys(skills))
         return unique_skills[:20]  # 最多返回20个技能
     
-    def _extract_experience(self, text: str) -> List[Dict]:
-        """提取工作经历 - 改进版，支持特殊Unicode字符格式"""
-        experiences = []
-        
+    def _extract_experience(self, text: str, section: Optional[str] = None) -> List[Dict]:
+        """提取工作经历 - 改进版，支持特殊Unicode字符格式
+
+        有工作经历章节时只解析该章节；否则在全文中查找章节（兼容无法分段的文本）。
+        """
         # 方法1：针对特殊Unicode字符格式（​​标记）
-        work_start = text.find('Work Experience')
-        research_start = text.find('Research Experience')
-        
-        if work_start != -1:
-            # 确定工作经历部分的结束位置
-            work_end = len(text)
-            if research_start != -1 and research_start > work_start:
-                work_end = research_start
-            
-            work_section = text[work_start:work_end].strip()
-            logger.info(f"Found work experience section, length: {len(work_section)} characters")
-            
-            # 查找所有被​​包围的公司名称
-            company_pattern = r'​​([^​]+?)​​\s*\|\s*([^|]+?)\s*\|\s*(\w+\s+\d{4}\s*[-–]\s*\w+\s+\d{4})'
-            companies = re.findall(company_pattern, work_section)
-            
-            logger.info(f"Found companies with Unicode markers: {len(companies)}")
-            
-            for company, location, duration in companies:
-                company = company.strip()
-                location = location.strip()
-                duration = duration.strip()
-                
-                # 查找这个公司后面的详细信息
-                company_start = work_section.find(f'​​{company}​​')
-                if company_start != -1:
-                    # 查找下一个公司的开始位置
-                    next_company_start = len(work_section)
-                    for other_company, _, _ in companies:
-                        other_company = other_company.strip()
-                        if other_company != company:
-                            other_start = work_section.find(f'​​{other_company}​​', company_start + 1)
-                            if other_start != -1:
-                                next_company_start = min(next_company_start, other_start)
-                    
-                    # 提取这个公司的详细信息
-                    company_section = work_section[company_start:next_company_start].strip()
-                    
-                    # 从公司部分第一个换行后的内容中提取职位
-                    lines = company_section.split('\n')
-                    position = None
-                    description_lines = []
-                    
-                    for i, line in enumerate(lines):
-                        line = line.strip()
-                        if i == 1 and line and not line.startswith('​​'):  # 第二行通常是职位
-                            position = line
-                        elif i > 1 and line:  # 其余内容作为描述
-                            description_lines.append(line)
-                    
-                    description = '\n'.join(description_lines) if description_lines else None
-                    
-                    experience_item = {
-                        'raw_text': company_section,
-                        'company': company,
-                        'position': position,
-                        'duration': duration,
-                        'location': location,
-                        'description': description
-                    }
-                    experiences.append(experience_item)
-                    logger.info(f"Extracted experience: {position} at {company}")
+        if section is not None:
+            work_section = section
+        else:
+            work_section = None
+            work_start = text.find('Work Experience')
+            research_start = text.find('Research Experience')
+            if work_start != -1:
+                # 确定工作经历部分的结束位置
+                work_end = len(text)
+                if research_start != -1 and research_start > work_start:
+                    work_end = research_start
+                work_section = text[work_start:work_end].strip()
+        
+        experiences = self._extract_marked_experiences(work_section) if work_section else []
         
         # 方法2：如果方法1没找到足够结果，使用传统方法
         if len(experiences) == 0:
             logger.info("Trying traditional experience extraction method")
             
-            # 更全面的工作经历标题匹配模式
-            exp_patterns = [
-                r'work\s*experience[:\s]*',
-                r'professional\s*experience[:\s]*',
-                r'employment\s*history[:\s]*',
-                r'career\s*history[:\s]*',
-                r'experience[:\s]*',
-                r'employment[:\s]*',
-                r'工作经历[:\s]*',
-                r'工作经验[:\s]*',
-                r'职业经历[:\s]*'
-            ]
-            
-            # 查找工作经历部分
-            for pattern in exp_patterns:
-                matches = list(re.finditer(pattern, text, re.IGNORECASE))
-                
-                for match in matches:
-                    start_pos = match.end()
-                    
-                    # 查找下一个主要部分的开始位置
-                    next_section_patterns = [
-                        r'\n\s*(?:education|academic|学历|教育)',
-                        r'\n\s*(?:skills|技能|专业技能)',
-                        r'\n\s*(?:projects|项目)',
-                        r'\n\s*(?:certifications?|证书)',
-                        r'\n\s*(?:references?|推荐|联系人)',
-                        r'\n\s*(?:languages?|语言)',
-                        r'\n\s*(?:interests?|兴趣)',
-                        r'\n\s*(?:hobbies|爱好)'
-                    ]
-                    
-                    end_pos = len(text)
-                    for next_pattern in next_section_patterns:
-                        next_match = re.search(next_pattern, text[start_pos:], re.IGNORECASE)
-                        if next_match:
-                            end_pos = min(end_pos, start_pos + next_match.start())
-                    
-                    # 提取这一部分的文本
-                    section_text = text[start_pos:end_pos].strip()
-                    
-                    if section_text and len(section_text) > 50:  # 确保有足够的内容
-                        logger.info(f"Found work experience section using pattern: {pattern}")
+            if section is not None:
+                if len(section) > 50:  # 确保有足够的内容
+                    experiences.extend(self._build_experience_items(section))
+            else:
+                # 在全文中查找工作经历部分
+                for pattern in EXPERIENCE_HEADING_RES:
+                    for match in pattern.finditer(text):
+                        start_pos = match.end()
+                        
+                        # 查找下一个主要部分的开始位置
+                        next_match = NEXT_SECTION_RE.search(text, start_pos)
+                        end_pos = next_match.start() if next_match else len(text)
                         
-                        # 尝试多种方式分割工作经历条目
-                        jobs = self._split_experience_entries(section_text)
+                        # 提取这一部分的文本
+                        section_text = text[start_pos:end_pos].strip()
                         
-                        for job in jobs:
-                            job = job.strip()
-                            if job and len(job) > 20:
-                                experience_item = {
-                                    'raw_text': job,
-                                    'company': self._extract_company_from_job(job),
-                                    'position': self._extract_position_from_job(job),
-                                    'duration': self._extract_duration_from_job(job),
-                                    'description': self._extract_description_from_job(job)
-                                }
-                                experiences.append(experience_item)
-                                logger.info(f"Extracted experience: {experience_item['position']} at {experience_item['company']}")
+                        if section_text and len(section_text) > 50:  # 确保有足够的内容
+                            logger.info(f"Found work experience section using pattern: {pattern.pattern}")
+                            experiences.extend(self._build_experience_items(section_text))
         
         # 去重：如果有相同的工作经历，只保留一个
-        unique_experiences = []
-        seen_texts = set()
-        for exp in experiences:
-            if exp['raw_text'] not in seen_texts:
-                unique_experiences.append(exp)
-                seen_texts.add(exp['raw_text'])
+        return self._dedupe_by_raw_text(experiences)
+    
+    def _extract_marked_experiences(self, work_section: str) -> List[Dict]:
+        """解析使用​​标记公司名的工作经历章节"""
+        experiences = []
+        logger.info(f"Found work experience section, length: {len(work_section)} characters")
         
-        return unique_experiences
+        # 查找所有被​​包围的公司名称
+        companies = MARKED_COMPANY_RE.findall(work_section)
+        
+        logger.info(f"Found companies with Unicode markers: {len(companies)}")
+        
+        for company, location, duration in companies:
+            company = company.strip()
+            location = location.strip()
+            duration = duration.strip()
+            
+            # 查找这个公司后面的详细信息
+            company_start = work_section.find(f'​​{company}​​')
+            if company_start == -1:
+                continue
+            
+            # 查找下一个公司的开始位置
+            next_company_start = len(work_section)
+            for other_company, _, _ in companies:
+                other_company = other_company.strip()
+                if other_company != company:
+                    other_start = work_section.find(f'​​{other_company}​​', company_start + 1)
+                    if other_start != -1:
+                        next_company_start = min(next_company_start, other_start)
+            
+            # 提取这个公司的详细信息
+            company_section = work_section[company_start:next_company_start].strip()
+            
+            # 从公司部分第一个换行后的内容中提取职位
+            lines = company_section.split('\n')
+            position = None
+            description_lines = []
+            
+            for i, line in enumerate(lines):
+                line = line.strip()
+                if i == 1 and line and not line.startswith('​​'):  # 第二行通常是职位
+                    position = line
+                elif i > 1 and line:  # 其余内容作为描述
+                    description_lines.append(line)
+            
+            description = '\n'.join(description_lines) if description_lines else None
+            
+            experiences.append({
+                'raw_text': company_section,
+                'company': company,
+                'position': position,
+                'duration': duration,
+                'location': location,
+                'description': description
+            })
+            logger.info(f"Extracted experience: {position} at {company}")
+        
+        return experiences
+    
+    def _build_experience_items(self, section_text: str) -> List[Dict]:
+        """把工作经历章节拆分为条目并提取字段"""
+        items = []
+        for job in self._split_experience_entries(section_text):
+            job = job.strip()
+            if job and len(job) > 20:
+                experience_item = {
+                    'raw_text': job,
+                    'company': self._extract_company_from_job(job),
+                    'position': self._extract_position_from_job(job),
+                    'duration': self._extract_duration_from_job(job),
+                    'description': self._extract_description_from_job(job)
+                }
+                items.append(experience_item)
+                logger.info(f"Extracted experience: {experience_item['position']} at {experience_item['company']}")
+        return items
+    
+    def _dedupe_by_raw_text(self, items: List[Dict]) -> List[Dict]:
+        """按raw_text去重，保持顺序"""
+        unique_items = []
+        seen_texts = set()
+        for item in items:
+            if item['raw_text'] not in seen_texts:
+                unique_items.append(item)
+                seen_texts.add(item['raw_text'])
+        return unique_items
     
     def _split_experience_entries(self, section_text: str) -> List[str]:
         """分割工作经历条目"""
-        # 方法1: 按年份分割
-        jobs = re.split(r'\n(?=\d{4})', section_text)
-        if len(jobs) > 1:
-            return jobs
-        
-        # 方法2: 按日期模式分割
-        jobs = re.split(r'\n(?=\w+\s+\d{4})', section_text)
-        if len(jobs) > 1:
-            return jobs
-        
-        # 方法3: 按空行分割
-        jobs = re.split(r'\n\s*\n', section_text)
-        if len(jobs) > 1:
-            return jobs
-        
-        # 方法4: 按职位模式分割（如果有明确的职位标题）
-        jobs = re.split(r'\n(?=[A-Z][a-z]+(?: [A-Z][a-z]+)*(?:\s+[-–—]\s*|\s+at\s+|\s+@\s+))', section_text)
-        if len(jobs) > 1:
-            return jobs
+        # 依次尝试：按年份、按日期模式、按空行、按职位模式分割
+        for pattern in EXPERIENCE_SPLIT_RES:
+            jobs = pattern.split(section_text)
+            if len(jobs) > 1:
+                return jobs
         
         # 如果无法分割，返回整个部分作为一个条目
         return [section_text]
@@ -811,8 +1004,8 @@ class ResumeParser:
         for line in lines:
             line = line.strip()
             # 跳过包含公司名、职位、日期的行
-            if (not re.search(r'\d{4}', line) and 
-                not re.search(r'(?:at\s+|@\s+)[A-Z]', line) and
+            if (not YEAR_RE.search(line) and 
+                not JOB_AT_COMPANY_RE.search(line) and
                 len(line) > 20):
                 description_lines.append(line)
         
@@ -820,133 +1013,137 @@ class ResumeParser:
             return ' '.join(description_lines)
         return None
     
-    def _extract_education(self, text: str) -> List[Dict]:
-        """提取教育背景 - 改进版，支持特殊Unicode字符格式"""
-        education = []
-        
+    def _extract_education(self, text: str, section: Optional[str] = None) -> List[Dict]:
+        """提取教育背景 - 改进版，支持特殊Unicode字符格式
+
+        有教育章节时只解析该章节；否则在全文中查找章节（兼容无法分段的文本）。
+        """
         # 方法1：针对特殊Unicode字符格式（​​标记）
-        education_start = text.find('Education')
-        work_start = text.find('Work Experience')
+        if section is not None:
+            education_section = section
+        else:
+            education_section = None
+            education_start = text.find('Education')
+            work_start = text.find('Work Experience')
+            if education_start != -1 and work_start != -1:
+                education_section = text[education_start:work_start].strip()
         
-        if education_start != -1 and work_start != -1:
-            education_section = text[education_start:work_start].strip()
-            logger.info(f"Found education section, length: {len(education_section)} characters")
-            
-            # 查找所有被​​包围的大学名称
-            university_pattern = r'​​([^​]+?(?:University|College|Institute|School)[^​]*)​​'
-            universities = re.findall(university_pattern, education_section)
-            
-            logger.info(f"Found universities with Unicode markers: {universities}")
-            
-            for university in universities:
-                university = university.strip()
-                if len(university) > 5:  # 确保是有效的大学名
-                    # 查找这个大学后面的详细信息
-                    uni_start = education_section.find(f'​​{university}​​')
-                    if uni_start != -1:
-                        # 查找下一个大学的开始位置或部分结束位置
-                        next_uni_start = len(education_section)
-                        for other_uni in universities:
-                            if other_uni != university:
-                                other_start = education_section.find(f'​​{other_uni}​​', uni_start + 1)
-                                if other_start != -1:
-                                    next_uni_start = min(next_uni_start, other_start)
-                        
-                        # 提取这个大学的详细信息
-                        uni_section = education_section[uni_start:next_uni_start].strip()
-                        
-                        # 提取学位信息
-                        degree = None
-                        degree_patterns = [
-                            r'(MS in [^|]+)',
-                            r'(BSc in [^|]+)', 
-                            r'(MA in [^|]+)',
-                            r'(BA in [^|]+)',
-                            r'(PhD in [^|]+)',
-                            r'(Bachelor[^|]+)',
-                            r'(Master[^|]+)'
-                        ]
-                        
-                        for pattern in degree_patterns:
-                            degree_match = re.search(pattern, uni_section)
-                            if degree_match:
-                                degree = degree_match.group(1).strip()
-                                break
-                        
-                        # 提取时间
-                        duration_pattern = r'(\w+\s+\d{4}\s*[-–]\s*\w+\s+\d{4})'
-                        duration_match = re.search(duration_pattern, uni_section)
-                        duration = duration_match.group(1).strip() if duration_match else None
-                        
-                        # 提取地点
-                        location = None
-                        if 'USA' in uni_section:
-                            if 'Washington' in uni_section:
-                                location = 'Washington, D.C., USA'
-                            else:
-                                location = 'USA'
-                        elif 'China' in uni_section:
-                            if 'Suzhou' in uni_section:
-                                location = 'Suzhou, China'
-                            else:
-                                location = 'China'
-                        
-                        # 提取其他信息（GPA等）
-                        gpa_match = re.search(r'GPA:\s*([\d.]+)', uni_section)
-                        gpa = gpa_match.group(1) if gpa_match else None
-                        
-                        education_item = {
-                            'raw_text': uni_section,
-                            'school': university,
-                            'degree': degree,
-                            'duration': duration,
-                            'location': location,
-                            'gpa': gpa
-                        }
-                        education.append(education_item)
-                        logger.info(f"Extracted education: {degree} from {university}")
+        education = self._extract_marked_education(education_section) if education_section else []
         
         # 方法2：如果方法1没找到结果，使用传统方法
         if len(education) == 0:
             logger.info("Trying traditional education extraction method")
             
             # 寻找教育背景部分
-            edu_sections = re.findall(
-                r'(?:教育背景|教育经历|education|academic)[:\s]*\n?(.*?)(?:\n\n|\n(?=[A-Z])|工作|experience|技能|skills|$)',
-                text, re.IGNORECASE | re.DOTALL
-            )
+            edu_sections = [section] if section is not None else EDUCATION_SECTION_RE.findall(text)
+            for edu_section in edu_sections:
+                education.extend(self._build_education_items(edu_section))
+        
+        return education
+    
+    def _extract_marked_education(self, education_section: str) -> List[Dict]:
+        """解析使用​​标记学校名的教育章节"""
+        education = []
+        logger.info(f"Found education section, length: {len(education_section)} characters")
+        
+        # 查找所有被​​包围的大学名称
+        universities = MARKED_UNIVERSITY_RE.findall(education_section)
+        
+        logger.info(f"Found universities with Unicode markers: {universities}")
+        
+        for university in universities:
+            university = university.strip()
+            if len(university) <= 5:  # 确保是有效的大学名
+                continue
             
-            for section in edu_sections:
-                section = section.strip()
-                if not section:
-                    continue
-                    
-                # 方法1: 尝试按换行符分割（适用于格式良好的文档）
-                if '\n' in section:
-                    schools = re.split(r'\n(?=\d{4}|\w+\s+\d{4})', section)
+            # 查找这个大学后面的详细信息
+            uni_start = education_section.find(f'​​{university}​​')
+            if uni_start == -1:
+                continue
+            
+            # 查找下一个大学的开始位置或部分结束位置
+            next_uni_start = len(education_section)
+            for other_uni in universities:
+                if other_uni != university:
+                    other_start = education_section.find(f'​​{other_uni}​​', uni_start + 1)
+                    if other_start != -1:
+                        next_uni_start = min(next_uni_start, other_start)
+            
+            # 提取这个大学的详细信息
+            uni_section = education_section[uni_start:next_uni_start].strip()
+            
+            # 提取学位信息
+            degree = None
+            for pattern in DEGREE_RES:
+                degree_match = pattern.search(uni_section)
+                if degree_match:
+                    degree = degree_match.group(1).strip()
+                    break
+            
+            # 提取时间
+            duration_match = DATE_RANGE_RE.search(uni_section)
+            duration = duration_match.group(1).strip() if duration_match else None
+            
+            # 提取地点
+            location = None
+            if 'USA' in uni_section:
+                if 'Washington' in uni_section:
+                    location = 'Washington, D.C., USA'
                 else:
-                    # 方法2: 按日期模式分割（适用于.doc文件等无换行符的情况）
-                    # 匹配 "年.月 年.月 学校信息" 的模式
-                    education_pattern = r'(\d{4}[\.\-/]\d{1,2}\s+\d{4}[\.\-/]\d{1,2}\s+[^0-9]+?)(?=\d{4}[\.\-/]\d{1,2}|$)'
-                    matches = re.findall(education_pattern, section)
-                    if matches:
-                        schools = matches
-                    else:
-                        # 如果没有明确的日期模式，尝试其他分割方法
-                        schools = [section] if len(section) > 10 else []
-                
-                for school in schools:
-                    school = school.strip()
-                    if school and len(school) > 10:
-                        education.append({
-                            'raw_text': school,
-                            'school': self._extract_school_from_education(school),
-                            'degree': self._extract_degree_from_education(school),
-                            'duration': self._extract_duration_from_education(school)
-                        })
+                    location = 'USA'
+            elif 'China' in uni_section:
+                if 'Suzhou' in uni_section:
+                    location = 'Suzhou, China'
+                else:
+                    location = 'China'
+            
+            # 提取其他信息（GPA等）
+            gpa_match = GPA_RE.search(uni_section)
+            gpa = gpa_match.group(1) if gpa_match else None
+            
+            education.append({
+                'raw_text': uni_section,
+                'school': university,
+                'degree': degree,
+                'duration': duration,
+                'location': location,
+                'gpa': gpa
+            })
+            logger.info(f"Extracted education: {degree} from {university}")
         
         return education
     
+    def _build_education_items(self, section: str) -> List[Dict]:
+        """把教育章节拆分为条目并提取字段"""
+        items = []
+        section = section.strip()
+        if not section:
+            return items
+        
+        # 方法1: 尝试按换行符分割（适用于格式良好的文档）
+        if '\n' in section:
+            schools = EDUCATION_LINE_SPLIT_RE.split(section)
+        else:
+            # 方法2: 按日期模式分割（适用于.doc文件等无换行符的情况）
+            # 匹配 "年.月 年.月 学校信息" 的模式
+            matches = EDUCATION_INLINE_RE.findall(section)
+            if matches:
+                schools = matches
+            else:
+                # 如果没有明确的日期模式，尝试其他分割方法
+                schools = [section] if len(section) > 10 else []
+        
+        for school in schools:
+            school = school.strip()
+            if school and len(school) > 10:
+                items.append({
+                    'raw_text': school,
+                    'school': self._extract_school_from_education(school),
+                    'degree': self._extract_degree_from_education(school),
+                    'duration': self._extract_duration_from_education(school)
+                })
+        return items
+    
     def _extract_company_from_job(self, job_text: str) -> Optional[str]:
         """从工作经历中提取公司名称"""
         lines = job_text.split('\n')
@@ -1233,62 +1430,59 @@ class ResumeParser:
             
         return None
     
-    def _extract_projects(self, text: str) -> List[Dict]:
-        """提取项目经验"""
+    def _extract_projects(
+        self,
+        text: str,
+        section: Optional[str] = None,
+        experience_section: Optional[str] = None
+    ) -> List[Dict]:
+        """提取项目经验
+
+        有项目章节时直接拆分该章节，经历类项目只在工作经历章节中查找；
+        无法分段时回退到全文扫描。
+        """
         projects = []
         
-        # 项目相关的section标题匹配模式
-        project_section_patterns = [
-            r'(?:projects?|项目|项目经验|作品|portfolio)[:\s]*\n?(.*?)(?:\n\n|\n(?=[A-Z])|experience|education|skills|技能|工作|教育|$)',
-            r'(?:personal\s*projects?|个人项目)[:\s]*\n?(.*?)(?:\n\n|\n(?=[A-Z])|experience|education|skills|技能|工作|教育|$)',
-            r'(?:academic\s*projects?|学术项目)[:\s]*\n?(.*?)(?:\n\n|\n(?=[A-Z])|experience|education|skills|技能|工作|教育|$)',
-            r'(?:capstone\s*projects?|毕业项目)[:\s]*\n?(.*?)(?:\n\n|\n(?=[A-Z])|experience|education|skills|技能|工作|教育|$)'
-        ]
-        
         # 方法1: 寻找专门的项目section
-        for pattern in project_section_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
-            for section in matches:
-                section = section.strip()
-                if section and len(section) > 20:
-                    logger.info(f"Found project section using pattern: {pattern}")
-                    
-                    # 分割项目条目
-                    project_entries = self._split_project_entries(section)
-                    
-                    for entry in project_entries:
-                        entry = entry.strip()
-                        if entry and len(entry) > 30:
-                            project_item = {
-                                'raw_text': entry,
-                                'name': self._extract_project_name(entry),
-                                'description': self._extract_project_description(entry),
-                                'technologies': self._extract_project_technologies(entry),
-                                'duration': self._extract_duration_from_job(entry),  # 重用已有方法
-                                'type': 'project_section'
-                            }
-                            projects.append(project_item)
-                            logger.info(f"Extracted project: {project_item['name']}")
+        if section is not None:
+            project_sections = [section]
+        else:
+            project_sections = [match for pattern in PROJECT_SECTION_RES for match in pattern.findall(text)]
+        
+        for project_section in project_sections:
+            project_section = project_section.strip()
+            if project_section and len(project_section) > 20:
+                # 分割项目条目
+                for entry in self._split_project_entries(project_section):
+                    entry = entry.strip()
+                    if entry and len(entry) > 30:
+                        project_item = {
+                            'raw_text': entry,
+                            'name': self._extract_project_name(entry),
+                            'description': self._extract_project_description(entry),
+                            'technologies': self._extract_project_technologies(entry),
+                            'duration': self._extract_duration_from_job(entry),  # 重用已有方法
+                            'type': 'project_section'
+                        }
+                        projects.append(project_item)
+                        logger.info(f"Extracted project: {project_item['name']}")
         
         # 方法2: 从工作经历中提取项目相关的条目
         # 寻找包含项目关键词的工作经历条目
-        project_keywords = ['project', 'capstone', 'design project', '项目', '毕业设计', '课程设计']
-        lines = text.split('\n')
+        scope = experience_section if experience_section is not None else text
+        lines = scope.split('\n')
+        seen_texts = {p['raw_text'] for p in projects}
         
         for i, line in enumerate(lines):
             line_lower = line.lower()
-            if any(keyword in line_lower for keyword in project_keywords):
+            if any(keyword in line_lower for keyword in PROJECT_KEYWORDS):
                 # 收集相关的上下文
-                context_lines = []
                 start_idx = max(0, i - 2)
                 end_idx = min(len(lines), i + 5)
+                context = '\n'.join(lines[start_idx:end_idx]).strip()
                 
-                for j in range(start_idx, end_idx):
-                    context_lines.append(lines[j])
-                
-                context = '\n'.join(context_lines).strip()
-                
-                if len(context) > 50:
+                # 避免重复添加相同的项目
+                if len(context) > 50 and context not in seen_texts:
                     project_item = {
                         'raw_text': context,
                         'name': self._extract_project_name(context),
@@ -1297,35 +1491,19 @@ class ResumeParser:
                         'duration': self._extract_duration_from_job(context),
                         'type': 'experience_project'
                     }
-                    
-                    # 避免重复添加相同的项目
-                    if not any(p['raw_text'] == project_item['raw_text'] for p in projects):
-                        projects.append(project_item)
-                        logger.info(f"Extracted experience project: {project_item['name']}")
+                    projects.append(project_item)
+                    seen_texts.add(context)
+                    logger.info(f"Extracted experience project: {project_item['name']}")
         
         return projects
     
     def _split_project_entries(self, section_text: str) -> List[str]:
         """分割项目条目"""
-        # 方法1: 按项目符号分割
-        entries = re.split(r'\n[•·\-\*]\s*', section_text)
-        if len(entries) > 1:
-            return entries
-        
-        # 方法2: 按编号分割
-        entries = re.split(r'\n\d+[\.\)]\s*', section_text)
-        if len(entries) > 1:
-            return entries
-        
-        # 方法3: 按空行分割
-        entries = re.split(r'\n\s*\n', section_text)
-        if len(entries) > 1:
-            return entries
-        
-        # 方法4: 按项目名称模式分割（大写开头的行）
-        entries = re.split(r'\n(?=[A-Z][A-Za-z\s]{10,})', section_text)
-        if len(entries) > 1:
-            return entries
+        # 依次尝试：按项目符号、按编号、按空行、按项目名称模式（大写开头的行）分割
+        for pattern in PROJECT_SPLIT_RES:
+            entries = pattern.split(section_text)
+            if len(entries) > 1:
+                return entries
         
         # 如果无法分割，返回整个section作为一个项目
         return [section_text]
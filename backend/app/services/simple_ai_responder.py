@@ -1,6 +1,6 @@
-import openai
 import logging
-from flask import current_app
+
+from app.services.llm_client_registry import get_llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -15,16 +15,10 @@ class SimpleAIResponder:
         """获取AI客户端"""
         if self.client is None:
             try:
-                api_key = current_app.config.get('DEEPSEEK_API_KEY')
-                if not api_key:
+                self.client = get_llm_client('deepseek')
+                if not self.client:
                     logger.warning("DEEPSEEK_API_KEY not configured")
                     return None
-                
-                self.client = openai.OpenAI(
-                    api_key=api_key,
-                    base_url="https://api.deepseek.com"
-                )
-                logger.info("DeepSeek AI client initialized successfully")
             except Exception as e:
                 logger.error(f"Failed to initialize AI client: {e}")
                 return None
@@ -0,0 +1,144 @@
+"""Request coalescing (single-flight) for expensive AI generations
+
+The first caller for a key becomes the leader: it takes a Redis lock, runs
+the generation and publishes the result under a short-lived result key.
+Concurrent callers for the same key, in this process or in any other web or
+Celery worker, wait for that result instead of issuing their own LLM call.
+If the leader dies or the wait times out, followers fall back to computing
+the value themselves.
+"""
+
+import enum
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from app.extensions import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCK_TTL = 90        # 锁过期时间（秒），防止进程崩溃后死锁
+DEFAULT_WAIT_TIMEOUT = 60    # 跟随者最长等待时间（秒）
+DEFAULT_RESULT_TTL = 60      # 结果保留时间（秒），只用于交给等待者
+POLL_INTERVAL = 0.25
+
+
+def _json_default(value: Any):
+    if isinstance(value, enum.Enum):
+        return value.value
+    return str(value)
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    KEY_PREFIX = 'singleflight'
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        lock_ttl: int = DEFAULT_LOCK_TTL,
+        wait_timeout: float = DEFAULT_WAIT_TIMEOUT
+    ) -> Any:
+        """
+        Run compute() once per key across all concurrent callers
+
+        Args:
+            key: Identifies the generation, normally its cache key
+            compute: Produces a JSON-serializable result
+            lock_ttl: Redis lock expiry, should exceed the slowest generation
+            wait_timeout: How long followers wait before computing themselves
+
+        Returns:
+            The leader's result (treat as read-only) or a locally computed one
+        """
+        # 进程内合并：同一进程的并发调用直接等待本地leader
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            if call.event.wait(wait_timeout) and call.error is None:
+                logger.info(f"Single-flight: reused in-process result for {key}")
+                return call.result
+            return compute()
+
+        try:
+            call.result = self._run_distributed(key, compute, lock_ttl, wait_timeout)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            call.event.set()
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def _run_distributed(self, key: str, compute: Callable[[], Any], lock_ttl: int, wait_timeout: float) -> Any:
+        redis_client = get_redis_client()
+        if not redis_client:
+            return compute()
+
+        lock_name = f"{self.KEY_PREFIX}:lock:{key}"
+        result_key = f"{self.KEY_PREFIX}:result:{key}"
+        try:
+            lock = redis_client.lock(lock_name, timeout=lock_ttl, blocking=False)
+            acquired = lock.acquire(blocking=False)
+        except Exception as e:
+            logger.warning(f"Single-flight lock unavailable for {key}: {e}")
+            return compute()
+
+        if acquired:
+            try:
+                # 清掉上一轮的结果，避免等待者拿到旧值
+                redis_client.delete(result_key)
+                result = compute()
+                try:
+                    redis_client.setex(result_key, DEFAULT_RESULT_TTL, json.dumps(result, default=_json_default))
+                except Exception as e:
+                    logger.warning(f"Single-flight failed to publish result for {key}: {e}")
+                return result
+            finally:
+                try:
+                    lock.release()
+                except Exception:
+                    # 锁已过期或被接管
+                    pass
+
+        logger.info(f"Single-flight: waiting for in-flight generation {key}")
+        deadline = time.monotonic() + wait_timeout
+        try:
+            while time.monotonic() < deadline:
+                raw = redis_client.get(result_key)
+                if raw is not None:
+                    return json.loads(raw)
+                if not redis_client.exists(lock_name):
+                    # leader已结束：再读一次结果，没有则说明leader失败
+                    raw = redis_client.get(result_key)
+                    if raw is not None:
+                        return json.loads(raw)
+                    break
+                time.sleep(POLL_INTERVAL)
+        except Exception as e:
+            logger.warning(f"Single-flight wait failed for {key}: {e}")
+
+        logger.warning(f"Single-flight: no shared result for {key}, generating locally")
+        return compute()
+
+
+single_flight = SingleFlight()
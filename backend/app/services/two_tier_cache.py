@@ -0,0 +1,258 @@
+"""In-process LRU/TTL tier in front of Redis
+
+Hot cache entries (question sets, reference answers) are kept parsed in a
+bounded per-process LRU so repeated reads skip the Redis round-trip and the
+json.loads. Invalidations are fanned out to all processes over Redis pub/sub.
+Values returned from the local tier are shared objects and must be treated
+as read-only.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = 'cache_invalidation'
+
+DEFAULT_LOCAL_CACHE = {
+    'max_entries': 512,              # 每个命名空间最多条目数
+    'max_bytes': 32 * 1024 * 1024,   # 每个命名空间最多占用（按JSON长度估算）
+    'ttl': 60,                       # 本地副本有效期（秒），限制跨进程不一致窗口
+}
+
+# 当前进程的唯一标识，用于忽略自己发出的失效消息
+_origin = f"{os.getpid()}:{uuid.uuid4().hex}"
+
+
+class LocalLRUCache:
+    """Thread-safe LRU with per-entry TTL and size-based eviction"""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.ttl = float(ttl)
+        self._data: 'OrderedDict[str, Tuple[float, int, Any]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            expire_at, size, value = entry
+            if expire_at <= time.monotonic():
+                self._remove(key)
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats['hits'] += 1
+            return value
+
+    def set(self, key: str, value: Any, size: int, ttl: Optional[float] = None) -> None:
+        if size > self.max_bytes:
+            return
+        ttl = self.ttl if ttl is None else min(self.ttl, ttl)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (time.monotonic() + ttl, size, value)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self.stats['evictions'] += 1
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+                self.stats['invalidations'] += 1
+                return True
+            return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self.stats['invalidations'] += len(self._data)
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hit_rate': round(self.stats['hits'] / lookups, 4) if lookups else 0.0
+            }
+
+
+class TwoTierCache:
+    """Local LRU tier + Redis tier for one cache namespace"""
+
+    def __init__(self, namespace: str, max_entries: int, max_bytes: int, ttl: float):
+        self.namespace = namespace
+        self.local = LocalLRUCache(max_entries, max_bytes, ttl)
+        self.redis_stats = {'hits': 0, 'misses': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.redis_stats[name] += 1
+
+    def get(self, key: str, redis_client=None) -> Optional[Any]:
+        """先查本地，再查Redis并回填本地"""
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        if not redis_client:
+            return None
+
+        _ensure_subscriber(redis_client)
+        try:
+            raw = redis_client.get(key)
+        except Exception as e:
+            self._count('errors')
+            logger.warning(f"Redis tier read failed for {self.namespace}: {e}")
+            return None
+        if raw is None:
+            self._count('misses')
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode('utf-8')
+        value = json.loads(raw)
+        self._count('hits')
+        self.local.set(key, value, len(raw))
+        return value
+
+    def set(self, key: str, value: Any, ttl: int, redis_client=None, serialized: Optional[str] = None):
+        """写入Redis并填充本地副本，返回Redis写入结果"""
+        if serialized is None:
+            serialized = json.dumps(value)
+        result = None
+        if redis_client:
+            _ensure_subscriber(redis_client)
+            result = redis_client.setex(key, ttl, serialized)
+        self.local.set(key, value, len(serialized), ttl)
+        return result
+
+    def invalidate(self, keys: Iterable[str], redis_client=None) -> None:
+        """使指定键的本地副本失效，并通知其他进程"""
+        keys = list(keys)
+        for key in keys:
+            self.local.delete(key)
+        if keys:
+            _publish(redis_client, {'ns': self.namespace, 'keys': keys})
+
+    def invalidate_all(self, redis_client=None) -> None:
+        """清空本命名空间的本地副本，并通知其他进程"""
+        self.local.clear()
+        _publish(redis_client, {'ns': self.namespace, 'keys': None})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            redis_stats = dict(self.redis_stats)
+        lookups = redis_stats['hits'] + redis_stats['misses']
+        redis_stats['hit_rate'] = round(redis_stats['hits'] / lookups, 4) if lookups else 0.0
+        return {'local': self.local.snapshot(), 'redis': redis_stats}
+
+
+_caches: Dict[str, TwoTierCache] = {}
+_caches_lock = threading.Lock()
+_subscriber: Dict[str, Any] = {'pid': None, 'thread': None}
+_subscriber_lock = threading.Lock()
+
+
+def get_two_tier_cache(namespace: str) -> TwoTierCache:
+    """获取命名空间对应的两级缓存（进程内单例）"""
+    cache = _caches.get(namespace)
+    if cache is not None:
+        return cache
+    with _caches_lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            settings = dict(DEFAULT_LOCAL_CACHE)
+            try:
+                settings.update(current_app.config.get('LOCAL_CACHE', {}))
+            except RuntimeError:
+                pass
+            cache = TwoTierCache(namespace, settings['max_entries'], settings['max_bytes'], settings['ttl'])
+            _caches[namespace] = cache
+        return cache
+
+
+def get_all_cache_stats() -> Dict[str, Any]:
+    """所有命名空间的分层命中统计"""
+    return {namespace: cache.stats() for namespace, cache in list(_caches.items())}
+
+
+def _publish(redis_client, message: Dict[str, Any]) -> None:
+    if not redis_client:
+        return
+    try:
+        message['origin'] = _origin
+        redis_client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+    except Exception as e:
+        logger.warning(f"Failed to publish cache invalidation: {e}")
+
+
+def _handle_invalidation(message) -> None:
+    try:
+        data = message.get('data')
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        payload = json.loads(data)
+        if payload.get('origin') == _origin:
+            return
+        cache = _caches.get(payload.get('ns'))
+        if cache is None:
+            return
+        if payload.get('keys') is None:
+            cache.local.clear()
+        else:
+            for key in payload['keys']:
+                cache.local.delete(key)
+    except Exception as e:
+        logger.warning(f"Invalid cache invalidation message: {e}")
+
+
+def _ensure_subscriber(redis_client) -> None:
+    """每个进程启动一个失效消息订阅线程（fork后自动重建）"""
+    global _origin
+    pid = os.getpid()
+    if _subscriber['pid'] == pid:
+        return
+    with _subscriber_lock:
+        if _subscriber['pid'] == pid:
+            return
+        if _subscriber['pid'] is not None:
+            # fork后的子进程：丢弃继承的本地副本和标识
+            _origin = f"{pid}:{uuid.uuid4().hex}"
+            for cache in _caches.values():
+                cache.local.clear()
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: _handle_invalidation})
+            _subscriber['thread'] = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+            logger.info(f"Cache invalidation subscriber started in pid {pid}")
+        except Exception as e:
+            logger.warning(f"Failed to start cache invalidation subscriber: {e}")
+        _subscriber['pid'] = pid
@@ -0,0 +1,106 @@
+"""Per-user cache for the question / interview statistics endpoints
+
+Statistics are computed with grouped aggregate queries and cached per user
+in the two-tier cache. Any flushed insert, update or delete of a Question or
+InterviewSession marks its owner dirty; the user's entries are dropped once
+the transaction commits. Bulk `query.delete()` / `query.update()` bypass the
+unit of work and must call `mark_user_stats_dirty` themselves.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, Set
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.extensions import get_redis_client
+from app.services.two_tier_cache import get_two_tier_cache
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_NAMESPACE = 'user_stats'
+STATS_KINDS = ('questions', 'interviews')
+DEFAULT_STATS_TTL = 600
+
+_PENDING_KEY = 'user_stats_dirty'
+
+
+def user_stats_key(kind: str, user_id: int) -> str:
+    return f"{STATS_CACHE_NAMESPACE}:{kind}:user_{int(user_id)}"
+
+
+def _stats_ttl() -> int:
+    try:
+        return int(current_app.config.get('USER_STATS_TTL', DEFAULT_STATS_TTL))
+    except RuntimeError:
+        return DEFAULT_STATS_TTL
+
+
+def get_user_stats(kind: str, user_id: int, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """读取用户统计缓存，未命中时调用 compute() 计算并写入"""
+    redis_client = get_redis_client()
+    cache = get_two_tier_cache(STATS_CACHE_NAMESPACE)
+    key = user_stats_key(kind, user_id)
+    try:
+        stats = cache.get(key, redis_client)
+        if stats is not None:
+            return stats
+    except Exception as e:
+        logger.warning(f"Failed to read {kind} stats cache for user {user_id}: {e}")
+
+    stats = compute()
+    try:
+        cache.set(key, stats, _stats_ttl(), redis_client)
+    except Exception as e:
+        logger.warning(f"Failed to cache {kind} stats for user {user_id}: {e}")
+    return stats
+
+
+def invalidate_user_stats(user_ids: Iterable[int]) -> None:
+    """删除用户的全部统计缓存（Redis + 所有进程的本地副本）"""
+    keys = [user_stats_key(kind, user_id) for user_id in set(user_ids) for kind in STATS_KINDS]
+    if not keys:
+        return
+    redis_client = get_redis_client()
+    try:
+        if redis_client:
+            redis_client.delete(*keys)
+        get_two_tier_cache(STATS_CACHE_NAMESPACE).invalidate(keys, redis_client)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate user stats {keys}: {e}")
+
+
+def mark_user_stats_dirty(session, user_id: int) -> None:
+    """标记用户统计在当前事务提交后失效（用于绕过ORM单元的批量写入）"""
+    session.info.setdefault(_PENDING_KEY, set()).add(int(user_id))
+
+
+def _collect_dirty_users(session, flush_context) -> None:
+    from app.models.question import Question, InterviewSession
+
+    dirty: Set[int] = session.info.setdefault(_PENDING_KEY, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, (Question, InterviewSession)) and instance.user_id is not None:
+            dirty.add(int(instance.user_id))
+
+
+def _invalidate_after_commit(session) -> None:
+    dirty = session.info.pop(_PENDING_KEY, None)
+    if dirty:
+        invalidate_user_stats(dirty)
+
+
+def _discard_after_rollback(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def init_stats_cache_invalidation() -> None:
+    """注册会话事件：问题/面试会话写入提交后使对应用户的统计缓存失效"""
+    for name, listener in (
+        ('after_flush', _collect_dirty_users),
+        ('after_commit', _invalidate_after_commit),
+        ('after_rollback', _discard_after_rollback),
+    ):
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
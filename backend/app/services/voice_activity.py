@@ -0,0 +1,162 @@
+"""Energy / zero-crossing voice activity detection for PCM16 audio
+
+Audio is cut into short frames and classified with vectorized NumPy ops:
+a frame is speech when its energy is clearly above the session's adaptive
+noise floor and its zero-crossing rate does not look like broadband noise.
+A hangover keeps short pauses inside an utterance, and a long enough run of
+silence after speech marks the end of the utterance.
+"""
+
+import io
+import logging
+import threading
+import time
+import wave
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class VADResult:
+    """单个音频块的检测结果"""
+    audio: bytes              # 保留的音频（静音帧已去除；wav块只做整块取舍）
+    has_speech: bool          # 块内是否有语音（含拖尾）
+    speech_ended: bool        # 语音之后出现足够长的静音，可作为自然的 is_final
+    speech_ratio: float       # 语音帧占比
+    frames: int
+    dropped_bytes: int
+
+
+class _SessionState:
+    def __init__(self, initial_noise_db: float):
+        self.noise_floor_db = initial_noise_db
+        self.in_speech = False
+        self.hangover_left = 0     # 剩余拖尾帧数
+        self.silence_frames = 0    # 语音后连续静音帧数
+        self.last_access = time.monotonic()
+
+
+class VoiceActivityDetector:
+    """按会话维护噪声基线和语音状态的VAD"""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 30,
+        threshold_db: float = -45.0,
+        noise_margin_db: float = 10.0,
+        max_zcr: float = 0.35,
+        hangover_ms: int = 300,
+        end_silence_ms: int = 800
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = max(1, int(sample_rate * frame_ms / 1000))
+        self.frame_ms = frame_ms
+        self.threshold_db = threshold_db
+        self.noise_margin_db = noise_margin_db
+        self.max_zcr = max_zcr
+        self.hangover_frames = max(0, int(hangover_ms / frame_ms))
+        self.end_silence_frames = max(1, int(end_silence_ms / frame_ms))
+        self._sessions: Dict[str, _SessionState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, session_key: str) -> _SessionState:
+        with self._lock:
+            state = self._sessions.get(session_key)
+            if state is None:
+                state = _SessionState(self.threshold_db - self.noise_margin_db)
+                self._sessions[session_key] = state
+            state.last_access = time.monotonic()
+            return state
+
+    def reset(self, session_key: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_key, None)
+
+    def expire_idle(self, ttl: float) -> int:
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, state in self._sessions.items() if now - state.last_access > ttl]
+            for key in expired:
+                del self._sessions[key]
+        return len(expired)
+
+    def frame_features(self, samples: np.ndarray):
+        """返回每帧的能量(dBFS)和过零率，样本为int16"""
+        frame_count = len(samples) // self.frame_len
+        frames = samples[:frame_count * self.frame_len].astype(np.float32).reshape(frame_count, self.frame_len)
+        frames /= 32768.0
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+        return energy_db, zcr
+
+    def analyze_pcm16(self, session_key: str, pcm: bytes, trim: bool = True) -> VADResult:
+        """检测一个PCM16块；trim=True时只保留语音帧（含拖尾），尾部不足一帧的样本原样保留"""
+        samples = np.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype='<i2')
+        frame_count = len(samples) // self.frame_len
+        if frame_count == 0:
+            return VADResult(pcm, True, False, 1.0, 0, 0)
+
+        state = self._state(session_key)
+        energy_db, zcr = self.frame_features(samples)
+
+        threshold = max(self.threshold_db, state.noise_floor_db + self.noise_margin_db)
+        # 明显高于阈值的帧不看过零率（爆破音/清辅音），接近阈值时要求过零率不像宽带噪声
+        raw_speech = (energy_db > threshold + self.noise_margin_db) | (
+            (energy_db > threshold) & (zcr < self.max_zcr)
+        )
+
+        # 噪声基线只用非语音帧更新（慢速指数平均）
+        if not raw_speech.all():
+            noise_db = float(np.median(energy_db[~raw_speech]))
+            state.noise_floor_db = 0.9 * state.noise_floor_db + 0.1 * noise_db
+
+        # 拖尾与语音结束判定需要逐帧状态，帧数很少（每块约几十帧）
+        keep = np.zeros(frame_count, dtype=bool)
+        speech_ended = False
+        for i, is_speech in enumerate(raw_speech):
+            if is_speech:
+                state.in_speech = True
+                state.hangover_left = self.hangover_frames
+                state.silence_frames = 0
+                keep[i] = True
+            elif state.in_speech:
+                state.silence_frames += 1
+                if state.hangover_left > 0:
+                    state.hangover_left -= 1
+                    keep[i] = True
+                if state.silence_frames >= self.end_silence_frames:
+                    state.in_speech = False
+                    speech_ended = True
+
+        has_speech = bool(keep.any())
+        speech_ratio = float(raw_speech.mean())
+        if not trim:
+            audio = pcm if has_speech else b''
+        elif keep.all():
+            audio = pcm
+        else:
+            kept = samples[:frame_count * self.frame_len].reshape(frame_count, self.frame_len)[keep]
+            tail = samples[frame_count * self.frame_len:] if has_speech else samples[:0]
+            audio = kept.tobytes() + tail.tobytes()
+
+        return VADResult(audio, has_speech, speech_ended, speech_ratio, frame_count, len(pcm) - len(audio))
+
+    def analyze_wav(self, session_key: str, wav_bytes: bytes) -> Optional[VADResult]:
+        """检测一个WAV块（只支持16bit单声道），整块保留或丢弃；无法解析时返回None"""
+        try:
+            with wave.open(io.BytesIO(wav_bytes), 'rb') as wav_file:
+                if wav_file.getsampwidth() != 2 or wav_file.getnchannels() != 1:
+                    return None
+                pcm = wav_file.readframes(wav_file.getnframes())
+        except (wave.Error, EOFError):
+            return None
+        result = self.analyze_pcm16(session_key, pcm, trim=False)
+        result.audio = wav_bytes if result.has_speech else b''
+        result.dropped_bytes = 0 if result.has_speech else len(wav_bytes)
+        return result
@@ -4,13 +4,20 @@ import base64
 import logging
 import time
 import io
+import os
 import wave
+import re
 import threading
-from typing import Dict, List, Optional, Callable, Any
+import zlib
+from concurrent.futures import Future
+from typing import Deque, Dict, List, Optional, Callable, Any, Tuple
 from dataclasses import dataclass
+from collections import deque
 from queue import Queue, Empty
 import numpy as np
 
+from app.services.voice_activity import VoiceActivityDetector, VADResult
+
 try:
     import speech_recognition as sr
     SPEECH_RECOGNITION_AVAILABLE = True
@@ -23,6 +30,14 @@ try:
 except ImportError:
     WHISPER_AVAILABLE = False
 
+try:
+    from faster_whisper import WhisperModel as FasterWhisperModel
+    from faster_whisper.audio import decode_audio as faster_whisper_decode_audio, pad_or_trim
+    from faster_whisper.tokenizer import Tokenizer as FasterWhisperTokenizer
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
 try:
     import requests
     REQUESTS_AVAILABLE = True
@@ -31,6 +46,10 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# 客户端可协商的音频编码：pcm16 为裸PCM（16bit小端），多个块可直接拼接，转录前封装为WAV
+SUPPORTED_AUDIO_FORMATS = ('pcm16', 'wav')
+RAW_PCM_FORMATS = ('pcm16',)
+
 @dataclass
 class VoiceConfig:
     """语音配置类"""
@@ -38,9 +57,23 @@ class VoiceConfig:
     channels: int = 1
     chunk_size: int = 1024
     language: str = 'zh-CN'
-    provider: str = 'google'  # google, azure, whisper, baidu
+    provider: str = 'google'  # google, azure, whisper, baidu, local_whisper
     api_key: Optional[str] = None
     confidence_threshold: float = 0.7
+    num_workers: int = 4  # 转录工作线程数，按会话分片保证同一会话内有序
+    max_pending_per_session: int = 3  # 每个会话最多排队的中间转录任务数（背压）
+    buffer_max_chunks: int = 10  # 每个会话环形缓冲区保留的音频块数
+    session_ttl: float = 300.0  # 会话空闲多久后回收缓冲区（秒）
+    transcription_mode: str = 'incremental'  # incremental: 只转录新音频并拼接（仅裸PCM，其他格式按full处理）; full: 每次转录整个缓冲区
+    overlap_chunks: int = 1  # 增量模式下与上一窗口重叠的音频块数
+    vad_enabled: bool = True  # 转录前做语音活动检测，丢弃静音
+    vad_threshold_db: float = -45.0  # 语音能量下限（dBFS），实际阈值随会话噪声基线上调
+    vad_end_silence_ms: int = 800  # 语音后静音超过该时长视为一句话结束
+    local_model: str = 'small'  # local_whisper: 模型名或本地模型目录（离线部署填目录）
+    local_device: str = 'cpu'
+    local_compute_type: str = 'int8'
+    local_batch_size: int = 4  # 并发会话的音频窗口合并解码的最大批量
+    local_batch_wait_ms: int = 30  # 凑批等待时间
 
 @dataclass
 class AudioChunk:
@@ -65,43 +98,254 @@ class TranscriptionResult:
     language: str
     timestamp: float
     processing_time: float
+    stable_text: str = ''  # 增量模式下已稳定（后续窗口不会再修改）的前缀
 
-class VoiceBuffer:
-    """语音数据缓冲器"""
+
+def merge_wav_chunks(data: bytes) -> bytes:
+    """把首尾相接的多个WAV块合并为一个WAV（否则解码器只读到第一个块）
+
+    块头长度无效、参数不一致或无法解析时原样返回。
+    """
+    params = None
+    frames = []
+    offset = 0
+    while offset < len(data):
+        if data[offset:offset + 4] != b'RIFF' or offset + 8 > len(data):
+            return data
+        size = int.from_bytes(data[offset + 4:offset + 8], 'little') + 8
+        if size <= 8 or offset + size > len(data):
+            return data
+        try:
+            with wave.open(io.BytesIO(data[offset:offset + size]), 'rb') as wav_file:
+                chunk_params = (wav_file.getnchannels(), wav_file.getsampwidth(), wav_file.getframerate())
+                chunk_frames = wav_file.readframes(wav_file.getnframes())
+        except (wave.Error, EOFError):
+            return data
+        if params is not None and chunk_params != params:
+            return data
+        params = chunk_params
+        frames.append(chunk_frames)
+        offset += size
     
-    def __init__(self, max_buffer_size: int = 10):
-        self.buffer: List[AudioChunk] = []
-        self.max_buffer_size = max_buffer_size
+    if len(frames) <= 1:
+        return data
+    wav_io = io.BytesIO()
+    with wave.open(wav_io, 'wb') as wav_file:
+        wav_file.setnchannels(params[0])
+        wav_file.setsampwidth(params[1])
+        wav_file.setframerate(params[2])
+        wav_file.writeframes(b''.join(frames))
+    return wav_io.getvalue()
+
+
+class SessionAudioBuffer:
+    """单个会话的有界环形缓冲区"""
+    
+    def __init__(self, max_chunks: int):
+        # (序号, 音频块)，序号用于增量转录时区分已发送和未发送的块
+        self.chunks: Deque[Tuple[int, AudioChunk]] = deque(maxlen=max_chunks)
         self.lock = threading.Lock()
+        self.total_bytes = 0
+        self.last_access = time.monotonic()
+        self.next_seq = 0
+        self.sent_seq = -1  # 已进入转录窗口的最后一个块
+        self.evicted_unsent = 0  # 未转录就被挤出缓冲区的块数
+    
+    def append(self, chunk: AudioChunk):
+        """O(1)追加，满时自动淘汰最旧的块"""
+        with self.lock:
+            if len(self.chunks) == self.chunks.maxlen:
+                oldest_seq, oldest = self.chunks[0]
+                self.total_bytes -= len(oldest.data)
+                if oldest_seq > self.sent_seq:
+                    self.evicted_unsent += 1
+            self.chunks.append((self.next_seq, chunk))
+            self.next_seq += 1
+            self.total_bytes += len(chunk.data)
+            self.last_access = time.monotonic()
+    
+    def join(self) -> bytes:
+        """拼接缓冲音频（按总长度一次性分配并复制，无中间拷贝）"""
+        with self.lock:
+            self.last_access = time.monotonic()
+            if not self.chunks:
+                return b''
+            self.sent_seq = self.chunks[-1][0]
+            return b''.join([chunk.data for _, chunk in self.chunks])
+    
+    def take_window(self, overlap_chunks: int) -> Tuple[bytes, int]:
+        """取出尚未转录的音频（附带前面 overlap_chunks 个已转录块作为上下文），并标记为已发送
+
+        Returns:
+            (音频数据, 新块数量)，没有新音频时返回 (b'', 0)
+        """
+        with self.lock:
+            self.last_access = time.monotonic()
+            items = list(self.chunks)
+            first_new = next((i for i, (seq, _) in enumerate(items) if seq > self.sent_seq), None)
+            if first_new is None:
+                return b'', 0
+            start = max(0, first_new - max(0, overlap_chunks))
+            self.sent_seq = items[-1][0]
+            return b''.join([chunk.data for _, chunk in items[start:]]), len(items) - first_new
+    
+    def unsent_count(self) -> int:
+        """尚未进入转录窗口的块数"""
+        with self.lock:
+            return sum(1 for seq, _ in self.chunks if seq > self.sent_seq)
+    
+    def has_room_for_unsent(self) -> bool:
+        """再追加一个块时是否不会挤掉未转录的音频"""
+        return self.unsent_count() + 1 < self.chunks.maxlen
+    
+    def clear(self):
+        with self.lock:
+            self.chunks.clear()
+            self.total_bytes = 0
+            self.sent_seq = self.next_seq - 1
+            self.last_access = time.monotonic()
+
+
+class VoiceBuffer:
+    """语音数据缓冲器（每个会话独立的环形缓冲区和锁）"""
+    
+    SWEEP_INTERVAL = 30.0  # 空闲会话清理间隔（秒）
+    
+    def __init__(self, max_buffer_size: int = 10, session_ttl: float = 300.0):
+        self.sessions: Dict[Tuple[str, str], SessionAudioBuffer] = {}
+        self.max_buffer_size = max(1, int(max_buffer_size))
+        self.session_ttl = session_ttl
+        self.lock = threading.Lock()  # 只保护会话表，不保护音频数据
+        self._last_sweep = time.monotonic()
+    
+    def _get_session(self, user_id: str, interview_id: str, create: bool = False) -> Optional[SessionAudioBuffer]:
+        key = (user_id, interview_id)
+        session = self.sessions.get(key)
+        if session is None and create:
+            with self.lock:
+                session = self.sessions.get(key)
+                if session is None:
+                    session = SessionAudioBuffer(self.max_buffer_size)
+                    self.sessions[key] = session
+        return session
     
     def add_chunk(self, chunk: AudioChunk):
         """添加音频块"""
-        with self.lock:
-            self.buffer.append(chunk)
-            if len(self.buffer) > self.max_buffer_size:
-                self.buffer.pop(0)
+        self._get_session(chunk.user_id, chunk.interview_id, create=True).append(chunk)
     
     def get_continuous_audio(self, user_id: str, interview_id: str) -> bytes:
         """获取连续的音频数据"""
-        with self.lock:
-            relevant_chunks = [
-                chunk for chunk in self.buffer 
-                if chunk.user_id == user_id and chunk.interview_id == interview_id
-            ]
-            if not relevant_chunks:
-                return b''
-            
-            # 合并音频数据
-            combined_data = b''.join([chunk.data for chunk in relevant_chunks])
-            return combined_data
+        session = self._get_session(user_id, interview_id)
+        if session is None:
+            return b''
+        return session.join()
+    
+    def can_defer(self, user_id: str, interview_id: str) -> bool:
+        """会话缓冲区是否还能容纳更多未转录的块"""
+        session = self._get_session(user_id, interview_id)
+        return session is None or session.has_room_for_unsent()
+    
+    def get_incremental_audio(self, user_id: str, interview_id: str, overlap_chunks: int = 1) -> Tuple[bytes, int]:
+        """获取上次转录之后的新音频（带重叠窗口）"""
+        session = self._get_session(user_id, interview_id)
+        if session is None:
+            return b'', 0
+        return session.take_window(overlap_chunks)
     
     def clear_buffer(self, user_id: str, interview_id: str):
         """清空特定用户的缓冲区"""
+        session = self._get_session(user_id, interview_id)
+        if session is not None:
+            session.clear()
+    
+    def remove_session(self, user_id: str, interview_id: str):
+        """移除会话缓冲区"""
+        with self.lock:
+            self.sessions.pop((user_id, interview_id), None)
+    
+    def expire_idle_sessions(self, force: bool = False) -> List[Tuple[str, str]]:
+        """回收空闲超过TTL的会话，返回被回收的 (user_id, interview_id)"""
+        now = time.monotonic()
+        if not force and now - self._last_sweep < self.SWEEP_INTERVAL:
+            return []
+        self._last_sweep = now
         with self.lock:
-            self.buffer = [
-                chunk for chunk in self.buffer 
-                if not (chunk.user_id == user_id and chunk.interview_id == interview_id)
+            expired = [
+                key for key, session in self.sessions.items()
+                if now - session.last_access > self.session_ttl
             ]
+            for key in expired:
+                del self.sessions[key]
+        if expired:
+            logger.info(f"回收空闲语音缓冲会话: {len(expired)} 个")
+        return expired
+    
+    def get_stats(self) -> Dict[str, int]:
+        """缓冲区统计"""
+        with self.lock:
+            sessions = list(self.sessions.values())
+        return {
+            'sessions': len(sessions),
+            'chunks': sum(len(session.chunks) for session in sessions),
+            'bytes': sum(session.total_bytes for session in sessions),
+            'evicted_unsent': sum(session.evicted_unsent for session in sessions)
+        }
+
+_TOKEN_RE = re.compile(r'[\u3400-\u9fff\uf900-\ufaff]|[^\s\u3400-\u9fff\uf900-\ufaff]+')
+_CJK_RE = re.compile(r'[\u3400-\u9fff\uf900-\ufaff]')
+
+
+class TranscriptStitcher:
+    """增量转录的文本拼接器
+
+    相邻窗口有一段重叠音频，新窗口的开头会重复上一窗口的结尾。
+    按词（中文按字）找出最长的"旧文本后缀 == 新文本前缀"并去掉重复部分。
+    上一窗口的内容在被新窗口的重叠部分确认后视为稳定。
+    """
+    
+    def __init__(self, max_overlap_tokens: int = 30):
+        self.tokens: List[str] = []
+        self.stable_count = 0
+        self.max_overlap_tokens = max_overlap_tokens
+    
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return _TOKEN_RE.findall(text or '')
+    
+    @staticmethod
+    def join_tokens(tokens: List[str]) -> str:
+        parts = []
+        for i, token in enumerate(tokens):
+            if i > 0 and not (_CJK_RE.match(token) or _CJK_RE.match(tokens[i - 1])):
+                parts.append(' ')
+            parts.append(token)
+        return ''.join(parts)
+    
+    def merge(self, text: str) -> None:
+        """合并一个新窗口的识别结果"""
+        new_tokens = self.tokenize(text)
+        if not new_tokens:
+            return
+        
+        previous_count = len(self.tokens)
+        max_k = min(previous_count, len(new_tokens), self.max_overlap_tokens)
+        overlap = 0
+        for k in range(max_k, 0, -1):
+            if [t.lower() for t in self.tokens[-k:]] == [t.lower() for t in new_tokens[:k]]:
+                overlap = k
+                break
+        
+        self.tokens.extend(new_tokens[overlap:])
+        # 本窗口之前的内容已被重叠部分确认
+        self.stable_count = previous_count
+    
+    @property
+    def text(self) -> str:
+        return self.join_tokens(self.tokens)
+    
+    @property
+    def stable_text(self) -> str:
+        return self.join_tokens(self.tokens[:self.stable_count])
 
 class STTProvider:
     """语音转文本提供商基类"""
@@ -325,16 +569,226 @@ class BaiduSTTProvider(STTProvider):
             processing_time=time.time() - start_time
         )
 
+# 本地Whisper模型：每个进程只加载一次（fork后重新加载）
+_local_models: Dict[Tuple[str, str, str], Any] = {}
+_local_models_pid = {'pid': None}
+_local_models_lock = threading.Lock()
+
+
+def get_local_whisper_model(model_size_or_path: str, device: str = 'cpu', compute_type: str = 'int8',
+                            cpu_threads: int = 0):
+    """获取进程内共享的 faster-whisper 模型"""
+    if not FASTER_WHISPER_AVAILABLE:
+        raise ImportError("需要安装 faster-whisper>=1.0 库（pip install -r requirements_local_whisper.txt）")
+    key = (model_size_or_path, device, compute_type)
+    with _local_models_lock:
+        pid = os.getpid()
+        if _local_models_pid['pid'] != pid:
+            _local_models.clear()
+            _local_models_pid['pid'] = pid
+        model = _local_models.get(key)
+        if model is None:
+            load_start = time.time()
+            model = FasterWhisperModel(
+                model_size_or_path,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads
+            )
+            _local_models[key] = model
+            logger.info(f"本地Whisper模型已加载: {model_size_or_path} ({device}/{compute_type}), 耗时 {time.time() - load_start:.1f}s")
+        return model
+
+
+class LocalWhisperSTTProvider(STTProvider):
+    """本地离线 Whisper 提供商（faster-whisper / CTranslate2）
+
+    模型每个进程只加载一次。各会话工作线程的并发请求由一个批处理线程收集，
+    在 batch_wait_ms 内凑成一批后一次编码解码；批量路径失败时逐条回退到 model.transcribe。
+    """
+    
+    MAX_BATCH_SECONDS = 30  # Whisper单个输入窗口上限，更长的音频走逐条转录
+    
+    def __init__(self, config: VoiceConfig):
+        super().__init__(config)
+        self.model = get_local_whisper_model(
+            config.local_model, config.local_device, config.local_compute_type
+        )
+        self.language = config.language[:2] if config.language else None
+        self.batch_size = max(1, int(config.local_batch_size))
+        self.batch_wait = max(0, config.local_batch_wait_ms) / 1000.0
+        self.beam_size = 1  # 实时场景使用贪心解码
+        self.requests: Queue = Queue()
+        self.batch_stats = {'batches': 0, 'items': 0, 'max_batch': 0, 'fallbacks': 0}
+        self._tokenizer = None
+        self._worker = threading.Thread(target=self._batch_worker, name='local-whisper-batcher', daemon=True)
+        self._worker.start()
+    
+    def transcribe(self, audio_data: bytes) -> TranscriptionResult:
+        """提交到批处理线程并等待结果"""
+        start_time = time.time()
+        try:
+            waveform = self._decode_waveform(audio_data)
+        except Exception as e:
+            logger.error(f"本地Whisper音频解码错误: {e}")
+            return self._create_result('', 0.0, start_time)
+        
+        future: Future = Future()
+        self.requests.put((waveform, future))
+        try:
+            text, confidence = future.result()
+        except Exception as e:
+            logger.error(f"本地Whisper转录错误: {e}")
+            return self._create_result('', 0.0, start_time)
+        return self._create_result(text, confidence, start_time)
+    
+    def _decode_waveform(self, audio_data: bytes) -> np.ndarray:
+        """WAV(16bit, 16kHz)直接解析，其他格式交给 faster-whisper 解码并重采样"""
+        try:
+            with wave.open(io.BytesIO(audio_data), 'rb') as wav_file:
+                if (wav_file.getsampwidth() == 2 and wav_file.getframerate() == 16000):
+                    pcm = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype='<i2')
+                    if wav_file.getnchannels() > 1:
+                        pcm = pcm.reshape(-1, wav_file.getnchannels()).mean(axis=1)
+                    return pcm.astype(np.float32) / 32768.0
+        except (wave.Error, EOFError):
+            pass
+        return faster_whisper_decode_audio(io.BytesIO(audio_data), sampling_rate=16000)
+    
+    def _batch_worker(self):
+        while True:
+            batch = [self.requests.get()]
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=remaining))
+                except Empty:
+                    break
+            self._run_batch(batch)
+    
+    def _run_batch(self, batch: List[Tuple[np.ndarray, Future]]):
+        max_samples = self.MAX_BATCH_SECONDS * 16000
+        batchable = [item for item in batch if len(item[0]) <= max_samples]
+        single = [item for item in batch if len(item[0]) > max_samples]
+        
+        if len(batchable) > 1:
+            try:
+                outputs = self._decode_batch([waveform for waveform, _ in batchable])
+                for (_, future), output in zip(batchable, outputs):
+                    future.set_result(output)
+                self.batch_stats['batches'] += 1
+                self.batch_stats['items'] += len(batchable)
+                self.batch_stats['max_batch'] = max(self.batch_stats['max_batch'], len(batchable))
+                batchable = []
+            except Exception as e:
+                self.batch_stats['fallbacks'] += 1
+                logger.warning(f"本地Whisper批量解码失败，逐条处理: {e}")
+        
+        for waveform, future in batchable + single:
+            try:
+                future.set_result(self._decode_single(waveform))
+            except Exception as e:
+                future.set_exception(e)
+    
+    def _get_tokenizer(self):
+        if self._tokenizer is None:
+            self._tokenizer = FasterWhisperTokenizer(
+                self.model.hf_tokenizer,
+                self.model.model.is_multilingual,
+                task='transcribe',
+                language=self.language or 'en'
+            )
+        return self._tokenizer
+    
+    def _decode_batch(self, waveforms: List[np.ndarray]) -> List[Tuple[str, float]]:
+        """多个会话的音频窗口一次编码、一次解码"""
+        model = self.model
+        features = np.stack([pad_or_trim(model.feature_extractor(waveform)) for waveform in waveforms])
+        tokenizer = self._get_tokenizer()
+        prompt = model.get_prompt(tokenizer, [], without_timestamps=True)
+        encoder_output = model.encode(features)
+        results = model.model.generate(
+            encoder_output,
+            [list(prompt) for _ in waveforms],
+            beam_size=self.beam_size,
+            max_length=model.max_length,
+            return_scores=True,
+            return_no_speech_prob=True,
+            suppress_blank=True
+        )
+        outputs = []
+        for result in results:
+            text = tokenizer.decode(result.sequences_ids[0]).strip()
+            confidence = float(np.exp(result.scores[0])) * (1.0 - result.no_speech_prob)
+            outputs.append((text, confidence))
+        return outputs
+    
+    def _decode_single(self, waveform: np.ndarray) -> Tuple[str, float]:
+        segments, _ = self.model.transcribe(
+            waveform,
+            language=self.language,
+            beam_size=self.beam_size,
+            without_timestamps=True,
+            condition_on_previous_text=False
+        )
+        segments = list(segments)
+        if not segments:
+            return '', 0.0
+        text = ''.join(segment.text for segment in segments).strip()
+        confidence = float(np.mean([
+            np.exp(segment.avg_logprob) * (1.0 - segment.no_speech_prob) for segment in segments
+        ]))
+        return text, confidence
+    
+    def _create_result(self, text: str, confidence: float, start_time: float) -> TranscriptionResult:
+        return TranscriptionResult(
+            text=text,
+            confidence=confidence,
+            user_id="",
+            interview_id="",
+            chunk_id=0,
+            is_final=True,
+            language=self.config.language,
+            timestamp=time.time(),
+            processing_time=time.time() - start_time
+        )
+
 class VoiceTranscriptionService:
     """语音转录服务"""
     
     def __init__(self, config: VoiceConfig = None):
         self.config = config or VoiceConfig()
-        self.buffer = VoiceBuffer()
-        self.processing_queue = Queue()
+        self.buffer = VoiceBuffer(self.config.buffer_max_chunks, self.config.session_ttl)
+        self.num_workers = max(1, int(self.config.num_workers))
+        # 每个工作线程一个队列，同一会话总是落到同一分片
+        self.shard_queues: List[Queue] = [Queue() for _ in range(self.num_workers)]
         self.result_callbacks: Dict[str, Callable] = {}
         self.is_running = False
-        self.worker_thread = None
+        self.worker_threads: List[threading.Thread] = []
+        
+        # 队列深度与背压统计
+        self._stats_lock = threading.Lock()
+        self.session_pending: Dict[str, int] = {}
+        self.session_dropped: Dict[str, int] = {}
+        self.stats = {
+            'enqueued': 0, 'processed': 0, 'dropped': 0, 'deferred': 0, 'failed': 0,
+            'audio_bytes_sent': 0
+        }
+        # 增量模式下每个会话的拼接状态（只在该会话所属分片的工作线程中修改）
+        self.transcripts: Dict[str, TranscriptStitcher] = {}
+        
+        # 语音活动检测（只对PCM16/16bit单声道WAV生效）
+        self.vad = VoiceActivityDetector(
+            sample_rate=self.config.sample_rate,
+            threshold_db=self.config.vad_threshold_db,
+            end_silence_ms=self.config.vad_end_silence_ms
+        ) if self.config.vad_enabled and self.config.channels == 1 else None
+        self._last_vad_sweep = time.monotonic()
+        self.vad_stats = {'chunks_in': 0, 'chunks_dropped': 0, 'bytes_in': 0, 'bytes_dropped': 0, 'utterances': 0}
+        self._processing_time_total = 0.0
         
         # 初始化STT提供商
         self.stt_provider = self._create_stt_provider()
@@ -352,6 +806,13 @@ class VoiceTranscriptionService:
             return WhisperSTTProvider(self.config)
         elif self.config.provider == 'baidu':
             return BaiduSTTProvider(self.config)
+        elif self.config.provider == 'local_whisper':
+            try:
+                return LocalWhisperSTTProvider(self.config)
+            except Exception as e:
+                # 未安装 faster-whisper(>=1.0) 或模型加载失败时不影响应用启动
+                logger.error(f"本地Whisper提供商不可用，改用Google: {e}")
+                return GoogleSTTProvider(self.config)
         else:
             logger.warning(f"未知的STT提供商: {self.config.provider}，使用Google作为默认")
             return GoogleSTTProvider(self.config)
@@ -363,24 +824,47 @@ class VoiceTranscriptionService:
             return
         
         self.is_running = True
-        self.worker_thread = threading.Thread(target=self._process_audio_worker)
-        self.worker_thread.daemon = True
-        self.worker_thread.start()
+        self.worker_threads = []
+        for shard_id in range(self.num_workers):
+            worker = threading.Thread(
+                target=self._process_audio_worker,
+                args=(shard_id,),
+                name=f"stt-worker-{shard_id}"
+            )
+            worker.daemon = True
+            worker.start()
+            self.worker_threads.append(worker)
         
-        logger.info("语音转录服务已启动")
+        logger.info(f"语音转录服务已启动，工作线程数: {self.num_workers}")
     
     def stop_service(self):
         """停止转录服务"""
         self.is_running = False
-        if self.worker_thread:
-            self.worker_thread.join(timeout=5)
+        for worker in self.worker_threads:
+            worker.join(timeout=5)
+        self.worker_threads = []
         
         logger.info("语音转录服务已停止")
     
     def process_voice_data(self, audio_data: bytes, user_id: str, interview_id: str, 
-                          chunk_id: int, is_final: bool = False) -> Optional[TranscriptionResult]:
-        """处理语音数据"""
+                          chunk_id: int, is_final: bool = False,
+                          audio_format: str = 'wav') -> Optional[TranscriptionResult]:
+        """处理语音数据（audio_format 为 pcm16 时按裸PCM拼接，转录前封装为WAV）"""
         try:
+            # 先回收空闲会话（只有静音的会话不会进入缓冲区，也要在这里回收VAD状态）
+            self._expire_idle_sessions()
+            
+            # 语音活动检测：丢弃静音，语音结束处作为自然的最终块
+            if self.vad and audio_data:
+                vad_result = self._detect_voice_activity(f"{user_id}_{interview_id}", audio_data, audio_format)
+                if vad_result is not None:
+                    audio_data = vad_result.audio
+                    if vad_result.speech_ended and not is_final:
+                        is_final = True
+                        logger.debug(f"VAD检测到语句结束: {user_id}_{interview_id}, 块 {chunk_id}")
+                    if not audio_data and not is_final:
+                        return None
+            
             # 创建音频块
             chunk = AudioChunk(
                 data=audio_data,
@@ -392,30 +876,59 @@ class VoiceTranscriptionService:
                 sample_rate=self.config.sample_rate
             )
             
-            # 添加到缓冲区
-            self.buffer.add_chunk(chunk)
+            # 添加到缓冲区（空的最终块只用于结束当前语句）
+            if audio_data:
+                self.buffer.add_chunk(chunk)
             
             # 如果是最终块或缓冲区达到阈值，处理音频
             if is_final or self._should_process_buffer(user_id, interview_id):
-                # 获取连续音频数据
-                continuous_audio = self.buffer.get_continuous_audio(user_id, interview_id)
+                # 只有裸PCM可以按块切窗口；WAV/webm/opus 等每块带容器头，窗口必须从头拼接
+                incremental = (self.config.transcription_mode == 'incremental'
+                               and audio_format in RAW_PCM_FORMATS)
+                if incremental:
+                    if (not is_final and self._is_backlogged(f"{user_id}_{interview_id}")
+                            and self.buffer.can_defer(user_id, interview_id)):
+                        # 会话积压时不取窗口，新音频留在缓冲区并入下一个窗口（缓冲区将满时仍然入队）
+                        with self._stats_lock:
+                            self.stats['deferred'] += 1
+                        return None
+                    # 只取上次转录之后的新音频（带少量重叠）
+                    audio_data, new_chunks = self.buffer.get_incremental_audio(
+                        user_id, interview_id, self.config.overlap_chunks
+                    )
+                else:
+                    # 获取连续音频数据
+                    audio_data = self.buffer.get_continuous_audio(user_id, interview_id)
                 
-                if continuous_audio:
+                if audio_data:
                     # 加入处理队列
                     task = {
-                        'audio_data': continuous_audio,
+                        'audio_data': audio_data,
                         'user_id': user_id,
                         'interview_id': interview_id,
                         'chunk_id': chunk_id,
                         'is_final': is_final,
+                        'incremental': incremental,
+                        'audio_format': audio_format,
                         'timestamp': time.time()
                     }
                     
-                    self.processing_queue.put(task)
-                    
-                    # 如果是最终块，清空缓冲区
-                    if is_final:
-                        self.buffer.clear_buffer(user_id, interview_id)
+                    self._enqueue_task(task)
+                elif is_final and incremental:
+                    # 没有新音频：直接下发已拼接的最终文本
+                    self._enqueue_task({
+                        'audio_data': b'',
+                        'user_id': user_id,
+                        'interview_id': interview_id,
+                        'chunk_id': chunk_id,
+                        'is_final': True,
+                        'incremental': True,
+                        'timestamp': time.time()
+                    })
+                
+                # 如果是最终块，清空缓冲区
+                if is_final:
+                    self.buffer.clear_buffer(user_id, interview_id)
             
             return None  # 异步处理，结果通过回调返回
             
@@ -423,6 +936,46 @@ class VoiceTranscriptionService:
             logger.error(f"处理语音数据错误: {e}")
             return None
     
+    def _detect_voice_activity(self, session_key: str, audio_data: bytes, audio_format: str) -> Optional[VADResult]:
+        """对可解码的PCM音频做VAD，其他格式返回None（不过滤）"""
+        try:
+            if audio_format in RAW_PCM_FORMATS:
+                result = self.vad.analyze_pcm16(session_key, audio_data)
+            elif audio_format == 'wav':
+                result = self.vad.analyze_wav(session_key, audio_data)
+            else:
+                return None
+        except Exception as e:
+            logger.warning(f"VAD处理失败，跳过检测: {e}")
+            return None
+        
+        if result is not None:
+            with self._stats_lock:
+                self.vad_stats['chunks_in'] += 1
+                self.vad_stats['bytes_in'] += len(audio_data)
+                self.vad_stats['bytes_dropped'] += result.dropped_bytes
+                if not result.audio:
+                    self.vad_stats['chunks_dropped'] += 1
+                if result.speech_ended:
+                    self.vad_stats['utterances'] += 1
+        return result
+    
+    def _expire_idle_sessions(self):
+        """回收空闲会话的缓冲区和处理状态"""
+        for user_id, interview_id in self.buffer.expire_idle_sessions():
+            self.active_sessions.pop(f"{user_id}_{interview_id}", None)
+            self.transcripts.pop(f"{user_id}_{interview_id}", None)
+            if self.vad:
+                self.vad.reset(f"{user_id}_{interview_id}")
+        
+        # VAD状态独立于缓冲区回收：只发送静音的会话从未创建缓冲区
+        now = time.monotonic()
+        if self.vad and now - self._last_vad_sweep >= VoiceBuffer.SWEEP_INTERVAL:
+            self._last_vad_sweep = now
+            expired = self.vad.expire_idle(self.config.session_ttl)
+            if expired:
+                logger.info(f"回收空闲VAD会话状态: {expired} 个")
+    
     def _should_process_buffer(self, user_id: str, interview_id: str) -> bool:
         """判断是否应该处理缓冲区"""
         # 简单策略：缓冲区有3个或更多块时处理
@@ -450,36 +1003,87 @@ class VoiceTranscriptionService:
         
         return False
     
-    def _process_audio_worker(self):
-        """音频处理工作线程"""
-        logger.info("音频处理工作线程已启动")
+    def _shard_for(self, session_key: str) -> int:
+        """会话 -> 分片（稳定哈希，保证同一会话的任务按顺序处理）"""
+        return zlib.crc32(session_key.encode('utf-8')) % self.num_workers
+    
+    def _is_backlogged(self, session_key: str) -> bool:
+        with self._stats_lock:
+            return self.session_pending.get(session_key, 0) >= self.config.max_pending_per_session
+    
+    def _enqueue_task(self, task: Dict) -> bool:
+        """按会话分片入队；会话积压过多时丢弃中间结果任务，最终块总是入队
+
+        增量任务只包含新音频不能丢弃，它们的背压在取窗口前处理（推迟取窗口）。
+        """
+        session_key = f"{task['user_id']}_{task['interview_id']}"
+        with self._stats_lock:
+            pending = self.session_pending.get(session_key, 0)
+            if (not task['is_final'] and not task.get('incremental')
+                    and pending >= self.config.max_pending_per_session):
+                # 后续任务包含同样的缓冲音频，丢弃当前中间任务不会丢失内容
+                self.stats['dropped'] += 1
+                self.session_dropped[session_key] = self.session_dropped.get(session_key, 0) + 1
+                logger.warning(f"会话 {session_key} 转录积压 {pending} 个任务，丢弃中间块 {task['chunk_id']}")
+                return False
+            self.session_pending[session_key] = pending + 1
+            self.stats['enqueued'] += 1
+            self.stats['audio_bytes_sent'] += len(task['audio_data'])
+        
+        self.shard_queues[self._shard_for(session_key)].put(task)
+        return True
+    
+    def _task_finished(self, session_key: str, processing_time: float, failed: bool = False):
+        """更新会话队列深度和处理统计"""
+        with self._stats_lock:
+            pending = self.session_pending.get(session_key, 0) - 1
+            if pending > 0:
+                self.session_pending[session_key] = pending
+            else:
+                self.session_pending.pop(session_key, None)
+            self.stats['failed' if failed else 'processed'] += 1
+            self._processing_time_total += processing_time
+    
+    def _process_audio_worker(self, shard_id: int = 0):
+        """音频处理工作线程（只处理自己分片的队列）"""
+        logger.info(f"音频处理工作线程 {shard_id} 已启动")
+        queue = self.shard_queues[shard_id]
         
         while self.is_running:
             try:
                 # 获取处理任务
-                task = self.processing_queue.get(timeout=1.0)
-                
+                task = queue.get(timeout=1.0)
+            except Empty:
+                continue
+            
+            session_key = f"{task['user_id']}_{task['interview_id']}"
+            start_time = time.time()
+            failed = False
+            try:
                 # 处理音频
                 result = self._transcribe_audio(task)
                 
                 # 调用回调函数
                 if result and result.text.strip():
-                    callback_key = f"{task['user_id']}_{task['interview_id']}"
-                    if callback_key in self.result_callbacks:
-                        self.result_callbacks[callback_key](result)
+                    callback = self.result_callbacks.get(session_key)
+                    if callback:
+                        callback(result)
                 
-                self.processing_queue.task_done()
-                
-            except Empty:
-                continue
             except Exception as e:
-                logger.error(f"音频处理工作线程错误: {e}")
+                failed = True
+                logger.error(f"音频处理工作线程 {shard_id} 错误: {e}")
+            finally:
+                self._task_finished(session_key, time.time() - start_time, failed)
+                queue.task_done()
     
     def _transcribe_audio(self, task: Dict) -> Optional[TranscriptionResult]:
         """转录音频任务"""
+        if task.get('incremental'):
+            return self._transcribe_incremental(task)
+        
         try:
             # 使用STT提供商转录
-            result = self.stt_provider.transcribe(task['audio_data'])
+            result = self.stt_provider.transcribe(self._prepare_audio(task))
             
             # 更新结果信息
             result.user_id = task['user_id']
@@ -500,6 +1104,68 @@ class VoiceTranscriptionService:
             logger.error(f"音频转录错误: {e}")
             return None
     
+    def _prepare_audio(self, task: Dict) -> bytes:
+        """裸PCM窗口封装为WAV，逐块WAV合并为一个WAV，其他格式原样交给STT提供商"""
+        audio_format = task.get('audio_format')
+        if audio_format == 'wav':
+            return merge_wav_chunks(task['audio_data'])
+        if audio_format not in RAW_PCM_FORMATS:
+            return task['audio_data']
+        wav_io = io.BytesIO()
+        with wave.open(wav_io, 'wb') as wav_file:
+            wav_file.setnchannels(self.config.channels)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.config.sample_rate)
+            wav_file.writeframes(task['audio_data'])
+        return wav_io.getvalue()
+    
+    def _transcribe_incremental(self, task: Dict) -> Optional[TranscriptionResult]:
+        """增量转录：只识别新窗口，再拼接到会话的累计文本上"""
+        session_key = f"{task['user_id']}_{task['interview_id']}"
+        stitcher = self.transcripts.setdefault(session_key, TranscriptStitcher())
+        start_time = time.time()
+        
+        try:
+            result = None
+            if task['audio_data']:
+                result = self.stt_provider.transcribe(self._prepare_audio(task))
+                if result.confidence >= self.config.confidence_threshold:
+                    stitcher.merge(result.text)
+                else:
+                    logger.debug(f"过滤低置信度窗口: {result.confidence}")
+            
+            if task['is_final']:
+                self.transcripts.pop(session_key, None)
+            elif result is None or result.confidence < self.config.confidence_threshold:
+                return None
+            
+            text = stitcher.text
+            if not text:
+                return None
+            
+            final_result = TranscriptionResult(
+                text=text,
+                confidence=result.confidence if result else 1.0,
+                user_id=task['user_id'],
+                interview_id=task['interview_id'],
+                chunk_id=task['chunk_id'],
+                is_final=task['is_final'],
+                language=self.config.language,
+                timestamp=time.time(),
+                processing_time=result.processing_time if result else time.time() - start_time,
+                stable_text=text if task['is_final'] else stitcher.stable_text
+            )
+            
+            logger.info(f"增量转录完成 - 用户: {task['user_id']}, 文本: '{text[:50]}...', 最终: {task['is_final']}")
+            
+            return final_result
+            
+        except Exception as e:
+            logger.error(f"增量音频转录错误: {e}")
+            if task['is_final']:
+                self.transcripts.pop(session_key, None)
+            return None
+    
     def register_result_callback(self, user_id: str, interview_id: str, callback: Callable):
         """注册结果回调函数"""
         callback_key = f"{user_id}_{interview_id}"
@@ -511,17 +1177,55 @@ class VoiceTranscriptionService:
         callback_key = f"{user_id}_{interview_id}"
         if callback_key in self.result_callbacks:
             del self.result_callbacks[callback_key]
+            with self._stats_lock:
+                self.session_dropped.pop(callback_key, None)
             logger.info(f"已取消语音转录回调: {callback_key}")
+        
+        # 回收会话缓冲区和处理状态
+        self.buffer.remove_session(user_id, interview_id)
+        self.active_sessions.pop(callback_key, None)
+        self.transcripts.pop(callback_key, None)
+        if self.vad:
+            self.vad.reset(callback_key)
     
     def get_service_stats(self) -> Dict[str, Any]:
         """获取服务统计信息"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+            vad_stats = dict(self.vad_stats)
+            session_queue_depths = dict(self.session_pending)
+            session_dropped = dict(self.session_dropped)
+            finished = stats['processed'] + stats['failed']
+            avg_processing_time = self._processing_time_total / finished if finished else 0.0
+        
+        shard_queue_depths = [queue.qsize() for queue in self.shard_queues]
+        buffer_stats = self.buffer.get_stats()
         return {
             'is_running': self.is_running,
             'provider': self.config.provider,
-            'queue_size': self.processing_queue.qsize(),
+            'queue_size': sum(shard_queue_depths),
+            'num_workers': self.num_workers,
+            'shard_queue_depths': shard_queue_depths,
+            'session_queue_depths': session_queue_depths,
+            'session_dropped': session_dropped,
+            'max_pending_per_session': self.config.max_pending_per_session,
+            'enqueued': stats['enqueued'],
+            'processed': stats['processed'],
+            'dropped': stats['dropped'],
+            'deferred': stats['deferred'],
+            'failed': stats['failed'],
+            'transcription_mode': self.config.transcription_mode,
+            'audio_bytes_sent': stats['audio_bytes_sent'],
+            'buffer_evicted_unsent': buffer_stats['evicted_unsent'],
+            'stt_batching': getattr(self.stt_provider, 'batch_stats', None),
+            'vad_enabled': self.vad is not None,
+            'vad': vad_stats,
+            'avg_processing_time': round(avg_processing_time, 4),
             'active_callbacks': len(self.result_callbacks),
             'active_sessions': len(self.active_sessions),
-            'buffer_size': len(self.buffer.buffer) if self.buffer else 0
+            'buffer_size': buffer_stats['chunks'],
+            'buffer_bytes': buffer_stats['bytes'],
+            'buffer_sessions': buffer_stats['sessions']
         }
 
 # 全局语音转录服务实例
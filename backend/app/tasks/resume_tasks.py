@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+简历解析异步任务
+上传接口只保存文件，解析在独立队列中执行，并通过Socket.IO推送阶段进度：
+extract -> sections -> skills -> persist
+"""
+import os
+from datetime import datetime
+
+from celery import current_task
+from celery.utils.log import get_task_logger
+from flask import current_app
+
+from app.extensions import db
+from app.models.resume import Resume, ResumeStatus
+from app.services.resume_parser import ResumeParser
+from app.services.cache_service import CacheService
+
+logger = get_task_logger(__name__)
+
+# 阶段 -> 进度百分比
+PARSE_STAGES = {
+    'extract': 30,
+    'sections': 60,
+    'skills': 80,
+    'persist': 95,
+}
+
+_emitter = {'pid': None, 'socketio': None}
+
+
+def _get_emitter():
+    """获取Socket.IO发送器
+
+    配置了 SOCKETIO_MESSAGE_QUEUE 时使用外部发送器（Celery worker中可用），
+    否则使用当前进程的 socketio 实例（同步回退路径）。
+    """
+    pid = os.getpid()
+    if _emitter['pid'] != pid:
+        message_queue = current_app.config.get('SOCKETIO_MESSAGE_QUEUE')
+        if message_queue:
+            from flask_socketio import SocketIO
+            _emitter['socketio'] = SocketIO(message_queue=message_queue)
+        else:
+            from app.extensions import socketio
+            _emitter['socketio'] = socketio
+        _emitter['pid'] = pid
+    return _emitter['socketio']
+
+
+def emit_resume_event(event: str, user_id: int, payload: dict):
+    """向用户房间推送简历解析事件，失败只记录日志"""
+    try:
+        _get_emitter().emit(event, payload, room=f"user_{user_id}", namespace='/')
+    except Exception as e:
+        logger.warning(f"Failed to emit {event} for user {user_id}: {e}")
+
+
+def _report_stage(resume: Resume, stage: str):
+    progress = PARSE_STAGES.get(stage, 0)
+    try:
+        if current_task and current_task.request.id:
+            current_task.update_state(
+                state='PROGRESS',
+                meta={'current': progress, 'total': 100, 'status': stage, 'resume_id': resume.id}
+            )
+    except Exception as e:
+        logger.warning(f"Failed to update task state: {e}")
+
+    emit_resume_event('resume_parse_progress', resume.user_id, {
+        'resume_id': resume.id,
+        'stage': stage,
+        'progress': progress
+    })
+
+
+def process_resume(resume_id: int) -> dict:
+    """
+    解析简历并保存结果（Celery任务和同步回退共用）
+
+    Args:
+        resume_id: 简历ID
+
+    Returns:
+        dict: 解析状态
+    """
+    resume = Resume.query.get(resume_id)
+    if not resume:
+        logger.warning(f"Resume {resume_id} not found, skip parsing")
+        return {'status': 'NOT_FOUND', 'resume_id': resume_id}
+
+    try:
+        if resume.status != ResumeStatus.PROCESSING:
+            resume.status = ResumeStatus.PROCESSING
+            db.session.commit()
+
+        parser = ResumeParser()
+        result = parser.parse_resume(
+            resume.file_path,
+            resume.file_type,
+            progress=lambda stage: _report_stage(resume, stage)
+        )
+
+        if result['success']:
+            _report_stage(resume, 'persist')
+
+            resume.status = ResumeStatus.PROCESSED
+            resume.raw_text = result['raw_text']
+            resume.parsed_content = result['parsed_data']
+            resume.processed_at = datetime.utcnow()
+            resume.error_message = None
+
+            # 提取的关键信息
+            parsed_data = result['parsed_data']
+            resume.name = parsed_data.get('name')
+            resume.email = parsed_data.get('email')
+            resume.phone = parsed_data.get('phone')
+            resume.skills = parsed_data.get('skills', [])
+            resume.experience = parsed_data.get('experience', [])
+            resume.education = parsed_data.get('education', [])
+            resume.projects = parsed_data.get('projects', [])
+            db.session.commit()
+
+            # 清除相关的问题缓存，因为简历内容已更新
+            CacheService.invalidate_resume_cache(resume.id)
+            logger.info(f"Resume {resume.id} parsed, cache invalidated")
+
+            emit_resume_event('resume_parse_completed', resume.user_id, {
+                'resume_id': resume.id,
+                'progress': 100,
+                'resume': resume.to_dict()
+            })
+            return {'status': 'SUCCESS', 'resume_id': resume.id}
+
+        resume.status = ResumeStatus.FAILED
+        resume.error_message = result['error']
+        db.session.commit()
+
+    except Exception as e:
+        logger.error(f"Resume parsing failed for {resume_id}: {e}")
+        db.session.rollback()
+        resume.status = ResumeStatus.FAILED
+        resume.error_message = str(e)
+        db.session.commit()
+
+    emit_resume_event('resume_parse_failed', resume.user_id, {
+        'resume_id': resume.id,
+        'error': resume.error_message
+    })
+    return {'status': 'FAILED', 'resume_id': resume.id, 'error': resume.error_message}
+
+
+def parse_resume_async(resume_id):
+    """
+    异步解析简历（resume_parsing 队列）
+
+    Args:
+        resume_id: 简历ID
+
+    Returns:
+        dict: 解析状态
+    """
+    logger.info(f"Start parsing resume {resume_id}")
+    return process_resume(resume_id)
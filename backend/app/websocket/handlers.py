@@ -3,6 +3,8 @@ from flask import request
 from flask_jwt_extended import decode_token
 from app.extensions import db, redis_client
 from app.models.question import InterviewSession, Question, Answer
+from app.models.resume import Resume
+from app.services.ai_question_generator import AIQuestionGenerator
 from app.services.interview_service import InterviewService
 from app.services.interview_analyzer import InterviewAnalyzer
 import logging
@@ -13,7 +15,9 @@ import base64
 from functools import wraps
 
 # 添加语音服务导入
-from app.services.websocket_service import get_voice_service, VoiceConfig, TranscriptionResult
+from app.services.websocket_service import (
+    get_voice_service, VoiceConfig, TranscriptionResult, SUPPORTED_AUDIO_FORMATS, RAW_PCM_FORMATS
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,16 +25,31 @@ logger = logging.getLogger(__name__)
 connected_users = {}
 interview_sessions = {}
 
-def register_socket_events(socketio_instance):
+def register_socket_events(socketio_instance, voice_settings: dict = None):
     """注册所有WebSocket事件处理器"""
+    voice_settings = voice_settings or {}
     
     # 初始化语音转录服务
     voice_config = VoiceConfig(
         sample_rate=16000,
         channels=1,
         language='zh-CN',
-        provider='google',  # 可配置：google, whisper, baidu
-        confidence_threshold=0.7
+        provider=voice_settings.get('provider', 'google'),  # 可配置：google, whisper, baidu, local_whisper
+        confidence_threshold=0.7,
+        num_workers=voice_settings.get('num_workers', 4),
+        max_pending_per_session=voice_settings.get('max_pending_per_session', 3),
+        buffer_max_chunks=voice_settings.get('buffer_max_chunks', 10),
+        session_ttl=voice_settings.get('session_ttl', 300.0),
+        transcription_mode=voice_settings.get('transcription_mode', 'incremental'),
+        overlap_chunks=voice_settings.get('overlap_chunks', 1),
+        vad_enabled=voice_settings.get('vad_enabled', True),
+        vad_threshold_db=voice_settings.get('vad_threshold_db', -45.0),
+        vad_end_silence_ms=voice_settings.get('vad_end_silence_ms', 800),
+        local_model=voice_settings.get('local_model', 'small'),
+        local_device=voice_settings.get('local_device', 'cpu'),
+        local_compute_type=voice_settings.get('local_compute_type', 'int8'),
+        local_batch_size=voice_settings.get('local_batch_size', 4),
+        local_batch_wait_ms=voice_settings.get('local_batch_wait_ms', 30)
     )
     voice_service = get_voice_service(voice_config)
     
@@ -51,6 +70,8 @@ def register_socket_events(socketio_instance):
                         'connect_time': time.time(),
                         'current_interview': None
                     }
+                    # 用户级房间，用于推送后台任务事件（如简历解析进度）
+                    join_room(f"user_{user_id}")
                     emit('connected', {
                         'status': 'success',
                         'message': '认证连接成功',
@@ -293,106 +314,236 @@ def register_socket_events(socketio_instance):
         except Exception as e:
             logger.error(f"提交答案错误: {e}")
             emit('error', {'message': '提交答案失败'})
+
+    @socketio_instance.on('generate_reference_answer')
+    def handle_generate_reference_answer(data):
+        """流式生成AI参考答案，逐段推送token增量"""
+        question_id = data.get('question_id')
+        try:
+            user_info = connected_users.get(request.sid)
+            if not user_info or not user_info.get('user_id'):
+                emit('reference_answer_error', {
+                    'question_id': question_id,
+                    'message': '需要认证连接'
+                })
+                return
+
+            if not question_id:
+                emit('reference_answer_error', {'message': '缺少问题ID'})
+                return
+
+            user_id = int(user_info['user_id'])
+            question = Question.query.filter_by(id=question_id, user_id=user_id).first()
+            if not question:
+                emit('reference_answer_error', {
+                    'question_id': question_id,
+                    'message': '问题不存在'
+                })
+                return
+
+            resume = Resume.query.get(question.resume_id)
+            if not resume:
+                emit('reference_answer_error', {
+                    'question_id': question_id,
+                    'message': '简历不存在'
+                })
+                return
+
+            emit('reference_answer_started', {
+                'question_id': question_id,
+                'timestamp': time.time()
+            })
+
+            sequence = {'index': 0}
+
+            def forward_delta(delta: str):
+                """转发token增量给请求方"""
+                emit('reference_answer_delta', {
+                    'question_id': question_id,
+                    'index': sequence['index'],
+                    'delta': delta
+                })
+                sequence['index'] += 1
+
+            generator = AIQuestionGenerator()
+            reference_answer = generator.generate_reference_answer_stream(
+                question=question,
+                resume=resume,
+                on_delta=forward_delta,
+                user_context=data.get('user_context', {})
+            )
+
+            emit('reference_answer_completed', {
+                'question_id': question_id,
+                'question_text': question.question_text,
+                'ai_reference_answer': reference_answer,
+                'streamed_chunks': sequence['index'],
+                'generated_at': datetime.now().isoformat()
+            })
+
+            logger.info(f"流式参考答案完成 - 问题: {question_id}, 增量块: {sequence['index']}")
+
+        except Exception as e:
+            logger.error(f"流式生成参考答案错误: {e}")
+            emit('reference_answer_error', {
+                'question_id': question_id,
+                'message': '生成参考答案失败'
+            })
+
+    def _process_audio_chunk(data, audio_data: bytes, audio_format: str, transport: str):
+        """校验音频块并交给语音转录服务（base64和二进制事件共用）"""
+        interview_id = data.get('interview_id')
+        user_id = data.get('user_id')
+        chunk_id = data.get('chunk_id', 0)
+        is_final = data.get('is_final', False)
+        
+        # 验证音频数据大小
+        if len(audio_data) < 100 and not is_final:  # 最小音频数据阈值
+            logger.warning(f"音频数据过小: {len(audio_data)} bytes")
+            return
+        
+        if len(audio_data) > 10 * 1024 * 1024:  # 10MB限制
+            emit('error', {'message': '音频数据过大，请分块发送'})
+            return
+        
+        # 注册结果回调（如果还未注册）
+        def transcription_callback(result: TranscriptionResult):
+            """语音转录结果回调"""
+            try:
+                # 发送转录结果给用户
+                emit('voice_transcribed', {
+                    'interview_id': result.interview_id,
+                    'user_id': result.user_id,
+                    'transcribed_text': result.text,
+                    'stable_text': result.stable_text,
+                    'confidence': result.confidence,
+                    'is_final': result.is_final,
+                    'chunk_id': result.chunk_id,
+                    'language': result.language,
+                    'processing_time': result.processing_time,
+                    'timestamp': result.timestamp
+                })
+                
+                # 发送实时字幕给房间内其他用户
+                if result.is_final and result.text.strip():
+                    emit('live_transcription', {
+                        'user_id': result.user_id,
+                        'text': result.text,
+                        'confidence': result.confidence,
+                        'is_final': True,
+                        'timestamp': result.timestamp
+                    }, room=f"interview_{result.interview_id}", include_self=False)
+                
+                logger.info(f"语音转录回调 - 用户: {result.user_id}, 文本: '{result.text[:50]}...'")
+                
+            except Exception as e:
+                logger.error(f"语音转录回调错误: {e}")
+        
+        # 注册回调
+        voice_service.register_result_callback(user_id, interview_id, transcription_callback)
+        
+        # 处理语音数据
+        voice_service.process_voice_data(
+            audio_data=audio_data,
+            user_id=user_id,
+            interview_id=interview_id,
+            chunk_id=chunk_id,
+            is_final=is_final,
+            audio_format=audio_format
+        )
+        
+        # 发送处理状态
+        if not is_final:
+            emit('voice_processing', {
+                'interview_id': interview_id,
+                'chunk_id': chunk_id,
+                'status': 'processing',
+                'message': f'正在处理音频块 {chunk_id}...'
+            })
+        else:
+            emit('voice_processing', {
+                'interview_id': interview_id,
+                'chunk_id': chunk_id,
+                'status': 'finalizing',
+                'message': '正在完成最终转录...'
+            })
+        
+        logger.info(f"处理语音数据({transport}) - 面试: {interview_id}, 用户: {user_id}, 块: {chunk_id}, 大小: {len(audio_data)} bytes, 格式: {audio_format}, 最终: {is_final}")
     
     @socketio_instance.on('voice_data')
     def handle_voice_data(data):
-        """处理语音数据 - 使用真实STT服务"""
+        """处理语音数据 - 使用真实STT服务（base64 JSON，兼容旧客户端）"""
         try:
             interview_id = data.get('interview_id')
-            audio_data_base64 = data.get('audio_data')
+            audio_payload = data.get('audio_data')
             user_id = data.get('user_id')
-            chunk_id = data.get('chunk_id', 0)
-            is_final = data.get('is_final', False)
-            audio_format = data.get('format', 'wav')  # wav, mp3, ogg
+            audio_format = data.get('format', 'wav')  # wav, mp3, ogg, pcm16
             
-            if not interview_id or not audio_data_base64 or not user_id:
+            if not interview_id or not audio_payload or not user_id:
                 emit('error', {'message': '缺少必要的语音数据参数'})
                 return
             
             try:
-                # 解码base64音频数据
-                audio_data = base64.b64decode(audio_data_base64)
-                
-                # 验证音频数据大小
-                if len(audio_data) < 100:  # 最小音频数据阈值
-                    logger.warning(f"音频数据过小: {len(audio_data)} bytes")
-                    return
-                
-                if len(audio_data) > 10 * 1024 * 1024:  # 10MB限制
-                    emit('error', {'message': '音频数据过大，请分块发送'})
-                    return
-                
-                # 注册结果回调（如果还未注册）
-                def transcription_callback(result: TranscriptionResult):
-                    """语音转录结果回调"""
-                    try:
-                        # 发送转录结果给用户
-                        emit('voice_transcribed', {
-                            'interview_id': result.interview_id,
-                            'user_id': result.user_id,
-                            'transcribed_text': result.text,
-                            'confidence': result.confidence,
-                            'is_final': result.is_final,
-                            'chunk_id': result.chunk_id,
-                            'language': result.language,
-                            'processing_time': result.processing_time,
-                            'timestamp': result.timestamp
-                        })
-                        
-                        # 发送实时字幕给房间内其他用户
-                        if result.is_final and result.text.strip():
-                            emit('live_transcription', {
-                                'user_id': result.user_id,
-                                'text': result.text,
-                                'confidence': result.confidence,
-                                'is_final': True,
-                                'timestamp': result.timestamp
-                            }, room=f"interview_{result.interview_id}", include_self=False)
-                        
-                        logger.info(f"语音转录回调 - 用户: {result.user_id}, 文本: '{result.text[:50]}...'")
-                        
-                    except Exception as e:
-                        logger.error(f"语音转录回调错误: {e}")
-                
-                # 注册回调
-                voice_service.register_result_callback(user_id, interview_id, transcription_callback)
-                
-                # 处理语音数据
-                voice_service.process_voice_data(
-                    audio_data=audio_data,
-                    user_id=user_id,
-                    interview_id=interview_id,
-                    chunk_id=chunk_id,
-                    is_final=is_final
-                )
-                
-                # 发送处理状态
-                if not is_final:
-                    emit('voice_processing', {
-                        'interview_id': interview_id,
-                        'chunk_id': chunk_id,
-                        'status': 'processing',
-                        'message': f'正在处理音频块 {chunk_id}...'
-                    })
+                # 解码base64音频数据（客户端已按二进制附件发送时直接使用）
+                if isinstance(audio_payload, (bytes, bytearray, memoryview)):
+                    audio_data = bytes(audio_payload)
                 else:
-                    emit('voice_processing', {
-                        'interview_id': interview_id,
-                        'chunk_id': chunk_id,
-                        'status': 'finalizing',
-                        'message': '正在完成最终转录...'
-                    })
-                
-                logger.info(f"处理语音数据 - 面试: {interview_id}, 用户: {user_id}, 块: {chunk_id}, 大小: {len(audio_data)} bytes, 最终: {is_final}")
-                
+                    audio_data = base64.b64decode(audio_payload)
             except Exception as decode_error:
                 logger.error(f"音频数据解码错误: {decode_error}")
                 emit('error', {'message': '音频数据格式错误'})
                 return
             
+            _process_audio_chunk(data, audio_data, audio_format, 'base64')
+            
         except Exception as e:
             logger.error(f"语音数据处理错误: {e}")
             emit('error', {'message': '语音处理失败，请重试'})
     
+    @socketio_instance.on('voice_data_binary')
+    def handle_voice_data_binary(data):
+        """处理二进制语音帧
+
+        音频作为Socket.IO二进制附件发送（data['audio']为bytes），
+        不经过base64编码和解码，直接交给语音转录服务。
+        """
+        try:
+            interview_id = data.get('interview_id')
+            audio = data.get('audio')
+            user_id = data.get('user_id')
+            audio_format = data.get('encoding', 'pcm16')
+            
+            if not interview_id or audio is None or not user_id:
+                emit('error', {'message': '缺少必要的语音数据参数'})
+                return
+            
+            if not isinstance(audio, (bytes, bytearray, memoryview)):
+                emit('error', {'message': '语音帧必须以二进制发送'})
+                return
+            
+            if audio_format in RAW_PCM_FORMATS and len(audio) % 2:
+                emit('error', {'message': 'PCM16音频帧长度必须为偶数'})
+                return
+            
+            _process_audio_chunk(data, bytes(audio), audio_format, 'binary')
+            
+        except Exception as e:
+            logger.error(f"二进制语音数据处理错误: {e}")
+            emit('error', {'message': '语音处理失败，请重试'})
+    
+    @socketio_instance.on('voice_capabilities')
+    def handle_voice_capabilities(data=None):
+        """音频编码协商：返回服务端支持的二进制帧编码"""
+        requested = (data or {}).get('encodings') or []
+        supported = [encoding for encoding in requested if encoding in SUPPORTED_AUDIO_FORMATS]
+        emit('voice_capabilities', {
+            'transports': ['binary', 'base64'],
+            'encodings': list(SUPPORTED_AUDIO_FORMATS),
+            'selected_encoding': supported[0] if supported else SUPPORTED_AUDIO_FORMATS[0],
+            'sample_rate': voice_service.config.sample_rate,
+            'channels': voice_service.config.channels
+        })
+    
     @socketio_instance.on('voice_config')
     def handle_voice_config(data):
         """配置语音识别参数"""
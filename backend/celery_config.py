@@ -23,6 +23,9 @@ from app.tasks.question_tasks import generate_questions_async, generate_ai_refer
 generate_questions_task = celery.task(name='app.tasks.question_tasks.generate_questions_async')(generate_questions_async)
 generate_ai_reference_task = celery.task(name='app.tasks.question_tasks.generate_ai_reference_async')(generate_ai_reference_async)
 
+from app.tasks.resume_tasks import parse_resume_async
+parse_resume_task = celery.task(name='app.tasks.resume_tasks.parse_resume_async')(parse_resume_async)
+
 if __name__ == '__main__':
     print("🚀 启动Celery Worker...")
     print(f"Celery应用: {celery}")
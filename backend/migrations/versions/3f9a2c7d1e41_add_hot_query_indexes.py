@@ -0,0 +1,64 @@
+"""add composite indexes for hot question/answer/session queries
+
+Tables are created by db.create_all, so this is the first revision and it
+only manages secondary indexes. Indexes that already exist (for example on
+a database created from the current models) are skipped.
+
+Revision ID: 3f9a2c7d1e41
+Revises:
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a2c7d1e41'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (表名, 索引名, 列) —— 与 app/models/question.py 中的 __table_args__ 保持一致
+INDEXES = [
+    # 会话内问题: WHERE session_id = ? [AND user_id = ?] ORDER BY created_at
+    ('questions', 'ix_questions_session_created', ['session_id', 'created_at']),
+    # 用户问题列表/计数: WHERE user_id = ? ORDER BY created_at DESC
+    ('questions', 'ix_questions_user_created', ['user_id', 'created_at']),
+    # 用户问题按类型/难度统计: WHERE user_id = ? AND question_type|difficulty = ?
+    ('questions', 'ix_questions_user_type', ['user_id', 'question_type']),
+    ('questions', 'ix_questions_user_difficulty', ['user_id', 'difficulty']),
+    # 问题的最新答案: WHERE question_id = ? AND user_id = ? ORDER BY answered_at DESC
+    ('answers', 'ix_answers_question_user_answered', ['question_id', 'user_id', 'answered_at']),
+    # 会话内答案: WHERE session_id = ? AND user_id = ?
+    ('answers', 'ix_answers_session_user', ['session_id', 'user_id']),
+    # 用户答过的问题: WHERE answers.user_id = ? ORDER BY answered_at DESC
+    ('answers', 'ix_answers_user_answered', ['user_id', 'answered_at']),
+    # 用户会话列表/时间范围统计: WHERE user_id = ? [AND created_at >= ?] ORDER BY created_at DESC
+    ('interview_sessions', 'ix_sessions_user_created', ['user_id', 'created_at']),
+    # 按状态/类型计数，匹配已完成的正式面试: WHERE user_id = ? AND status = ? [AND interview_type = ?]
+    ('interview_sessions', 'ix_sessions_user_status_type', ['user_id', 'status', 'interview_type']),
+]
+
+
+def _existing_indexes(table_name):
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table_name):
+        return None
+    return {index['name'] for index in inspector.get_indexes(table_name)}
+
+
+def upgrade():
+    for table_name, index_name, columns in INDEXES:
+        existing = _existing_indexes(table_name)
+        if existing is None or index_name in existing:
+            continue
+        op.create_index(index_name, table_name, columns, unique=False)
+
+
+def downgrade():
+    for table_name, index_name, columns in reversed(INDEXES):
+        existing = _existing_indexes(table_name)
+        if existing and index_name in existing:
+            op.drop_index(index_name, table_name=table_name)
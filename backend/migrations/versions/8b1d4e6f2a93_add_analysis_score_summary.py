@@ -0,0 +1,64 @@
+"""add overall_score summary column to interview_analysis_results
+
+/analysis/statistics aggregates stored per-session scores in SQL instead of
+loading every full analysis result. Existing rows are backfilled from their
+stored JSON result; rows that cannot be parsed stay NULL and are filled the
+next time the statistics endpoint sees the session.
+
+Revision ID: 8b1d4e6f2a93
+Revises: 3f9a2c7d1e41
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1d4e6f2a93'
+down_revision = '3f9a2c7d1e41'
+branch_labels = None
+depends_on = None
+
+
+TABLE_NAME = 'interview_analysis_results'
+COLUMN_NAME = 'overall_score'
+
+
+def _existing_columns():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(TABLE_NAME):
+        return None
+    return {column['name'] for column in inspector.get_columns(TABLE_NAME)}
+
+
+def upgrade():
+    existing = _existing_columns()
+    if existing is None:
+        return
+    if COLUMN_NAME not in existing:
+        op.add_column(TABLE_NAME, sa.Column(COLUMN_NAME, sa.Float(), nullable=True))
+
+    results = sa.table(
+        TABLE_NAME,
+        sa.column('id', sa.Integer),
+        sa.column('result', sa.JSON),
+        sa.column(COLUMN_NAME, sa.Float),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(results.c.id, results.c.result).where(results.c.overall_score.is_(None))
+    ).fetchall()
+    for row_id, result in rows:
+        try:
+            score = float(result['overall_score'])
+        except (TypeError, KeyError, ValueError):
+            continue
+        bind.execute(results.update().where(results.c.id == row_id).values(overall_score=score))
+
+
+def downgrade():
+    existing = _existing_columns()
+    if existing and COLUMN_NAME in existing:
+        with op.batch_alter_table(TABLE_NAME) as batch_op:
+            batch_op.drop_column(COLUMN_NAME)
@@ -23,7 +23,7 @@ def start_celery_worker():
         'worker',
         '--loglevel=info',
         '--concurrency=2',  # 并发worker数量
-        '--queues=question_generation,ai_reference',  # 指定队列
+        '--queues=question_generation,ai_reference,resume_parsing',  # 指定队列
         '--hostname=worker1@%h'  # worker主机名
     ])
 
@@ -0,0 +1,63 @@
+"""
+共享参考答案模板的通用问题识别测试
+只有整句为通用问题（可带引导/礼貌用语）时才使用共享模板，
+包含项目、公司等简历相关内容的问题必须走个性化生成。
+
+用法:
+    cd backend
+    python -m pytest tests/ai/test_reference_template_cache.py
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.models.question import QuestionType
+from app.services.reference_template_cache import ReferenceTemplateCache
+
+
+def make_question(text, question_type=QuestionType.BEHAVIORAL):
+    return SimpleNamespace(id=1, question_text=text, question_type=question_type)
+
+
+@pytest.fixture(scope='module')
+def template_cache():
+    return ReferenceTemplateCache()
+
+
+@pytest.mark.parametrize('text', [
+    'Tell me about yourself.',
+    'So, can you tell us a little about yourself?',
+    'Please introduce yourself briefly.',
+    'Walk me through your resume.',
+    'What are your greatest strengths and weaknesses?',
+    'Why should we hire you?',
+    'Where do you see yourself in five years time?',
+    'How do you handle pressure?',
+    'Do you have any questions for us?',
+    '请先做一下自我介绍',
+    '你的优点和缺点是什么？',
+    '你未来五年的职业规划是什么？',
+])
+def test_generic_questions_use_shared_template(template_cache, text):
+    assert template_cache.is_generic(make_question(text))
+
+
+@pytest.mark.parametrize('text', [
+    'How do you handle pressure when leading the payment migration you described at Acme?',
+    'Tell me about yourself and how project X prepared you for this role.',
+    'Why should we hire you over someone with more Kubernetes experience?',
+    'What are your strengths as a backend engineer on the billing team?',
+    '请结合你在支付项目中的经历做一下自我介绍',
+    '你在阿里的五年职业规划是什么',
+])
+def test_resume_specific_questions_are_not_generic(template_cache, text):
+    assert not template_cache.is_generic(make_question(text))
+
+
+def test_technical_questions_are_never_generic(template_cache):
+    assert not template_cache.is_generic(make_question('Tell me about yourself', QuestionType.TECHNICAL))
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+面试答案评分性能基准脚本
+对比单次扫描评分引擎（answer_scoring.AnswerScorer）与旧的逐关键词循环评分，
+并检查两条路径的质量/完整性/技术分和关键词结果是否完全一致。
+
+用法:
+    cd backend
+    python tests/benchmarks/benchmark_answer_scoring.py [--sessions N] [--answers N] [--iterations N]
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+SCORING_PATH = os.path.join(BACKEND_DIR, 'app', 'services', 'answer_scoring.py')
+
+# 与 InterviewAnalyzer.technical_keywords 相同
+TECHNICAL_KEYWORDS = {
+    'programming': [
+        'algorithm', 'data structure', 'complexity', 'optimization',
+        'function', 'class', 'method', 'variable', 'loop', 'condition',
+        'api', 'database', 'sql', 'framework', 'library', 'debugging'
+    ],
+    'experience': [
+        'project', 'team', 'leadership', 'collaboration', 'management',
+        'responsibility', 'achievement', 'challenge', 'solution', 'result'
+    ],
+    'soft_skills': [
+        'communication', 'problem-solving', 'creativity', 'adaptability',
+        'learning', 'initiative', 'teamwork', 'leadership', 'organization'
+    ]
+}
+
+QUESTION_TYPES = ('technical', 'behavioral', 'situational', 'cultural_fit')
+
+FILLER_WORDS = (
+    'we then the service users request latency improved because it was needed and after '
+    'that our customers reported fewer issues in production while I worked on it daily'
+).split()
+PHRASES = [
+    'first', 'second', 'finally', '1.', 'for example', 'such as', '例如', 'in summary', 'overall',
+    'the situation was', 'my task', 'the action I took', 'the result', 'a big challenge', 'outcome',
+    'implementation', 'approach', 'definitely', 'always works', 'specifically', 'according to',
+    'teamwork', 'team', 'leadership', 'data structure', 'database', 'sql', 'api', 'classes',
+    'debugging', 'problem-solving', 'communication', 'algorithm', 'complexity', 'optimization'
+]
+
+
+def load_scoring_module():
+    """直接按文件加载评分模块，不需要初始化Flask应用"""
+    spec = importlib.util.spec_from_file_location('answer_scoring_bench', SCORING_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---- 旧路径：每条规则都对全文逐关键词调用 lower() + in ----
+
+def legacy_question_keywords(question_text):
+    words = re.findall(r'\b\w+\b', question_text.lower())
+    stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
+    return [word for word in words if len(word) > 3 and word not in stop_words]
+
+
+def legacy_relevance(answer_text, question_keywords):
+    if not answer_text or not question_keywords:
+        return 0.0
+    answer_words = set(re.findall(r'\b\w+\b', answer_text.lower()))
+    question_words = set(question_keywords)
+    union = answer_words.union(question_words)
+    return len(answer_words.intersection(question_words)) / len(union) if union else 0.0
+
+
+def legacy_quality(answer_text, question_text):
+    if not answer_text:
+        return 0.0
+    score = 0.0
+    word_count = len(answer_text.split())
+    if word_count >= 50:
+        score += 30
+    elif word_count >= 20:
+        score += 20
+    elif word_count >= 10:
+        score += 10
+    if any(marker in answer_text.lower() for marker in ['first', 'second', 'finally', '1.', '2.', '3.']):
+        score += 15
+    technical_words = 0
+    for category, keywords in TECHNICAL_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword.lower() in answer_text.lower():
+                technical_words += 1
+    if technical_words >= 5:
+        score += 25
+    elif technical_words >= 3:
+        score += 15
+    elif technical_words >= 1:
+        score += 10
+    if any(indicator in answer_text.lower() for indicator in ['example', 'for instance', 'such as', '例如']):
+        score += 15
+    score += legacy_relevance(answer_text, legacy_question_keywords(question_text)) * 15
+    return min(score, 100.0)
+
+
+def legacy_completeness(answer_text, question_type):
+    if not answer_text:
+        return 0.0
+    score = 0.0
+    word_count = len(answer_text.split())
+    if word_count >= 100:
+        score += 40
+    elif word_count >= 50:
+        score += 30
+    elif word_count >= 20:
+        score += 20
+    elif word_count >= 10:
+        score += 10
+    if question_type == 'behavioral':
+        star_indicators = ['situation', 'task', 'action', 'result', 'challenge', 'outcome']
+        score += min(sum(1 for i in star_indicators if i in answer_text.lower()) * 10, 30)
+    elif question_type == 'technical':
+        tech_indicators = ['algorithm', 'complexity', 'implementation', 'solution', 'approach']
+        score += min(sum(1 for i in tech_indicators if i in answer_text.lower()) * 8, 30)
+    if any(i in answer_text.lower() for i in ['conclusion', 'summary', 'in summary', 'overall', 'finally']):
+        score += 15
+    return min(score, 100.0)
+
+
+def legacy_technical(answer_text):
+    if not answer_text:
+        return 0.0
+    score = 50.0
+    technical_terms = 0
+    for category, keywords in TECHNICAL_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword.lower() in answer_text.lower():
+                technical_terms += 1
+    if technical_terms >= 8:
+        score += 30
+    elif technical_terms >= 5:
+        score += 20
+    elif technical_terms >= 3:
+        score += 15
+    elif technical_terms >= 1:
+        score += 10
+    score -= sum(1 for e in ['definitely', 'always works', 'never fails', 'impossible'] if e in answer_text.lower()) * 5
+    score += sum(1 for i in ['specifically', 'precisely', 'according to', 'research shows']
+                 if i in answer_text.lower()) * 5
+    return max(min(score, 100.0), 0.0)
+
+
+def legacy_keywords(text):
+    if not text:
+        return {}
+    found = {}
+    for category, keywords in TECHNICAL_KEYWORDS.items():
+        found[category] = [k for k in keywords if k.lower() in text.lower()]
+    return found
+
+
+def legacy_score_session(session):
+    questions, answers = session
+    results = []
+    for question_id, answer_text in answers:
+        question = next((q for q in questions if q[0] == question_id), None)
+        if question:
+            _, question_text, question_type = question
+            results.append((
+                legacy_quality(answer_text, question_text),
+                legacy_completeness(answer_text, question_type),
+                legacy_technical(answer_text),
+                legacy_keywords(answer_text)
+            ))
+    return results
+
+
+def engine_score_session(scorer, session):
+    questions, answers = session
+    questions_by_id = {q[0]: q for q in questions}
+    question_keywords = {}
+    results = []
+    for question_id, answer_text in answers:
+        question = questions_by_id.get(question_id)
+        if question:
+            _, question_text, question_type = question
+            if question_id not in question_keywords:
+                question_keywords[question_id] = scorer.question_keywords(question_text)
+            features = scorer.features(answer_text)
+            results.append((
+                scorer.score_quality(features, question_keywords[question_id]),
+                scorer.score_completeness(features, question_type),
+                scorer.score_technical(features),
+                scorer.keywords_found(features)
+            ))
+    return results
+
+
+def make_answer(rng):
+    words = []
+    for _ in range(rng.randint(5, 160)):
+        words.append(rng.choice(PHRASES) if rng.random() < 0.15 else rng.choice(FILLER_WORDS))
+    text = ' '.join(words)
+    return text.capitalize() if rng.random() < 0.5 else text.upper() if rng.random() < 0.1 else text
+
+
+def make_sessions(count, answers_per_session, seed=42):
+    rng = random.Random(seed)
+    sessions = []
+    for s in range(count):
+        questions = [
+            (s * 1000 + i, f"Describe the {rng.choice(PHRASES)} you used in your last project and why it worked",
+             rng.choice(QUESTION_TYPES))
+            for i in range(answers_per_session)
+        ]
+        answers = [(q[0], make_answer(rng) if rng.random() > 0.05 else '') for q in questions]
+        rng.shuffle(answers)
+        sessions.append((questions, answers))
+    return sessions
+
+
+def time_runs(func, sessions, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for session in sessions:
+            func(session)
+        samples.append((time.perf_counter() - start) * 1000 / len(sessions))
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {'mean': statistics.mean(ordered), 'p50': statistics.median(ordered), 'p95': ordered[p95_index]}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Interview answer scoring benchmark')
+    arg_parser.add_argument('--sessions', type=int, default=50, help='会话数量')
+    arg_parser.add_argument('--answers', type=int, default=20, help='每个会话的答案数')
+    arg_parser.add_argument('--iterations', '-n', type=int, default=20, help='迭代次数')
+    args = arg_parser.parse_args()
+
+    module = load_scoring_module()
+    start = time.perf_counter()
+    scorer = module.AnswerScorer(TECHNICAL_KEYWORDS)
+    build_ms = (time.perf_counter() - start) * 1000
+    sessions = make_sessions(args.sessions, args.answers)
+
+    mismatches = 0
+    for session in sessions:
+        for old, new in zip(legacy_score_session(session), engine_score_session(scorer, session)):
+            if old != new:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"⚠️ 结果不一致: {old} -> {new}")
+
+    print(f"🧮 自动机编译: {build_ms:.2f} ms, {len(scorer.automaton.keywords)} 个关键词")
+    print(f"📄 语料: {args.sessions} 个会话 x {args.answers} 个答案, {args.iterations} 次迭代\n")
+    print(f"{'path':<12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}   (每个会话)")
+    legacy_stats = summarize(time_runs(legacy_score_session, sessions, args.iterations))
+    engine_stats = summarize(time_runs(lambda s: engine_score_session(scorer, s), sessions, args.iterations))
+    for label, stats in (('legacy', legacy_stats), ('engine', engine_stats)):
+        print(f"{label:<12}{stats['mean']:>10.3f}{stats['p50']:>10.3f}{stats['p95']:>10.3f}")
+    if engine_stats['mean']:
+        print(f"\n⚡ 平均加速: {legacy_stats['mean'] / engine_stats['mean']:.2f}x")
+
+    if mismatches:
+        print(f"\n❌ {mismatches} 个答案的评分不一致")
+        return 1
+    print("\n✅ 两条路径的评分与关键词完全一致")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
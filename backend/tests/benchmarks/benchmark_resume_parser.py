@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+简历解析性能基准脚本
+对比当前解析器的单次分段解析（_parse_content_safe）与分段改造前的解析器
+（legacy_resume_parser.py，逐字段全文扫描）的耗时，并检查两者提取出的条目数量是否一致。
+
+用法:
+    cd backend
+    python tests/benchmarks/benchmark_resume_parser.py [文件或目录 ...] [--iterations N]
+
+默认语料为 backend/test_resume.txt 加一份内置英文样例简历。
+"""
+
+import argparse
+import importlib.util
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+PARSER_PATH = os.path.join(BACKEND_DIR, 'app', 'services', 'resume_parser.py')
+LEGACY_PARSER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'legacy_resume_parser.py')
+SUPPORTED_TYPES = ('pdf', 'docx', 'doc', 'txt')
+FIELDS = ('skills', 'experience', 'education', 'projects')
+
+# 内置英文样例（覆盖工作经历/教育/项目/技能章节）
+SAMPLE_RESUME_EN = """John Smith
+john.smith@example.com | (555) 123-4567
+
+Summary
+Backend engineer with 6 years of experience building web services.
+
+Work Experience
+2021 Senior Software Engineer at Acme Corp
+Designed and operated Python microservices on Kubernetes serving 2M daily users.
+Led migration from MySQL to PostgreSQL with zero downtime.
+2018 Software Engineer at Globex
+Built REST APIs with Django and Redis caching, owned the CI/CD pipeline.
+
+Education
+2014 BSc in Computer Science, State University
+2018 MS in Software Engineering, Tech Institute
+
+Projects
+- Realtime Chat Platform built with Node.js, Socket.IO and MongoDB for 10k users
+- Capstone project: distributed log analyzer using Go, Kafka and Elasticsearch
+
+Skills
+Languages: Python, Go, JavaScript, SQL
+Tools: Docker, Kubernetes, AWS, Git, Linux
+"""
+
+
+def load_parser_module(path, name):
+    """直接按文件加载解析器，不需要初始化Flask应用"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def collect_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.rsplit('.', 1)[-1].lower() in SUPPORTED_TYPES:
+                        files.append(os.path.join(root, name))
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            print(f"⚠️ 跳过不存在的路径: {path}")
+    return files
+
+
+def load_corpus(parser, files, include_sample=True):
+    """提前提取文本，基准只测量解析阶段"""
+    corpus = []
+    for path in files:
+        file_type = path.rsplit('.', 1)[-1].lower()
+        try:
+            text = parser._extract_text(path, file_type)
+        except Exception as e:
+            print(f"⚠️ 文本提取失败 {path}: {e}")
+            continue
+        if text and text.strip():
+            corpus.append((os.path.basename(path), text))
+    if include_sample:
+        corpus.append(('<sample_en>', SAMPLE_RESUME_EN))
+    return corpus
+
+
+def time_runs(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        'mean': statistics.mean(ordered),
+        'p50': statistics.median(ordered),
+        'p95': ordered[p95_index]
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Resume parser benchmark')
+    arg_parser.add_argument('paths', nargs='*', default=[os.path.join(BACKEND_DIR, 'test_resume.txt')],
+                            help='简历文件或目录')
+    arg_parser.add_argument('--iterations', '-n', type=int, default=200, help='每份简历的迭代次数')
+    arg_parser.add_argument('--no-sample', action='store_true', help='不使用内置英文样例')
+    args = arg_parser.parse_args()
+
+    module = load_parser_module(PARSER_PATH, 'resume_parser_bench')
+    legacy_module = load_parser_module(LEGACY_PARSER_PATH, 'legacy_resume_parser_bench')
+    # 基准时关闭解析日志，避免I/O干扰计时
+    module.logger.disabled = True
+    legacy_module.logger.disabled = True
+    parser = module.ResumeParser()
+    legacy_parser = legacy_module.ResumeParser()
+
+    corpus = load_corpus(parser, collect_files(args.paths), include_sample=not args.no_sample)
+    if not corpus:
+        print("❌ 没有可用的简历文本")
+        return 1
+
+    print(f"📄 语料: {len(corpus)} 份简历, 每份 {args.iterations} 次迭代\n")
+    print(f"{'resume':<28}{'path':<12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+
+    all_segmented, all_legacy = [], []
+    mismatches = []
+    for name, text in corpus:
+        segmented = time_runs(lambda: parser._parse_content_safe(text), args.iterations)
+        legacy = time_runs(lambda: legacy_parser._parse_content_safe(text), args.iterations)
+        all_segmented.extend(segmented)
+        all_legacy.extend(legacy)
+
+        for label, samples in (('segmented', segmented), ('legacy', legacy)):
+            stats = summarize(samples)
+            print(f"{name[:27]:<28}{label:<12}{stats['mean']:>10.3f}{stats['p50']:>10.3f}{stats['p95']:>10.3f}")
+
+        new_result = parser._parse_content_safe(text)
+        old_result = legacy_parser._parse_content_safe(text)
+        for field in FIELDS:
+            if len(new_result[field]) != len(old_result[field]):
+                mismatches.append((name, field, len(old_result[field]), len(new_result[field])))
+
+    seg_stats, legacy_stats = summarize(all_segmented), summarize(all_legacy)
+    print(f"\n{'total':<28}{'segmented':<12}{seg_stats['mean']:>10.3f}{seg_stats['p50']:>10.3f}{seg_stats['p95']:>10.3f}")
+    print(f"{'total':<28}{'legacy':<12}{legacy_stats['mean']:>10.3f}{legacy_stats['p50']:>10.3f}{legacy_stats['p95']:>10.3f}")
+    if seg_stats['mean']:
+        print(f"\n⚡ 平均加速: {legacy_stats['mean'] / seg_stats['mean']:.2f}x")
+
+    if mismatches:
+        print("\n⚠️ 条目数量不一致（旧路径 -> 分段路径）:")
+        for name, field, old_count, new_count in mismatches:
+            print(f"  {name} {field}: {old_count} -> {new_count}")
+    else:
+        print("\n✅ 各字段条目数量一致")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
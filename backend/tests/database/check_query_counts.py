@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+接口SQL语句数检查脚本
+在测试配置（SQLite内存库）下造数据，统计列表接口每次请求执行的SQL语句数。
+同一接口在不同分页大小下语句数必须相同且不超过预算，否则说明出现了 N+1 查询，返回非零退出码。
+统计接口：缓存未命中时语句数不超过预算，命中时不访问数据库，写入问题/会话后结果立即更新。
+
+用法:
+    cd backend
+    python tests/database/check_query_counts.py [--sessions 30] [--questions 5] [-v]
+"""
+
+import argparse
+import os
+import sys
+import uuid
+from contextlib import contextmanager
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+from sqlalchemy import event
+
+# (接口, 额外参数, 每次请求允许的最大语句数)
+ENDPOINTS = [
+    ('/api/v1/questions/sessions', {}, 3),
+    ('/api/v1/questions/with-answers', {}, 4),
+    ('/api/v1/questions/with-answers', {'has_answers': 'true'}, 3),
+    ('/api/v1/analysis/statistics', {}, 3),
+]
+
+PAGE_SIZES = (5, 50)
+
+# (统计接口, 缓存未命中时允许的最大语句数, 写入一个新问题后变化的计数字段)
+STATS_ENDPOINTS = [
+    ('/api/v1/questions/stats', 3, 'total_questions'),
+    ('/api/v1/interviews/statistics', 2, 'total_sessions'),
+]
+
+
+@contextmanager
+def count_statements(engine, statements):
+    """统计上下文内在 engine 上执行的SQL语句"""
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def seed_data(db, session_count, questions_per_session):
+    """创建一个用户、两份简历以及若干已回答的面试会话"""
+    from app.models.user import User
+    from app.models.resume import Resume
+    from app.models.question import (
+        Question, Answer, InterviewSession, InterviewType, QuestionType, QuestionDifficulty
+    )
+
+    user = User(email=f"query_count_{uuid.uuid4().hex[:8]}@example.com", username='Query Count')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+
+    resumes = []
+    for i in range(2):
+        resume = Resume(
+            user_id=user.id, filename=f"resume_{i}.pdf", original_filename=f"resume_{i}.pdf",
+            file_path=f"/tmp/resume_{i}.pdf", file_size=1024, file_type='pdf', name='Query Count'
+        )
+        db.session.add(resume)
+        resumes.append(resume)
+    db.session.flush()
+
+    for s in range(session_count):
+        session = InterviewSession(
+            user_id=user.id, resume_id=resumes[s % 2].id, session_id=str(uuid.uuid4()),
+            title=f"Session {s}", interview_type=InterviewType.TECHNICAL, status='completed'
+        )
+        db.session.add(session)
+        db.session.flush()
+        for q in range(questions_per_session):
+            question = Question(
+                user_id=user.id, resume_id=session.resume_id, session_id=session.id,
+                question_text=f"Question {s}-{q}", question_type=QuestionType.TECHNICAL,
+                difficulty=QuestionDifficulty.MEDIUM
+            )
+            db.session.add(question)
+            db.session.flush()
+            db.session.add(Answer(
+                session_id=session.id, question_id=question.id, user_id=user.id,
+                answer_text=f"Answer {s}-{q}", response_time=60
+            ))
+    db.session.commit()
+    return user.id
+
+
+def add_question_in_new_session(db, user_id):
+    """通过ORM写入一个新会话和问题（应触发统计缓存失效）"""
+    from app.models.question import Question, InterviewSession, InterviewType, QuestionType, QuestionDifficulty
+
+    session = InterviewSession.query.filter_by(user_id=user_id).first()
+    new_session = InterviewSession(
+        user_id=user_id, resume_id=session.resume_id, session_id=str(uuid.uuid4()),
+        title='Stats Invalidation', interview_type=InterviewType.TECHNICAL
+    )
+    db.session.add(new_session)
+    db.session.flush()
+    db.session.add(Question(
+        user_id=user_id, resume_id=session.resume_id, session_id=new_session.id,
+        question_text='Stats invalidation question', question_type=QuestionType.BEHAVIORAL,
+        difficulty=QuestionDifficulty.HARD
+    ))
+    db.session.commit()
+
+
+def check_stats_endpoints(client, db, headers, user_id, verbose=False):
+    """返回失败的统计接口数"""
+    from app.services.user_stats_cache import invalidate_user_stats
+
+    invalidate_user_stats([user_id])
+    failed = 0
+    before = {}
+    print(f"\n{'stats endpoint':<52}{'cold':>8}{'warm':>8}{'budget':>8}")
+    for path, budget, field in STATS_ENDPOINTS:
+        counts = []
+        for _ in range(2):
+            statements = []
+            with count_statements(db.engine, statements):
+                response = client.get(path, headers=headers)
+            if response.status_code != 200:
+                print(f"❌ {path} -> HTTP {response.status_code}: {response.get_data(as_text=True)[:200]}")
+                failed += 1
+                break
+            counts.append(len(statements))
+            if verbose:
+                for statement in statements:
+                    print(f"    | {' '.join(statement.split())[:160]}")
+        else:
+            before[path] = response.get_json()['data'][field]
+            ok = counts[0] <= budget and counts[1] == 0
+            print(f"{'✅' if ok else '❌'} {path:<50}{counts[0]:>8}{counts[1]:>8}{budget:>8}")
+            failed += not ok
+
+    add_question_in_new_session(db, user_id)
+    for path, budget, field in STATS_ENDPOINTS:
+        if path not in before:
+            continue
+        value = client.get(path, headers=headers).get_json()['data'][field]
+        ok = value == before[path] + 1
+        print(f"{'✅' if ok else '❌'} {path} {field}: {before[path]} -> {value} after write")
+        failed += not ok
+    return failed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='SQL statement count check for list endpoints')
+    arg_parser.add_argument('--sessions', type=int, default=30, help='造数的会话数量')
+    arg_parser.add_argument('--questions', type=int, default=5, help='每个会话的问题数')
+    arg_parser.add_argument('--verbose', '-v', action='store_true', help='打印执行的SQL')
+    args = arg_parser.parse_args()
+
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        user_id = seed_data(db, args.sessions, args.questions)
+        headers = {'Authorization': f"Bearer {create_access_token(identity=str(user_id))}"}
+        client = app.test_client()
+
+        failed = 0
+        print(f"{'endpoint':<52}" + ''.join(f"{f'per_page={size}':>14}" for size in PAGE_SIZES) + f"{'budget':>8}")
+        for path, params, budget in ENDPOINTS:
+            # 预热：首次请求会为已完成会话分析并保存分数摘要
+            client.get(path, query_string=params, headers=headers)
+            counts = []
+            for size in PAGE_SIZES:
+                statements = []
+                with count_statements(db.engine, statements):
+                    response = client.get(path, query_string={**params, 'per_page': size}, headers=headers)
+                if response.status_code != 200:
+                    print(f"❌ {path} {params} -> HTTP {response.status_code}: {response.get_data(as_text=True)[:200]}")
+                    failed += 1
+                    break
+                counts.append(len(statements))
+                if args.verbose:
+                    for statement in statements:
+                        print(f"    | {' '.join(statement.split())[:160]}")
+            else:
+                ok = len(set(counts)) == 1 and counts[0] <= budget
+                label = path + (f"?{'&'.join(f'{k}={v}' for k, v in params.items())}" if params else '')
+                print(f"{'✅' if ok else '❌'} {label:<50}" + ''.join(f"{count:>14}" for count in counts) + f"{budget:>8}")
+                failed += not ok
+
+        failed += check_stats_endpoints(client, db, headers, user_id, args.verbose)
+
+        if failed:
+            print(f"\n❌ {failed} 项检查失败：SQL语句数随分页大小增长、超出预算或统计缓存未失效")
+            return 1
+        print("\n✅ 所有接口每次请求的SQL语句数固定，统计缓存命中且写入后失效")
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
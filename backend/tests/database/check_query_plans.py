@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+热点查询执行计划检查脚本
+对 questions / answers / interview_sessions 上的热点查询执行 EXPLAIN，
+如果某个查询对这些表做全表扫描（MySQL type=ALL，SQLite "SCAN <table>"），返回非零退出码。
+
+用法:
+    cd backend
+    flask db upgrade        # 先应用索引迁移
+    python tests/database/check_query_plans.py [--config development] [--min-rows 1000]
+
+MySQL 在表很小时可能合理地选择全表扫描：估算行数低于 --min-rows 且存在可用索引时只给出警告。
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+from sqlalchemy import func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+CHECKED_TABLES = ('questions', 'answers', 'interview_sessions')
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN <select>，参数照常绑定"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kw):
+    return 'EXPLAIN ' + compiler.process(element.statement, **kw)
+
+
+@compiles(Explain, 'sqlite')
+def _compile_explain_sqlite(element, compiler, **kw):
+    return 'EXPLAIN QUERY PLAN ' + compiler.process(element.statement, **kw)
+
+
+def build_hot_queries(ids):
+    """与业务代码中的查询形状保持一致"""
+    from app.extensions import db
+    from app.models.question import Question, Answer, InterviewSession, InterviewType, QuestionType
+
+    user_id, session_db_id, question_id = ids['user_id'], ids['session_id'], ids['question_id']
+    return [
+        ('session questions (interview_service.get_session_questions)',
+         Question.query.filter_by(session_id=session_db_id, user_id=user_id).order_by(Question.created_at)),
+        ('session answers (interview_analyzer / get_session_answers)',
+         Answer.query.filter_by(session_id=session_db_id, user_id=user_id)),
+        ('latest answer of a question (/questions/<id>)',
+         Answer.query.filter_by(question_id=question_id, user_id=user_id)
+         .order_by(Answer.answered_at.desc()).limit(1)),
+        ('user question list (/questions)',
+         Question.query.filter_by(user_id=user_id).order_by(Question.created_at.desc()).limit(20)),
+        ('user question count by type (/questions/stats)',
+         Question.query.with_entities(func.count(Question.id))
+         .filter_by(user_id=user_id, question_type=QuestionType.TECHNICAL)),
+        ('user session list (/questions/sessions)',
+         InterviewSession.query.filter_by(user_id=user_id)
+         .order_by(InterviewSession.created_at.desc()).limit(20)),
+        ('user session count by status (interview statistics)',
+         InterviewSession.query.with_entities(func.count(InterviewSession.id))
+         .filter_by(user_id=user_id, status='completed')),
+        ('user sessions in time window (/analysis/statistics)',
+         InterviewSession.query.filter(
+             InterviewSession.user_id == user_id,
+             InterviewSession.created_at >= datetime.utcnow() - timedelta(days=30),
+             InterviewSession.status.in_(['completed', 'paused'])
+         )),
+        ('answered questions (/questions/with-answers)',
+         db.session.query(Question, Answer).join(Answer, Question.id == Answer.question_id)
+         .filter(Question.user_id == user_id, Answer.user_id == user_id)
+         .order_by(Answer.answered_at.desc()).limit(20)),
+        ('formal interview corpus (question_matcher)',
+         db.session.query(Question.id, Question.question_text, Answer.answer_text, InterviewSession.session_id)
+         .join(Answer, Question.id == Answer.question_id)
+         .join(InterviewSession, Question.session_id == InterviewSession.id)
+         .filter(
+             InterviewSession.user_id == user_id,
+             InterviewSession.interview_type == InterviewType.TECHNICAL,
+             InterviewSession.status == 'completed'
+         ).order_by(Answer.answered_at.desc())),
+    ]
+
+
+def sample_ids():
+    """取库中已有的一组ID作为查询参数，空库时使用1"""
+    from app.models.question import Answer
+
+    answer = Answer.query.first()
+    if answer:
+        return {'user_id': answer.user_id, 'session_id': answer.session_id, 'question_id': answer.question_id}
+    return {'user_id': 1, 'session_id': 1, 'question_id': 1}
+
+
+def check_mysql_plan(rows, min_rows):
+    """返回 (失败列表, 警告列表)"""
+    failures, warnings = [], []
+    for row in rows:
+        plan = dict(row._mapping)
+        table = plan.get('table')
+        if table not in CHECKED_TABLES or plan.get('type') != 'ALL':
+            continue
+        message = f"full scan on {table} (rows≈{plan.get('rows')}, possible_keys={plan.get('possible_keys')})"
+        if plan.get('possible_keys') and (plan.get('rows') or 0) < min_rows:
+            warnings.append(message + ' - small table, optimizer preferred a scan')
+        else:
+            failures.append(message)
+    return failures, warnings
+
+
+def check_sqlite_plan(rows):
+    failures = []
+    for row in rows:
+        detail = str(row[-1])
+        words = detail.split()
+        # "SCAN answers" 为全表扫描；"SCAN answers USING INDEX ..." / "SEARCH ..." 为索引访问
+        if len(words) >= 2 and words[0] == 'SCAN' and words[1] in CHECKED_TABLES and 'USING' not in words:
+            failures.append(f"full scan: {detail}")
+    return failures, []
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='EXPLAIN regression check for hot queries')
+    arg_parser.add_argument('--config', default=os.environ.get('FLASK_CONFIG', 'development'), help='配置名')
+    arg_parser.add_argument('--min-rows', type=int, default=1000, help='MySQL 小表阈值（估算行数）')
+    arg_parser.add_argument('--verbose', '-v', action='store_true', help='打印完整执行计划')
+    args = arg_parser.parse_args()
+
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app(args.config)
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        if dialect not in ('mysql', 'sqlite'):
+            print(f"❌ 不支持的数据库: {dialect}")
+            return 2
+
+        ids = sample_ids()
+        print(f"🔍 数据库: {dialect}, 参数: {ids}\n")
+
+        failed = 0
+        for name, query in build_hot_queries(ids):
+            rows = db.session.execute(Explain(query.statement)).fetchall()
+            if dialect == 'mysql':
+                failures, warnings = check_mysql_plan(rows, args.min_rows)
+            else:
+                failures, warnings = check_sqlite_plan(rows)
+
+            print(f"{'❌' if failures else '✅'} {name}")
+            for message in failures:
+                print(f"    {message}")
+            for message in warnings:
+                print(f"    ⚠️ {message}")
+            if args.verbose or failures:
+                for row in rows:
+                    print(f"    | {tuple(row)}")
+            failed += bool(failures)
+
+        if failed:
+            print(f"\n❌ {failed} 个热点查询退化为全表扫描")
+            return 1
+        print("\n✅ 所有热点查询均使用索引")
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
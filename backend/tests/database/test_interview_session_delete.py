@@ -0,0 +1,107 @@
+"""
+面试会话删除测试
+已完成的会话会保存分析结果（interview_analysis_results 外键引用会话），
+删除会话时必须一并删除，在外键约束生效的数据库上（MySQL/InnoDB）不能失败。
+
+用法:
+    cd backend
+    python -m pytest tests/database/test_interview_session_delete.py
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import event, text
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app import create_app
+from app.extensions import db
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        event.listen(db.engine, 'connect', _enable_sqlite_foreign_keys)
+        db.engine.dispose()
+        db.create_all()
+        assert db.session.execute(text('PRAGMA foreign_keys')).scalar() == 1
+        yield app
+        db.session.remove()
+        db.drop_all()
+        event.remove(db.engine, 'connect', _enable_sqlite_foreign_keys)
+
+
+@pytest.fixture
+def completed_session(app):
+    from app.models.user import User
+    from app.models.resume import Resume, ResumeStatus
+    from app.models.question import (
+        Answer, InterviewSession, InterviewType, Question, QuestionDifficulty, QuestionType
+    )
+    from app.services.interview_service import InterviewService
+
+    user = User(email='delete@example.com', username='delete')
+    user.set_password('password123')
+    db.session.add(user)
+    db.session.flush()
+    resume = Resume(user_id=user.id, filename='r.pdf', original_filename='r.pdf', file_path='/tmp/r.pdf',
+                    file_size=1, file_type='pdf', status=ResumeStatus.PROCESSED)
+    db.session.add(resume)
+    db.session.flush()
+    session = InterviewSession(user_id=user.id, resume_id=resume.id, session_id='delete-me', title='Mock',
+                               interview_type=InterviewType.MOCK, total_questions=2, status='in_progress')
+    db.session.add(session)
+    db.session.flush()
+    for i in range(2):
+        question = Question(resume_id=resume.id, user_id=user.id, session_id=session.id,
+                            question_text=f'Question {i}', question_type=QuestionType.BEHAVIORAL,
+                            difficulty=QuestionDifficulty.MEDIUM)
+        db.session.add(question)
+        db.session.flush()
+        db.session.add(Answer(session_id=session.id, question_id=question.id, user_id=user.id,
+                              answer_text='First, I analyzed the problem. Finally, we shipped it.',
+                              response_time=60))
+    db.session.commit()
+
+    InterviewService().end_interview_session(user.id, session.session_id)
+    return user.id, session.session_id
+
+
+def test_delete_completed_analyzed_session(completed_session):
+    from app.models.question import Answer, InterviewAnalysisResult, InterviewSession, Question
+    from app.services.interview_service import InterviewService
+
+    user_id, session_id = completed_session
+    assert InterviewAnalysisResult.query.count() == 1
+
+    assert InterviewService().delete_interview_session(user_id, session_id) is True
+
+    assert InterviewSession.query.count() == 0
+    assert Question.query.count() == 0
+    assert Answer.query.count() == 0
+    assert InterviewAnalysisResult.query.count() == 0
+
+
+def test_delete_session_invalidates_user_statistics(completed_session):
+    from app.services.interview_service import InterviewService
+
+    user_id, session_id = completed_session
+    service = InterviewService()
+    stats = service.get_interview_statistics(user_id)
+    assert stats['total_sessions'] == 1
+
+    service.delete_interview_session(user_id, session_id)
+
+    # 删除使用原生SQL，统计缓存也要在提交后失效
+    stats = service.get_interview_statistics(user_id)
+    assert stats['total_sessions'] == 0
+    assert stats['recent_sessions'] == []
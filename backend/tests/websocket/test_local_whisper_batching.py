@@ -0,0 +1,155 @@
+"""
+本地Whisper批量转录测试（离线，使用假模型，不需要安装 faster-whisper）
+并发请求在等待窗口内合并成一批解码；批量解码失败时逐条回退，
+单条失败只影响对应请求。未安装 faster-whisper 时服务回退到API提供商。
+
+用法:
+    cd backend
+    python -m pytest tests/websocket/test_local_whisper_batching.py
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.services import websocket_service
+from app.services.websocket_service import (
+    GoogleSTTProvider, LocalWhisperSTTProvider, VoiceConfig, VoiceTranscriptionService
+)
+
+
+class FakeTokenizer:
+    def __init__(self, hf_tokenizer, multilingual, task, language):
+        self.language = language
+
+    def decode(self, ids):
+        return ' '.join(f"w{token}" for token in ids)
+
+
+class FakeWhisperModel:
+    """每个波形是一个常数，识别结果为 w<常数>"""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.single_calls = 0
+        self.fail_batch = False
+        self.fail_values = set()
+        self.hf_tokenizer = object()
+        self.model = SimpleNamespace(is_multilingual=True, generate=self._generate)
+        self.max_length = 448
+        self._lock = threading.Lock()
+
+    def feature_extractor(self, waveform):
+        return np.full((4, 8), waveform[0], dtype=np.float32)
+
+    def get_prompt(self, tokenizer, previous_tokens, without_timestamps=False):
+        return [1]
+
+    def encode(self, features):
+        assert features.ndim == 3
+        return features
+
+    def _generate(self, encoder_output, prompts, **kwargs):
+        with self._lock:
+            self.batch_sizes.append(len(prompts))
+        if self.fail_batch:
+            raise RuntimeError('batch decode failed')
+        return [
+            SimpleNamespace(sequences_ids=[[int(features[0, 0])]], scores=[0.0], no_speech_prob=0.0)
+            for features in encoder_output
+        ]
+
+    def transcribe(self, waveform, **kwargs):
+        with self._lock:
+            self.single_calls += 1
+        value = int(waveform[0])
+        if value in self.fail_values:
+            raise RuntimeError(f'cannot decode {value}')
+        segment = SimpleNamespace(text=f" w{value}", avg_logprob=0.0, no_speech_prob=0.0)
+        return iter([segment]), None
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    model = FakeWhisperModel()
+    monkeypatch.setattr(websocket_service, 'get_local_whisper_model', lambda *args, **kwargs: model)
+    monkeypatch.setattr(websocket_service, 'pad_or_trim', lambda features: features, raising=False)
+    monkeypatch.setattr(websocket_service, 'FasterWhisperTokenizer', FakeTokenizer, raising=False)
+    return model
+
+
+def make_provider(batch_size=4, batch_wait_ms=30):
+    return LocalWhisperSTTProvider(VoiceConfig(
+        provider='local_whisper', local_batch_size=batch_size, local_batch_wait_ms=batch_wait_ms
+    ))
+
+
+def waveform(value, seconds=1):
+    return np.full(16000 * seconds, value, dtype=np.float32)
+
+
+def submit(provider, values):
+    futures = []
+    for value in values:
+        future = Future()
+        provider.requests.put((waveform(value), future))
+        futures.append(future)
+    return futures
+
+
+def test_batch_worker_collects_concurrent_requests(fake_model):
+    provider = make_provider(batch_size=4, batch_wait_ms=500)
+    futures = submit(provider, [1, 2, 3, 4, 5])
+
+    assert [future.result(timeout=5)[0] for future in futures] == ['w1', 'w2', 'w3', 'w4', 'w5']
+    # 前4个在等待窗口内凑成一批，第5个单独处理
+    assert fake_model.batch_sizes == [4]
+    assert fake_model.single_calls == 1
+    assert provider.batch_stats['batches'] == 1
+    assert provider.batch_stats['max_batch'] == 4
+
+
+def test_run_batch_sends_long_audio_through_single_path(fake_model):
+    provider = make_provider()
+    long_future, futures = Future(), [Future(), Future()]
+    provider._run_batch([
+        (waveform(1), futures[0]),
+        (waveform(7, seconds=LocalWhisperSTTProvider.MAX_BATCH_SECONDS + 1), long_future),
+        (waveform(2), futures[1]),
+    ])
+
+    assert [future.result()[0] for future in futures] == ['w1', 'w2']
+    assert long_future.result()[0] == 'w7'
+    assert fake_model.batch_sizes == [2]
+    assert fake_model.single_calls == 1
+
+
+def test_run_batch_falls_back_per_item_when_batch_decode_fails(fake_model):
+    provider = make_provider()
+    fake_model.fail_batch = True
+    fake_model.fail_values = {2}
+    futures = [Future() for _ in range(3)]
+    provider._run_batch([(waveform(value), future) for value, future in zip([1, 2, 3], futures)])
+
+    assert futures[0].result()[0] == 'w1'
+    assert futures[2].result()[0] == 'w3'
+    # 单条失败只影响对应请求
+    with pytest.raises(RuntimeError):
+        futures[1].result()
+    assert provider.batch_stats['fallbacks'] == 1
+    assert fake_model.single_calls == 3
+
+
+def test_missing_faster_whisper_falls_back_to_api_provider(monkeypatch):
+    if not websocket_service.SPEECH_RECOGNITION_AVAILABLE:
+        pytest.skip('speech_recognition not installed')
+    monkeypatch.setattr(websocket_service, 'FASTER_WHISPER_AVAILABLE', False)
+    service = VoiceTranscriptionService(VoiceConfig(provider='local_whisper'))
+    assert isinstance(service.stt_provider, GoogleSTTProvider)
@@ -0,0 +1,144 @@
+"""
+语音转录窗口测试
+逐块发送的WAV（每块带文件头）不能按增量窗口切分，
+转录窗口必须合并为一个可解码的WAV，后到的音频也要被转录。
+
+用法:
+    cd backend
+    python -m pytest tests/websocket/test_voice_transcription.py
+"""
+
+import io
+import math
+import os
+import struct
+import sys
+import time
+import wave
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from app.services.websocket_service import (
+    TranscriptionResult, VoiceConfig, VoiceTranscriptionService, merge_wav_chunks
+)
+
+SAMPLE_RATE = 16000
+CHUNK_FRAMES = 1600  # 每块100ms
+
+
+def tone_pcm(frequency):
+    """响亮的正弦波（高于VAD阈值）"""
+    return b''.join(
+        struct.pack('<h', int(12000 * math.sin(2 * math.pi * frequency * i / SAMPLE_RATE)))
+        for i in range(CHUNK_FRAMES)
+    )
+
+
+def tone_wav(frequency):
+    wav_io = io.BytesIO()
+    with wave.open(wav_io, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(tone_pcm(frequency))
+    return wav_io.getvalue()
+
+
+class DecodingSTTProvider:
+    """像真实解码器一样只读取第一个WAV头声明的帧，每100ms音频识别为该段的频率"""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio_data):
+        with wave.open(io.BytesIO(audio_data), 'rb') as wav_file:
+            pcm = wav_file.readframes(wav_file.getnframes())
+        words = []
+        for offset in range(0, len(pcm), CHUNK_FRAMES * 2):
+            samples = struct.unpack(f'<{len(pcm[offset:offset + CHUNK_FRAMES * 2]) // 2}h',
+                                    pcm[offset:offset + CHUNK_FRAMES * 2])
+            crossings = sum(1 for a, b in zip(samples, samples[1:]) if a < 0 <= b)
+            words.append(f"tone{round(crossings * 10 / 100) * 100}")
+        self.calls.append(words)
+        return TranscriptionResult(
+            text=' '.join(words), confidence=1.0, user_id='', interview_id='', chunk_id=0,
+            is_final=False, language='en-US', timestamp=time.time(), processing_time=0.0
+        )
+
+
+@pytest.fixture
+def make_service():
+    services = []
+
+    def _make(**overrides):
+        config = VoiceConfig(sample_rate=SAMPLE_RATE, num_workers=1, **overrides)
+        service = VoiceTranscriptionService(config)
+        service.stt_provider = DecodingSTTProvider()
+        service.start_service()
+        services.append(service)
+        return service
+
+    yield _make
+    for service in services:
+        service.stop_service()
+
+
+def run_session(service, chunks, audio_format):
+    results = []
+    service.register_result_callback('u1', 'i1', results.append)
+    for chunk_id, chunk in enumerate(chunks):
+        service.process_voice_data(chunk, 'u1', 'i1', chunk_id,
+                                   is_final=chunk_id == len(chunks) - 1, audio_format=audio_format)
+    for queue in service.shard_queues:
+        queue.join()
+    return results
+
+
+def test_merge_wav_chunks_keeps_every_chunk():
+    merged = merge_wav_chunks(tone_wav(200) + tone_wav(400) + tone_wav(800))
+    with wave.open(io.BytesIO(merged), 'rb') as wav_file:
+        assert wav_file.getnframes() == 3 * CHUNK_FRAMES
+
+
+def test_merge_wav_chunks_returns_unparseable_audio_unchanged():
+    data = b'\x1aE\xdf\xa3webm-cluster'
+    assert merge_wav_chunks(data) == data
+
+
+@pytest.mark.parametrize('mode', ['incremental', 'full'])
+def test_per_chunk_wav_transcribes_new_audio(make_service, mode):
+    service = make_service(transcription_mode=mode)
+    frequencies = [200, 400, 800, 1000, 1200]
+    results = run_session(service, [tone_wav(f) for f in frequencies], 'wav')
+
+    final = [result for result in results if result.is_final]
+    assert len(final) == 1
+    assert final[0].text.split() == [f"tone{f}" for f in frequencies[-len(final[0].text.split()):]]
+    assert 'tone1200' in final[0].text
+    # 每个转录窗口都从头拼接，不会只剩下第一个块
+    assert all(len(words) > 1 for words in service.stt_provider.calls)
+
+
+def test_pcm16_uses_incremental_windows(make_service):
+    service = make_service(transcription_mode='incremental', overlap_chunks=0)
+    frequencies = [200, 400, 800, 1000, 1200]
+    results = run_session(service, [tone_pcm(f) for f in frequencies], 'pcm16')
+
+    final = [result for result in results if result.is_final]
+    assert final and final[0].text.split() == [f"tone{f}" for f in frequencies]
+    # 第二个窗口只包含新音频
+    assert service.stt_provider.calls[1] == ['tone1000', 'tone1200']
+
+
+def test_silence_only_session_vad_state_expires(make_service):
+    service = make_service(session_ttl=0.0)
+    service.register_result_callback('u2', 'i2', lambda result: None)
+    service.process_voice_data(b'\x00\x00' * CHUNK_FRAMES, 'u2', 'i2', 0, audio_format='pcm16')
+    assert 'u2_i2' in service.vad._sessions
+
+    # 静音会话没有缓冲区，VAD状态要单独回收
+    service._last_vad_sweep = 0.0
+    service.process_voice_data(tone_pcm(200), 'u1', 'i1', 0, audio_format='pcm16')
+    assert 'u2_i2' not in service.vad._sessions